@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Asynchronous Hot Pepper Area Master Crawler
+
+Pulls every level of the area hierarchy (large service areas, service areas,
+large areas, middle areas and small areas) from the area master APIs listed in
+src/config.ts through one pooled HTTP session, and writes hotpepper_areas.json
+plus one file per prefecture in the same format as the HTML extractors.
+
+Responses are parsed with area_stream as they arrive (XML by default), so the
+large middle and small area responses are never held in memory whole.
+
+Requires aiohttp (pip install aiohttp). Point --base-url at replay_server.py to
+crawl recorded responses instead of the live API.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+sys.path.append(os.path.dirname(__file__))
+from area_extractor import write_area_json, write_json_if_changed
+from area_stream import ApiResponseError, record_stream
+
+
+BASE_URL = 'http://webservice.recruit.co.jp/hotpepper'
+
+END_POINT = {
+    "large_service_area": '/large_service_area/v1/',
+    "service_area": '/service_area/v1/',
+    "large_area": '/large_area/v1/',
+    "middle_area": '/middle_area/v1/',
+    "small_area": '/small_area/v1/',
+}
+
+# Maximum number of codes the API accepts in one filter parameter
+MAX_LARGE_AREA_CODES = 3
+MAX_MIDDLE_AREA_CODES = 5
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+CHUNK_SIZE = 1 << 16
+
+
+class AreaApiError(Exception):
+    """Raised when the area master API keeps failing or reports an error."""
+
+
+class _RetryableError(Exception):
+    """Transient HTTP status worth retrying."""
+
+
+def chunked(items: List[str], size: int) -> List[List[str]]:
+    """Split items into lists of at most size elements."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def recording_name(endpoint: str, params: Dict[str, str]) -> str:
+    """
+    Return the file name a response is recorded under (shared with replay_server.py).
+
+    Args:
+        endpoint (str): Endpoint path (e.g., "/middle_area/v1/")
+        params (Dict[str, str]): Query parameters (the API key is ignored)
+
+    Returns:
+        str: File name such as "middle_area__format=xml&large_area=Z011.xml"
+    """
+    query = urlencode(sorted((key, value) for key, value in params.items() if key != 'key'))
+    name = endpoint.strip('/').split('/')[0]
+    extension = "xml" if params.get("format", "xml") == "xml" else "json"
+    return f"{name}__{query}.{extension}" if query else f"{name}.{extension}"
+
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AreaCrawler:
+    """
+    Crawl the area master APIs with bounded concurrency, rate limiting and retry.
+
+    Example:
+        >>> async def run():
+        ...     async with AreaCrawler(api_key) as crawler:
+        ...         return await crawler.crawl()
+        >>> hierarchy = asyncio.run(run())
+    """
+
+    def __init__(self, api_key: str, base_url: str = BASE_URL, concurrency: int = 4, rate: float = 5.0,
+                 retries: int = 3, backoff: float = 0.5, timeout: float = 30.0,
+                 record_dir: Optional[str] = None, response_format: str = "xml"):
+        if aiohttp is None:
+            raise ImportError("area_crawler requires aiohttp: pip install aiohttp")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.record_dir = record_dir
+        self.response_format = response_format
+        self.requests = 0
+        self._rate_limiter = RateLimiter(rate)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def __aenter__(self) -> "AreaCrawler":
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._session.close()
+
+    async def fetch(self, level: str, params: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch the records of one area master response, parsing it as it arrives.
+
+        Args:
+            level (str): Area level (key of END_POINT)
+            params (Optional[Dict[str, str]]): Extra query parameters
+
+        Returns:
+            List[Dict[str, Any]]: API records in response order
+        """
+        endpoint = END_POINT[level]
+        query = {**(params or {}), "format": self.response_format}
+        url = f"{self.base_url}{endpoint}"
+
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._get(url, query, level)
+            except (_RetryableError, aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt == self.retries:
+                    raise AreaApiError(f"{url} failed after {attempt + 1} attempts: {exc}") from exc
+            # Exponential backoff with jitter before the next attempt
+            await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+    async def _get(self, url: str, query: Dict[str, str], level: str) -> List[Dict[str, Any]]:
+        """Send one rate-limited request through the pooled session and stream its records."""
+        async with self._semaphore:
+            await self._rate_limiter.wait()
+            self.requests += 1
+            async with self._session.get(url, params={**query, "key": self.api_key}) as response:
+                if response.status in RETRY_STATUSES:
+                    raise _RetryableError(f"{url} returned {response.status}")
+                if response.status != 200:
+                    raise AreaApiError(f"{url} returned {response.status}")
+
+                parser = record_stream(level, self.response_format)
+                recording = None
+                if self.record_dir:
+                    os.makedirs(self.record_dir, exist_ok=True)
+                    endpoint = END_POINT[level]
+                    recording = open(os.path.join(self.record_dir, recording_name(endpoint, query)), 'wb')
+                records = []
+                try:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        if recording:
+                            recording.write(chunk)
+                        records.extend(parser.feed(chunk))
+                    records.extend(parser.close())
+                except (ApiResponseError, ET.ParseError, ValueError) as e:
+                    raise AreaApiError(f"{url}: {e}") from e
+                finally:
+                    if recording:
+                        recording.close()
+                return records
+
+    async def fetch_level(self, level: str, filter_name: Optional[str] = None,
+                          codes: Optional[List[str]] = None, chunk_size: int = 1) -> List[Dict[str, Any]]:
+        """
+        Fetch every record of a level, splitting parent filters into concurrent requests.
+
+        Args:
+            level (str): Area level (key of END_POINT)
+            filter_name (Optional[str]): Parent filter parameter (e.g., "large_area")
+            codes (Optional[List[str]]): Parent codes to filter on
+            chunk_size (int): Number of parent codes per request
+
+        Returns:
+            List[Dict[str, Any]]: Records in response order, each code once
+        """
+        if filter_name:
+            requests = [self.fetch(level, {filter_name: ','.join(chunk)})
+                        for chunk in chunked(codes or [], chunk_size)]
+        else:
+            requests = [self.fetch(level)]
+        records = []
+        seen = set()
+        for chunk_records in await asyncio.gather(*requests):
+            for record in chunk_records:
+                # Chunks can overlap (e.g., a whole-level replay), keep the first copy
+                if record.get("code") in seen:
+                    continue
+                seen.add(record.get("code"))
+                records.append(record)
+        return records
+
+    async def crawl(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Crawl the whole hierarchy.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Raw API records keyed by level
+        """
+        large_service_areas, service_areas, large_areas = await asyncio.gather(
+            self.fetch_level("large_service_area"),
+            self.fetch_level("service_area"),
+            self.fetch_level("large_area"),
+        )
+        middle_areas = await self.fetch_level(
+            "middle_area", "large_area", [area["code"] for area in large_areas], MAX_LARGE_AREA_CODES
+        )
+        small_areas = await self.fetch_level(
+            "small_area", "middle_area", [area["code"] for area in middle_areas], MAX_MIDDLE_AREA_CODES
+        )
+        return {
+            "large_service_area": large_service_areas,
+            "service_area": service_areas,
+            "large_area": large_areas,
+            "middle_area": middle_areas,
+            "small_area": small_areas,
+        }
+
+
+def _code(area: Dict[str, Any], parent: str) -> Optional[str]:
+    """Code of a nested parent object of an API record ({"code": ..., "name": ...})."""
+    value = area.get(parent)
+    return value.get("code") if isinstance(value, dict) else value
+
+
+def build_hierarchy(records: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Convert API records into the hotpepper_areas.json structure.
+
+    Args:
+        records (Dict[str, List[Dict[str, Any]]]): Raw API records keyed by level
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Flat lists with parent code references
+    """
+    return {
+        "large_service_area": [
+            {"code": area["code"], "name": area["name"]}
+            for area in records["large_service_area"]
+        ],
+        "service_area": [
+            {"code": area["code"], "name": area["name"], "large_service_area": _code(area, "large_service_area")}
+            for area in records["service_area"]
+        ],
+        "large_area": [
+            {"code": area["code"], "name": area["name"], "service_area": _code(area, "service_area")}
+            for area in records["large_area"]
+        ],
+        "middle_area": [
+            {
+                "code": area["code"],
+                "name": area["name"],
+                "service_area": _code(area, "service_area"),
+                "large_area": _code(area, "large_area"),
+            }
+            for area in records["middle_area"]
+        ],
+        "small_area": [
+            {"code": area["code"], "name": area["name"], "middle_area": _code(area, "middle_area")}
+            for area in records["small_area"]
+        ],
+    }
+
+
+def build_prefecture_files(hierarchy: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Group a hierarchy into per-prefecture structures (as written by the extractors).
+
+    Args:
+        hierarchy (Dict[str, List[Dict[str, Any]]]): Output of build_hierarchy
+
+    Returns:
+        List[Dict[str, Any]]: One area data structure per service area
+    """
+    small_areas: Dict[str, List[Dict[str, Any]]] = {}
+    for area in hierarchy["small_area"]:
+        small_areas.setdefault(area["middle_area"], []).append(area)
+
+    middle_areas: Dict[str, List[Dict[str, Any]]] = {}
+    for area in hierarchy["middle_area"]:
+        middle_areas.setdefault(area["service_area"], []).append({
+            **area,
+            "small_area": small_areas.get(area["code"], []),
+        })
+
+    return [
+        {
+            "service_area_code": service_area["code"],
+            "area_name": f"{service_area['name']}のエリアすべて",
+            "middle_area": middle_areas.get(service_area["code"], []),
+        }
+        for service_area in hierarchy["service_area"]
+    ]
+
+
+def write_outputs(hierarchy: Dict[str, List[Dict[str, Any]]], output_dir: str) -> List[str]:
+    """
+    Write hotpepper_areas.json and every prefecture file (unchanged files are kept).
+
+    Args:
+        hierarchy (Dict[str, List[Dict[str, Any]]]): Output of build_hierarchy
+        output_dir (str): Directory to save the JSON files
+
+    Returns:
+        List[str]: Paths of the written files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    consolidated = os.path.join(output_dir, "hotpepper_areas.json")
+    write_json_if_changed(consolidated, hierarchy)
+    return [consolidated] + [write_area_json(area_data, output_dir) for area_data in build_prefecture_files(hierarchy)]
+
+
+async def crawl_to_directory(api_key: str, output_dir: str, **crawler_options) -> Dict[str, Any]:
+    """
+    Crawl the whole hierarchy and write it to output_dir.
+
+    Args:
+        api_key (str): Hot Pepper API key
+        output_dir (str): Directory to save the JSON files
+        **crawler_options: Options passed to AreaCrawler
+
+    Returns:
+        Dict[str, Any]: Crawl statistics
+    """
+    started = time.perf_counter()
+    async with AreaCrawler(api_key, **crawler_options) as crawler:
+        records = await crawler.crawl()
+    hierarchy = build_hierarchy(records)
+    files = write_outputs(hierarchy, output_dir)
+    return {
+        "requests": crawler.requests,
+        "files": len(files),
+        "counts": {level: len(areas) for level, areas in hierarchy.items()},
+        "elapsed_seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    """Command line entry point for the crawler."""
+    parser = argparse.ArgumentParser(description="Crawl the Hot Pepper area master APIs.")
+    parser.add_argument('--output-dir', default="areas", help="Directory to save the JSON files")
+    parser.add_argument('--key', default=os.environ.get('HOTPEPPER_API_KEY', ''),
+                        help="API key (default: HOTPEPPER_API_KEY)")
+    parser.add_argument('--base-url', default=BASE_URL, help="API base URL (e.g., a replay_server.py address)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Maximum concurrent requests")
+    parser.add_argument('--rate', type=float, default=5.0, help="Maximum requests per second (0 = unlimited)")
+    parser.add_argument('--retries', type=int, default=3, help="Retries per request on errors")
+    parser.add_argument('--record', help="Save every response to this directory for replay_server.py")
+    parser.add_argument('--format', choices=["xml", "json"], default="xml",
+                        help="Response format to request (JSON streams only with ijson installed)")
+    args = parser.parse_args()
+
+    if not args.key:
+        print("❌ HOTPEPPER_API_KEY is not set (or pass --key)")
+        return 1
+
+    stats = asyncio.run(crawl_to_directory(
+        args.key, args.output_dir, base_url=args.base_url, concurrency=args.concurrency,
+        rate=args.rate, retries=args.retries, record_dir=args.record,
+        response_format=args.format,
+    ))
+    print(f"✅ Crawled {stats['requests']} responses into {stats['files']} files in {stats['elapsed_seconds']:.2f}s")
+    for level, count in stats['counts'].items():
+        print(f"   - {level}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Structural Diff of Area Hierarchies
+
+Compares two extractor outputs (directories of area files, a consolidated
+hotpepper_areas.json, NDJSON record streams or binary snapshots) as code-keyed
+maps in linear time, and reports which codes were added, removed, renamed or
+moved to another parent. The change set is JSON, so downstream caches can
+invalidate exactly the affected codes.
+
+Usage:
+    python area_diff.py old_areas/ areas/ [-o changes.json] [--exit-code]
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from area_index import LEVELS, AreaIndex, area_files, iter_records_from_file, level_of
+
+
+class AreaState(NamedTuple):
+    """What the diff compares for one code."""
+
+    name: str
+    level: str
+    parent: Optional[str]
+
+
+def areas_from_index(index: AreaIndex) -> Dict[str, AreaState]:
+    """
+    Build the code-keyed map of an area index.
+
+    Parents are the codes the records referenced, so a move is seen even when
+    the parent itself is not part of the data (e.g., per-prefecture files
+    without hotpepper_areas.json). Unknown levels read as "", as in a snapshot
+    of the same data.
+
+    Args:
+        index (AreaIndex): Loaded area hierarchy
+
+    Returns:
+        Dict[str, AreaState]: Name, level and parent code of every area
+    """
+    return {
+        node.code: AreaState(
+            node.name,
+            node.level if node.level in LEVELS else "",
+            index.parent_code(node.code) or None,
+        )
+        for node in index
+    }
+
+
+def areas_from_records(records: Iterable[Dict[str, Any]]) -> Dict[str, AreaState]:
+    """
+    Build the code-keyed map of flat area records.
+
+    Records are merged and linked by AreaIndex.from_records (later records only
+    replace the name or parent when they carry one), the same normalization a
+    snapshot export applies.
+
+    Args:
+        records (Iterable[Dict[str, Any]]): Records with code, name, level and parent keys
+
+    Returns:
+        Dict[str, AreaState]: Name, level and parent code of every area
+    """
+    return areas_from_index(AreaIndex.from_records(records))
+
+
+def load_areas(source: str) -> Dict[str, AreaState]:
+    """
+    Load a code-keyed map from any extractor output.
+
+    Every source is normalized through AreaIndex, so a directory and a
+    snapshot exported from it compare equal.
+
+    Args:
+        source (str): Directory of area files, a .json/.ndjson file, or a
+            snapshot written by area_snapshot.py
+
+    Returns:
+        Dict[str, AreaState]: Name, level and parent code of every area
+    """
+    if os.path.isdir(source):
+        file_paths = area_files(source)
+    elif source.endswith('.json') or source.endswith('.ndjson'):
+        file_paths = [source]
+    else:
+        from area_snapshot import AreaSnapshot
+        with AreaSnapshot(source) as snapshot:
+            return areas_from_index(snapshot.to_index())
+    return areas_from_records(record for file_path in file_paths for record in iter_records_from_file(file_path))
+
+
+def _sort_key(code: str):
+    """Order changes by level (widest first), then by code."""
+    level = level_of(code)
+    return (LEVELS.index(level) if level else len(LEVELS)), code
+
+
+def _unlinked_parent(before: AreaState, after: AreaState,
+                     old: Dict[str, AreaState], new: Dict[str, AreaState]) -> bool:
+    """Whether one side has no parent and the other references a parent it does not contain."""
+    if before.parent is None:
+        return after.parent not in new
+    if after.parent is None:
+        return before.parent not in old
+    return False
+
+
+def diff_areas(old: Dict[str, AreaState], new: Dict[str, AreaState]) -> Dict[str, Any]:
+    """
+    Compare two code-keyed area maps.
+
+    A code whose name and parent both changed appears in renamed and moved.
+    A snapshot only keeps parents that are part of its data, so a parent that
+    is missing on one side and not loaded on the other is not a move.
+
+    Args:
+        old (Dict[str, AreaState]): Previous hierarchy
+        new (Dict[str, AreaState]): Current hierarchy
+
+    Returns:
+        Dict[str, Any]: Change set with added, removed, renamed and moved lists,
+            the sorted list of every affected code, and per-kind counts
+    """
+    added: List[Dict[str, Any]] = []
+    removed: List[Dict[str, Any]] = []
+    renamed: List[Dict[str, Any]] = []
+    moved: List[Dict[str, Any]] = []
+
+    for code, area in new.items():
+        before = old.get(code)
+        if before is None:
+            added.append({"code": code, "name": area.name, "level": area.level, "parent": area.parent})
+            continue
+        if before.name != area.name:
+            renamed.append({"code": code, "old_name": before.name, "new_name": area.name})
+        if before.parent != area.parent and not _unlinked_parent(before, area, old, new):
+            moved.append({"code": code, "old_parent": before.parent, "new_parent": area.parent})
+
+    for code, area in old.items():
+        if code not in new:
+            removed.append({"code": code, "name": area.name, "level": area.level, "parent": area.parent})
+
+    changes = {"added": added, "removed": removed, "renamed": renamed, "moved": moved}
+    for entries in changes.values():
+        entries.sort(key=lambda entry: _sort_key(entry["code"]))
+
+    affected = {entry["code"] for entries in changes.values() for entry in entries}
+    return {
+        **changes,
+        "affected": sorted(affected, key=_sort_key),
+        "summary": {kind: len(entries) for kind, entries in changes.items()},
+    }
+
+
+def main():
+    """Command line entry point for the area diff."""
+    parser = argparse.ArgumentParser(description="Diff two area hierarchies by code.")
+    parser.add_argument('old', help="Previous output (directory, .json, .ndjson or snapshot)")
+    parser.add_argument('new', help="Current output (directory, .json, .ndjson or snapshot)")
+    parser.add_argument('-o', '--output', help="Write the change set to this file instead of stdout")
+    parser.add_argument('--exit-code', action='store_true', help="Exit with 1 when there are changes")
+    args = parser.parse_args()
+
+    for source in (args.old, args.new):
+        if not os.path.exists(source):
+            print(f"❌ Not found: {source}", file=sys.stderr)
+            return 2
+
+    changes = diff_areas(load_areas(args.old), load_areas(args.new))
+    text = json.dumps(changes, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    summary = changes["summary"]
+    print(
+        f"📊 {summary['added']} added, {summary['removed']} removed, "
+        f"{summary['renamed']} renamed, {summary['moved']} moved",
+        file=sys.stderr,
+    )
+    return 1 if args.exit_code and changes["affected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,95 +6,210 @@ HTML structures, including large service areas, service areas, and middle areas.
 """
 
 import json
+import os
 import re
-from typing import List, Dict, Any
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional, TextIO, Tuple, Union
 from bs4 import BeautifulSoup
 
+import metrics
+from area_index import iter_records_from_data
+from fast_options import iter_options
+from page_slicer import slice_area_selects
 
-def extract_middle_areas_from_select(select_html: str, service_area_code: str, output_dir: str = "areas") -> str:
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+# Path -> [in-process lock, number of threads holding or waiting for it]
+_file_locks: Dict[str, List[Any]] = {}
+_file_locks_guard = threading.Lock()
+
+
+def read_options(select_html: str, fast: bool = False) -> List[Tuple[Optional[str], str]]:
     """
-    Extract middle area information from HTML select structure and save to individual JSON file.
+    Read the value and text of every option element in document order.
     
-    This function parses HTML select elements containing option tags with Y-codes
-    (middle areas), extracts the area codes and names, and creates a separate JSON file
-    for each service area using the first option text as the filename.
+    Full saved pages are accepted: only their select elements are parsed
+    (see page_slicer.slice_area_selects).
+    
+    Args:
+        select_html (str): HTML content containing option elements, or a full page
+        fast (bool): Use the streaming html.parser path instead of building a
+            BeautifulSoup tree (same output, see verify_fast_path.py)
+    
+    Returns:
+        List[Tuple[Optional[str], str]]: Value attribute and stripped text of each option
+    """
+    metrics.count("pages")
+    with metrics.span("slice"):
+        select_html = slice_area_selects(select_html)
+    
+    with metrics.span("parse"):
+        if fast:
+            options = iter_options(select_html)
+        else:
+            soup = BeautifulSoup(select_html, 'html.parser')
+            options = [(option.get('value'), option.get_text(strip=True)) for option in soup.find_all('option')]
+    
+    metrics.count("options", len(options))
+    return options
+
+
+def parse_middle_areas(select_html: str, service_area_code: str, fast: bool = False) -> Dict[str, Any]:
+    """
+    Parse middle area information from HTML select structure without writing it.
     
     Args:
         select_html (str): HTML content containing select element with middle areas
         service_area_code (str): The parent service area code (e.g., "SA41")
-        output_dir (str): Directory to save the JSON files (default: "areas")
+        fast (bool): Read options without building a BeautifulSoup tree
     
     Returns:
-        str: Path to the created JSON file
-    
-    Example:
-        >>> html = '<select><option value="">北海道のエリアすべて</option><option value="Y500">すすきの</option></select>'
-        >>> extract_middle_areas_from_select(html, "SA41")
-        'areas/北海道のエリアすべて.json'
+        Dict[str, Any]: Area data with service_area_code, area_name and middle_area keys
     """
-    import os
-    
-    soup = BeautifulSoup(select_html, 'html.parser')
     middle_areas = []
     area_name = ""
     
     # Find all option elements
-    options = soup.find_all('option')
+    options = read_options(select_html, fast)
     
     # Get the first option (usually the "all areas" option) for filename
     if options:
-        first_option = options[0]
-        area_name = first_option.get_text(strip=True)
+        area_name = options[0][1]
         # Clean filename (remove invalid characters)
         area_name = re.sub(r'[<>:"/\\|?*]', '_', area_name)
     
     # Extract Y codes (middle areas) from remaining options
-    for option in options:
-        value = option.get('value')
-        name = option.get_text(strip=True)
-        
-        # Extract Y codes (middle areas) - ensure value is a string and not empty
-        if value and isinstance(value, str) and value.startswith('Y'):
-            middle_area_data = {
-                "code": value,
-                "name": name,
-                "service_area": service_area_code,  # Reference to parent service area
-                "small_area": []  # Empty array ready to be filled with X-codes
-            }
-            middle_areas.append(middle_area_data)
+    with metrics.span("filter"):
+        for value, name in options:
+            # Extract Y codes (middle areas) - ensure value is a string and not empty
+            if value and isinstance(value, str) and value.startswith('Y'):
+                middle_area_data = {
+                    "code": value,
+                    "name": name,
+                    "service_area": service_area_code,  # Reference to parent service area
+                    "small_area": []  # Empty array ready to be filled with X-codes
+                }
+                middle_areas.append(middle_area_data)
     
     # Create the data structure
-    area_data = {
+    return {
         "service_area_code": service_area_code,
         "area_name": area_name,
         "middle_area": middle_areas
     }
+
+
+def area_json_path(area_data: Dict[str, Any], output_dir: str = "areas") -> str:
+    """
+    Return the path of the JSON file for parsed area data.
     
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    Args:
+        area_data (Dict[str, Any]): Area data as returned by parse_middle_areas
+        output_dir (str): Directory of the JSON files (default: "areas")
     
+    Returns:
+        str: Path named after the area name (or area_<SA code> when it is empty)
+    """
     # Create filename from area name
+    area_name = area_data["area_name"]
     if not area_name:
-        area_name = f"area_{service_area_code}"
+        area_name = f"area_{area_data['service_area_code']}"
     
     filename = f"{area_name}.json"
-    filepath = os.path.join(output_dir, filename)
+    return os.path.join(output_dir, filename)
+
+
+def write_area_json(area_data: Dict[str, Any], output_dir: str = "areas",
+                    keep_small_areas: bool = False) -> str:
+    """
+    Save parsed area data to a JSON file named after its area name.
+    
+    Args:
+        area_data (Dict[str, Any]): Area data as returned by parse_middle_areas
+        output_dir (str): Directory to save the JSON files (default: "areas")
+        keep_small_areas (bool): Take the small_area arrays from the existing
+            file (by middle area code) instead of area_data, so re-extracting
+            the middle areas keeps small areas merged in earlier
+    
+    Returns:
+        str: Path to the created JSON file
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    
+    filepath = area_json_path(area_data, output_dir)
     
-    # Save to JSON file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(area_data, f, ensure_ascii=False, indent=2)
+    # Save to JSON file (left untouched when the content is identical)
+    with locked_file(filepath):
+        if keep_small_areas:
+            previous = _read_small_areas(filepath)
+            for middle_area in area_data['middle_area']:
+                middle_area['small_area'] = previous.get(middle_area['code'], [])
+        write_json_if_changed(filepath, area_data)
     
     return filepath
 
 
-def add_small_areas_to_json(json_file_path: str, middle_area_code: str, small_areas_html: str) -> str:
+def _read_small_areas(json_file_path: str) -> Dict[str, List[Dict[str, str]]]:
+    """Return the small areas of an area JSON file by middle area code (empty when it does not exist)."""
+    try:
+        with metrics.span("read"), open(json_file_path, 'r', encoding='utf-8') as f:
+            area_data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {middle_area['code']: middle_area.get('small_area', []) for middle_area in area_data.get('middle_area', [])}
+
+
+def extract_middle_areas_from_select(select_html: str, service_area_code: str, output_dir: str = "areas",
+                                     fast: bool = False, keep_small_areas: bool = False) -> str:
+    """
+    Extract middle area information from HTML select structure and save to individual JSON file.
+    
+    This function parses HTML select elements containing option tags with Y-codes
+    (middle areas), extracts the area codes and names, and creates a separate JSON file
+    for each service area using the first option text as the filename. The middle
+    areas start with empty small_area arrays unless keep_small_areas is set.
+    
+    Args:
+        select_html (str): HTML content containing select element with middle areas
+        service_area_code (str): The parent service area code (e.g., "SA41")
+        output_dir (str): Directory to save the JSON files (default: "areas")
+        fast (bool): Read options without building a BeautifulSoup tree
+        keep_small_areas (bool): Keep the small areas an existing file already
+            holds for middle areas that are still in the select
+    
+    Returns:
+        str: Path to the created JSON file
+    
+    Example:
+        >>> html = '<select><option value="">北海道のエリアすべて</option><option value="Y500">すすきの</option></select>'
+        >>> extract_middle_areas_from_select(html, "SA41")
+        'areas/北海道のエリアすべて.json'
+    """
+    area_data = parse_middle_areas(select_html, service_area_code, fast)
+    return write_area_json(area_data, output_dir, keep_small_areas)
+
+
+def add_small_areas_to_json(json_file_path: str, middle_area_code: str, small_areas_html: str,
+                            fast: bool = False) -> str:
     """
     Add small areas to a specific middle area in an existing JSON file.
     
+    To fill several middle areas of the same file, prefer add_small_areas_bulk,
+    which reads and writes the file only once.
+    
     Args:
         json_file_path (str): Path to the existing area JSON file
         middle_area_code (str): The middle area code to add small areas to (e.g., "Y200")
         small_areas_html (str): HTML content containing select element with small areas (X-codes)
+        fast (bool): Read options without building a BeautifulSoup tree
     
     Returns:
         str: Path to the updated JSON file
@@ -102,27 +217,203 @@ def add_small_areas_to_json(json_file_path: str, middle_area_code: str, small_ar
     Example:
         add_small_areas_to_json("areas/大阪のエリアすべて.json", "Y200", small_areas_html)
     """
-    # Extract small areas from HTML
-    small_areas = extract_small_areas_from_select(small_areas_html, middle_area_code)
+    return add_small_areas_bulk(json_file_path, {middle_area_code: small_areas_html}, fast)
+
+
+def merge_small_areas(area_data: Dict[str, Any],
+                      small_areas_by_code: Mapping[str, Union[str, List[Dict[str, str]]]],
+                      fast: bool = False) -> int:
+    """
+    Fill the small_area arrays of an in-memory area structure.
     
-    # Read existing JSON file
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        area_data = json.load(f)
+    Args:
+        area_data (Dict[str, Any]): Area data as returned by parse_middle_areas
+        small_areas_by_code (Mapping): Middle area code -> small area select HTML,
+            or an already extracted list of small area dictionaries
+        fast (bool): Read options without building a BeautifulSoup tree
     
-    # Find the middle area and update its small_area array
-    for middle_area in area_data['middle_area']:
-        if middle_area['code'] == middle_area_code:
-            middle_area['small_area'] = small_areas
-            break
+    Returns:
+        int: Number of middle areas that were updated
+    """
+    # Index middle areas by code once instead of scanning the list per update
+    middle_areas = {middle_area['code']: middle_area for middle_area in area_data['middle_area']}
+    updated = 0
+    
+    for middle_area_code, small_areas in small_areas_by_code.items():
+        middle_area = middle_areas.get(middle_area_code)
+        if middle_area is None:
+            continue
+        
+        if isinstance(small_areas, str):
+            small_areas = extract_small_areas_from_select(small_areas, middle_area_code, fast)
+        
+        middle_area['small_area'] = list(small_areas)
+        updated += 1
+    
+    return updated
+
+
+def add_small_areas_bulk(json_file_path: str,
+                         small_areas_by_code: Mapping[str, Union[str, List[Dict[str, str]]]],
+                         fast: bool = False) -> str:
+    """
+    Add small areas to many middle areas of an existing JSON file in one write.
     
-    # Save updated data back to file
-    with open(json_file_path, 'w', encoding='utf-8') as f:
-        json.dump(area_data, f, ensure_ascii=False, indent=2)
+    The file is read once, updated in memory and replaced atomically, so readers
+    never observe a partially written file. The whole read-modify-write holds
+    locked_file, so concurrent updates of the same file are not lost.
+    
+    Args:
+        json_file_path (str): Path to the existing area JSON file
+        small_areas_by_code (Mapping): Middle area code -> small area select HTML,
+            or an already extracted list of small area dictionaries
+        fast (bool): Read options without building a BeautifulSoup tree
+    
+    Returns:
+        str: Path to the updated JSON file
+    
+    Example:
+        add_small_areas_bulk("areas/大阪のエリアすべて.json", {"Y200": y200_html, "Y300": y300_html})
+    """
+    # Extract before taking the lock so other writers only wait for the merge
+    small_areas_by_code = {
+        middle_area_code: (
+            extract_small_areas_from_select(small_areas, middle_area_code, fast)
+            if isinstance(small_areas, str) else small_areas
+        )
+        for middle_area_code, small_areas in small_areas_by_code.items()
+    }
+    
+    with locked_file(json_file_path):
+        # Read existing JSON file
+        with metrics.span("read"), open(json_file_path, 'r', encoding='utf-8') as f:
+            area_data = json.load(f)
+        
+        merge_small_areas(area_data, small_areas_by_code, fast)
+        
+        # Save updated data back to file
+        write_json_atomic(json_file_path, area_data)
     
     return json_file_path
 
 
-def extract_small_areas_from_select(select_html: str, middle_area_code: str) -> List[Dict[str, str]]:
+@contextmanager
+def locked_file(file_path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a file for the duration of a read-modify-write.
+    
+    Threads are serialized by an in-process lock per path, and processes by
+    flock on a sidecar ".<name>.lock" file next to it (where fcntl exists).
+    The data file itself cannot carry the lock because writers replace it.
+    The sidecar is removed before it is unlocked, and a lock taken on a sidecar
+    that was removed meanwhile is retried on the new one. Writers of different
+    files never wait on each other.
+    
+    Args:
+        file_path (str): File about to be read and/or written
+    
+    Example:
+        >>> with locked_file("areas/北海道のエリアすべて.json"):
+        ...     data = json.load(open("areas/北海道のエリアすべて.json"))
+        ...     write_json_atomic("areas/北海道のエリアすべて.json", data)
+    """
+    path = os.path.abspath(file_path)
+    # Entries live only while a thread holds or waits for the lock
+    with _file_locks_guard:
+        entry = _file_locks.setdefault(path, [threading.Lock(), 0])
+        entry[1] += 1
+    
+    try:
+        with entry[0]:
+            if fcntl is None:
+                yield
+                return
+            directory, name = os.path.split(path)
+            lock_path = os.path.join(directory, f".{name}.lock")
+            while True:
+                lock_file = open(lock_path, 'a')
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_path)):
+                        break
+                except FileNotFoundError:
+                    pass
+                lock_file.close()
+            try:
+                yield
+            finally:
+                os.unlink(lock_path)
+                # Closing releases the flock
+                lock_file.close()
+    finally:
+        with _file_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _file_locks[path]
+
+
+def write_json_atomic(file_path: str, data: Any) -> None:
+    """
+    Write JSON data through a temporary file and os.replace.
+    
+    Args:
+        file_path (str): Destination path
+        data (Any): JSON serializable data
+    """
+    with metrics.span("serialize"):
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    _write_text_atomic(file_path, text)
+
+
+def write_json_if_changed(file_path: str, data: Any) -> bool:
+    """
+    Write JSON data atomically unless the file already has the same content.
+    
+    Skipping identical writes keeps modification times and git diffs stable
+    when a re-extraction produces the same result.
+    
+    Args:
+        file_path (str): Destination path
+        data (Any): JSON serializable data
+    
+    Returns:
+        bool: True when the file was written
+    """
+    with metrics.span("serialize"):
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    try:
+        with metrics.span("read"), open(file_path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                metrics.count("files_unchanged")
+                return False
+    except FileNotFoundError:
+        pass
+    _write_text_atomic(file_path, text)
+    return True
+
+
+def _write_text_atomic(file_path: str, text: str) -> None:
+    """Write text through a temporary file in the same directory and os.replace."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    with metrics.span("write"):
+        fd, temp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            if metrics.enabled():
+                metrics.count("files_written")
+                metrics.count("bytes_written", os.path.getsize(temp_path))
+            # mkstemp creates owner-only files; keep the permissions of the file being replaced
+            mode = os.stat(file_path).st_mode & 0o777 if os.path.exists(file_path) else 0o644
+            os.chmod(temp_path, mode)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def extract_small_areas_from_select(select_html: str, middle_area_code: str,
+                                    fast: bool = False) -> List[Dict[str, str]]:
     """
     Extract small area information from HTML select structure.
     
@@ -131,6 +422,7 @@ def extract_small_areas_from_select(select_html: str, middle_area_code: str) ->
     Args:
         select_html (str): HTML content containing select element with small areas
         middle_area_code (str): The parent middle area code (e.g., "Y500")
+        fast (bool): Read options without building a BeautifulSoup tree
     
     Returns:
         List[Dict[str, str]]: List of small area dictionaries with:
@@ -138,27 +430,95 @@ def extract_small_areas_from_select(select_html: str, middle_area_code: str) ->
             - name: The area name
             - middle_area: Reference to parent middle area code
     """
-    soup = BeautifulSoup(select_html, 'html.parser')
     small_areas = []
     
     # Find all option elements with X codes
-    options = soup.find_all('option')
-    for option in options:
-        value = option.get('value')
-        name = option.get_text(strip=True)
-        
-        # Extract X codes (small areas) - ensure value is a string and not empty
-        if value and isinstance(value, str) and value.startswith('X'):
-            small_area_data = {
-                "code": value,
-                "name": name,
-                "middle_area": middle_area_code  # Reference to parent middle area
-            }
-            small_areas.append(small_area_data)
+    options = read_options(select_html, fast)
+    with metrics.span("filter"):
+        for value, name in options:
+            # Extract X codes (small areas) - ensure value is a string and not empty
+            if value and isinstance(value, str) and value.startswith('X'):
+                small_area_data = {
+                    "code": value,
+                    "name": name,
+                    "middle_area": middle_area_code  # Reference to parent middle area
+                }
+                small_areas.append(small_area_data)
     
     return small_areas
 
 
+def iter_select_records(select_html: str, parent_code: str, fast: bool = False) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Yield one flat area record per Y/X option of a select, as it is read.
+    
+    Args:
+        select_html (str): HTML content containing a middle area or small area select
+        parent_code (str): Parent of the options (the SA code for Y options,
+            the Y code for X options)
+        fast (bool): Read options without building a BeautifulSoup tree
+    
+    Yields:
+        Dict[str, Optional[str]]: Records with code, name, level and parent keys
+    """
+    for value, name in read_options(select_html, fast):
+        if not value or not isinstance(value, str):
+            continue
+        if value.startswith('Y'):
+            level = "middle_area"
+        elif value.startswith('X'):
+            level = "small_area"
+        else:
+            continue
+        yield {"code": value, "name": name, "level": level, "parent": parent_code}
+
+
+def iter_area_records(area_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the flat records (code, name, level, parent) of an area data structure.
+    
+    Args:
+        area_data (Dict[str, Any]): Per-prefecture data (parse_middle_areas) or
+            the consolidated hotpepper_areas.json structure
+    
+    Yields:
+        Dict[str, Any]: Records with code, name, level and parent keys
+    """
+    return iter_records_from_data(area_data)
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], destination: Union[str, TextIO] = "-") -> int:
+    """
+    Stream area records as NDJSON, one record per line.
+    
+    Each line is flushed as soon as its record is produced, so a consumer reading
+    the file or pipe (e.g., AreaIndex.from_records(iter_records_from_ndjson(...)))
+    can work while extraction is still running.
+    
+    Args:
+        records (Iterable[Dict[str, Any]]): Records, typically a generator
+        destination (Union[str, TextIO]): File path, "-" for stdout, or an open text stream
+    
+    Returns:
+        int: Number of records written
+    """
+    if destination == "-":
+        return _write_ndjson_lines(records, sys.stdout)
+    if not isinstance(destination, str):
+        return _write_ndjson_lines(records, destination)
+    with open(destination, 'w', encoding='utf-8') as f:
+        return _write_ndjson_lines(records, f)
+
+
+def _write_ndjson_lines(records: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        stream.flush()
+        count += 1
+    return count
+
+
 def demo_usage():
     """Demonstrate usage of the area extraction utilities."""
     print("🏗️  Hot Pepper Area Extraction Utilities Demo")
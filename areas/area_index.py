@@ -0,0 +1,366 @@
+"""
+Hot Pepper Area Hierarchy Index
+
+This module loads the extracted area files (the consolidated hotpepper_areas.json
+and the per-prefecture files such as 北海道のエリアすべて.json) once and keeps the
+whole hierarchy (SS → SA → Z → Y → X) in memory for constant-time lookups by code.
+"""
+
+import glob
+import json
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Any, TextIO, Union
+
+
+# Area levels from the widest to the narrowest
+LEVELS = ("large_service_area", "service_area", "large_area", "middle_area", "small_area")
+
+# Code prefix of each level (e.g., "SA41" is a service area)
+LEVEL_PREFIXES = (
+    ("SS", "large_service_area"),
+    ("SA", "service_area"),
+    ("Z", "large_area"),
+    ("Y", "middle_area"),
+    ("X", "small_area"),
+)
+
+CONSOLIDATED_FILENAME = "hotpepper_areas.json"
+
+# Guard against parent cycles in malformed data
+MAX_DEPTH = 32
+
+
+def level_of(code: str) -> Optional[str]:
+    """
+    Return the area level of a code from its prefix.
+
+    Args:
+        code (str): Area code (e.g., "SA41", "Y500")
+
+    Returns:
+        Optional[str]: Level name, or None when the prefix is unknown
+    """
+    for prefix, level in LEVEL_PREFIXES:
+        if code.startswith(prefix):
+            return level
+    return None
+
+
+def _parent_of(area: Dict[str, Any], level: str) -> Optional[str]:
+    """Pick the closest parent code referenced by an area dictionary."""
+    if level == "service_area":
+        return area.get("large_service_area") or None
+    if level == "large_area":
+        return area.get("service_area") or None
+    if level == "middle_area":
+        # Z codes sit between SA and Y when the data contains them
+        return area.get("large_area") or area.get("service_area") or None
+    if level == "small_area":
+        return area.get("middle_area") or None
+    return None
+
+
+def iter_records_from_data(data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Turn the content of an area JSON file into flat area records.
+
+    Both the consolidated format (lists keyed by level) and the per-prefecture
+    format (service_area_code + nested middle_area/small_area) are supported.
+
+    Args:
+        data (Dict[str, Any]): Parsed JSON content
+
+    Yields:
+        Dict[str, Any]: Records with code, name, level and parent keys
+    """
+    if "service_area_code" in data:
+        service_area_code = data["service_area_code"]
+        for middle_area in data.get("middle_area", []):
+            yield {
+                "code": middle_area["code"],
+                "name": middle_area.get("name", ""),
+                "level": "middle_area",
+                "parent": _parent_of(middle_area, "middle_area") or service_area_code,
+            }
+            small_areas = middle_area.get("small_area")
+            if isinstance(small_areas, list):
+                for small_area in small_areas:
+                    yield {
+                        "code": small_area["code"],
+                        "name": small_area.get("name", ""),
+                        "level": "small_area",
+                        "parent": _parent_of(small_area, "small_area") or middle_area["code"],
+                    }
+        return
+
+    for level in LEVELS:
+        areas = data.get(level)
+        if not isinstance(areas, list):
+            continue
+        for area in areas:
+            yield {
+                "code": area["code"],
+                "name": area.get("name", ""),
+                "level": level,
+                "parent": _parent_of(area, level),
+            }
+
+
+def iter_records_from_file(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read flat area records from one extracted JSON file.
+
+    Args:
+        file_path (str): Path to hotpepper_areas.json, a per-prefecture file, or
+            an NDJSON record stream (*.ndjson)
+
+    Yields:
+        Dict[str, Any]: Records with code, name, level and parent keys
+    """
+    if file_path.endswith('.ndjson'):
+        yield from iter_records_from_ndjson(file_path)
+        return
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        yield from iter_records_from_data(data)
+
+
+def iter_records_from_ndjson(source: Union[str, TextIO]) -> Iterator[Dict[str, Any]]:
+    """
+    Read flat area records from NDJSON (one record per line), lazily.
+
+    Lines are parsed as they are read, so an index can be built from a pipe while
+    the extractor is still writing (e.g., extract_areas.py --ndjson -).
+
+    Args:
+        source (Union[str, TextIO]): Path to an .ndjson file, or an open text stream
+
+    Yields:
+        Dict[str, Any]: Records with code, name, level and parent keys
+    """
+    if isinstance(source, str):
+        with open(source, 'r', encoding='utf-8') as f:
+            yield from iter_records_from_ndjson(f)
+        return
+    for line in source:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def area_files(*directories: str) -> List[str]:
+    """
+    List the area JSON files of one or more directories.
+
+    The consolidated hotpepper_areas.json comes first in each directory so that
+    per-prefecture files can refine what it contains.
+
+    Args:
+        *directories (str): Directories containing extracted area files
+
+    Returns:
+        List[str]: JSON file paths in load order
+    """
+    paths = []
+    for directory in directories:
+        consolidated = os.path.join(directory, CONSOLIDATED_FILENAME)
+        if os.path.isfile(consolidated):
+            paths.append(consolidated)
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            if os.path.basename(path) != CONSOLIDATED_FILENAME:
+                paths.append(path)
+    return paths
+
+
+class AreaNode:
+    """A single area of the hierarchy with links to its parent and children."""
+
+    __slots__ = ("code", "name", "level", "parent", "children")
+
+    def __init__(self, code: str, name: str, level: str):
+        self.code = sys.intern(code)
+        self.name = sys.intern(name)
+        self.level = level
+        self.parent: Optional["AreaNode"] = None
+        self.children: List["AreaNode"] = []
+
+    def __repr__(self) -> str:
+        return f"AreaNode({self.code!r}, {self.name!r}, {self.level!r})"
+
+
+class AreaIndex:
+    """
+    In-memory area hierarchy with O(1) lookup by code.
+
+    Example:
+        >>> index = AreaIndex.load("areas")
+        >>> index["Y500"].name
+        'すすきの'
+        >>> [node.code for node in index.ancestors("Y500")]
+        ['SA41', 'SS01']
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, AreaNode] = {}
+        self._parent_codes: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "AreaIndex":
+        """
+        Build an index from flat area records.
+
+        Later records for the same code update the name and parent of earlier ones,
+        so the order of the inputs decides which source wins.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Records with code, name, level and parent keys
+
+        Returns:
+            AreaIndex: The linked index
+        """
+        index = cls()
+        for record in records:
+            index._add(record)
+        index._link()
+        return index
+
+    @classmethod
+    def from_files(cls, file_paths: Iterable[str]) -> "AreaIndex":
+        """
+        Build an index from extracted area JSON files.
+
+        Args:
+            file_paths (Iterable[str]): Paths to hotpepper_areas.json and per-prefecture files
+
+        Returns:
+            AreaIndex: The linked index
+        """
+        return cls.from_records(
+            record for file_path in file_paths for record in iter_records_from_file(file_path)
+        )
+
+    @classmethod
+    def load(cls, *directories: str) -> "AreaIndex":
+        """
+        Build an index from every area JSON file of the given directories.
+
+        Args:
+            *directories (str): Directories containing extracted area files
+                (default: the directory of this module)
+
+        Returns:
+            AreaIndex: The linked index
+        """
+        if not directories:
+            directories = (os.path.dirname(os.path.abspath(__file__)),)
+        return cls.from_files(area_files(*directories))
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        """Create or update the node of a record (links are resolved by _link)."""
+        code = record["code"]
+        name = record.get("name") or ""
+        node = self._nodes.get(code)
+        if node is None:
+            level = record.get("level") or level_of(code) or ""
+            self._nodes[code] = AreaNode(code, name, level)
+        elif name:
+            node.name = sys.intern(name)
+
+        parent_code = record.get("parent")
+        if parent_code or code not in self._parent_codes:
+            self._parent_codes[code] = parent_code
+
+    def _link(self) -> None:
+        """Resolve parent codes into node references and children lists."""
+        for node in self._nodes.values():
+            node.parent = None
+            node.children = []
+        for code, parent_code in self._parent_codes.items():
+            parent = self._nodes.get(parent_code) if parent_code else None
+            if parent is not None:
+                node = self._nodes[code]
+                node.parent = parent
+                parent.children.append(node)
+
+    def get(self, code: str) -> Optional[AreaNode]:
+        """Return the node of a code, or None when it is unknown."""
+        return self._nodes.get(code)
+
+    def __getitem__(self, code: str) -> AreaNode:
+        return self._nodes[code]
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator[AreaNode]:
+        return iter(self._nodes.values())
+
+    def parent(self, code: str) -> Optional[AreaNode]:
+        """Return the direct parent of a code, or None for roots and unknown codes."""
+        node = self._nodes.get(code)
+        return node.parent if node is not None else None
+
+    def parent_code(self, code: str) -> Optional[str]:
+        """Return the parent code recorded for a code, even when that parent was never loaded."""
+        return self._parent_codes.get(code)
+
+    def ancestors(self, code: str) -> List[AreaNode]:
+        """
+        Return the parent chain of a code, nearest parent first.
+
+        Args:
+            code (str): Area code (e.g., "X100")
+
+        Returns:
+            List[AreaNode]: Ancestors up to the root (empty for unknown codes),
+                at most MAX_DEPTH of them
+        """
+        chain = []
+        node = self._nodes.get(code)
+        while node is not None and node.parent is not None and len(chain) < MAX_DEPTH:
+            node = node.parent
+            chain.append(node)
+        return chain
+
+    def children(self, code: str) -> List[AreaNode]:
+        """Return the direct children of a code (empty for leaves and unknown codes)."""
+        node = self._nodes.get(code)
+        return list(node.children) if node is not None else []
+
+    def descendants(self, code: str, level: Optional[str] = None) -> Iterator[AreaNode]:
+        """
+        Iterate over every area below a code, depth first.
+
+        Args:
+            code (str): Area code (e.g., "SA41")
+            level (Optional[str]): Only yield nodes of this level (e.g., "small_area")
+
+        Yields:
+            AreaNode: Descendant nodes, at most MAX_DEPTH levels down
+        """
+        node = self._nodes.get(code)
+        if node is None:
+            return
+        stack = [(child, 1) for child in reversed(node.children)]
+        while stack:
+            current, depth = stack.pop()
+            if level is None or current.level == level:
+                yield current
+            if depth < MAX_DEPTH:
+                stack.extend((child, depth + 1) for child in reversed(current.children))
+
+    def by_level(self, level: str) -> List[AreaNode]:
+        """Return every node of a level in load order."""
+        return [node for node in self._nodes.values() if node.level == level]
+
+
+if __name__ == "__main__":
+    index = AreaIndex.load(*(sys.argv[1:] or [os.path.dirname(os.path.abspath(__file__))]))
+    print(f"📊 Loaded {len(index)} areas:")
+    for level in LEVELS:
+        print(f"   - {level}: {len(index.by_level(level))}")
@@ -0,0 +1,247 @@
+"""
+Hot Pepper Area Name Resolver
+
+This module resolves what users type ("すすきの", "札幌駅", "新札幌") to area codes
+(Y500, Y505, X...) usable with the gourmet API. Names are indexed once through a
+character n-gram inverted index and the index is persisted next to the area files.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from area_extractor import _write_text_atomic
+from area_index import AreaIndex, area_files
+
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_FILENAME = ".area_name_index.json"
+
+# Separators used inside area names (e.g., "南郷・新札幌　白石・厚別・清田")
+_SEPARATORS = re.compile(r'[\s・、,/()（）]+')
+
+
+class Candidate(NamedTuple):
+    """A ranked resolution result."""
+    code: str
+    name: str
+    level: str
+    score: float
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize a name for matching.
+
+    Applies NFKC (full-width ASCII and half-width kana), lowercases, and folds
+    katakana into hiragana so that "ススキノ" matches "すすきの".
+
+    Args:
+        text (str): Raw name or query
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize('NFKC', text).lower()
+    return ''.join(
+        chr(ord(char) - 0x60) if 'ァ' <= char <= 'ヶ' else char
+        for char in text
+    )
+
+
+def name_parts(name: str) -> List[str]:
+    """Split a normalized name into its separator-delimited parts."""
+    return [part for part in _SEPARATORS.split(name) if part]
+
+
+def ngrams(text: str) -> Set[str]:
+    """
+    Return the character unigrams and bigrams of text, ignoring separators.
+
+    Args:
+        text (str): Normalized text
+
+    Returns:
+        Set[str]: Grams of the text
+    """
+    grams = set()
+    for part in name_parts(text):
+        grams.update(part)
+        grams.update(part[i:i + 2] for i in range(len(part) - 1))
+    return grams
+
+
+def source_fingerprint(file_paths: Iterable[str]) -> str:
+    """Fingerprint area files by name, size and modification time."""
+    digest = hashlib.sha1()
+    for path in sorted(file_paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class AreaResolver:
+    """
+    Resolve area names to codes through an n-gram inverted index.
+
+    Example (from the repository root; hokkaido_areas/ holds the full
+    Hokkaido middle areas, while areas/ alone resolves 新札幌 to Y505):
+        >>> resolver = AreaResolver.load_or_build("hokkaido_areas")
+        >>> resolver.resolve("新札幌")[0].code
+        'Y511'
+    """
+
+    def __init__(self, entries: List[Sequence[str]], postings: Dict[str, List[int]], fingerprint: str = ""):
+        # entries[i] = (code, name, level); postings map a gram to entry ids
+        self._entries = [tuple(entry) for entry in entries]
+        self._postings = postings
+        self._normalized = [normalize(entry[1]) for entry in self._entries]
+        self._parts = [name_parts(name) for name in self._normalized]
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_index(cls, index: AreaIndex, fingerprint: str = "") -> "AreaResolver":
+        """
+        Build the inverted index from an AreaIndex.
+
+        Args:
+            index (AreaIndex): Loaded area hierarchy
+            fingerprint (str): Fingerprint of the source files (used by load_or_build)
+
+        Returns:
+            AreaResolver: Resolver ready for lookups
+        """
+        entries = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for node in index:
+            if not node.name:
+                continue
+            entry_id = len(entries)
+            entries.append((node.code, node.name, node.level))
+            for gram in ngrams(normalize(node.name)):
+                postings[gram].append(entry_id)
+        return cls(entries, dict(postings), fingerprint)
+
+    @classmethod
+    def load_or_build(cls, *directories: str, index_path: Optional[str] = None) -> "AreaResolver":
+        """
+        Load the persisted index, rebuilding it only when the area files changed.
+
+        Args:
+            *directories (str): Directories containing extracted area files
+                (default: the directory of this module)
+            index_path (Optional[str]): Where the index is persisted
+                (default: .area_name_index.json in the first directory)
+
+        Returns:
+            AreaResolver: Resolver ready for lookups
+        """
+        if not directories:
+            directories = (os.path.dirname(os.path.abspath(__file__)),)
+        if index_path is None:
+            index_path = os.path.join(directories[0], DEFAULT_INDEX_FILENAME)
+
+        paths = area_files(*directories)
+        fingerprint = source_fingerprint(paths)
+
+        if os.path.isfile(index_path):
+            try:
+                resolver = cls.load(index_path)
+                if resolver.fingerprint == fingerprint:
+                    return resolver
+            except (ValueError, KeyError):
+                pass  # Corrupt or outdated index, rebuild below
+
+        resolver = cls.from_index(AreaIndex.from_files(paths), fingerprint)
+        resolver.save(index_path)
+        return resolver
+
+    @classmethod
+    def load(cls, index_path: str) -> "AreaResolver":
+        """Load a persisted index."""
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version: {data.get('version')}")
+        return cls(data["entries"], data["postings"], data.get("fingerprint", ""))
+
+    def save(self, index_path: str) -> str:
+        """Persist the index as compact JSON, replacing the file atomically."""
+        data = {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "entries": self._entries,
+            "postings": self._postings,
+        }
+        # A killed or concurrent run must never leave a truncated index behind
+        _write_text_atomic(index_path, json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        return index_path
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, query: str, limit: int = 5, levels: Optional[Iterable[str]] = None,
+                min_coverage: float = 0.5) -> List[Candidate]:
+        """
+        Return the areas whose names best match a query.
+
+        Candidates are ranked by the share of query grams found in the name, with
+        bonuses for exact and prefix matches of the whole name or one of its parts,
+        and a small penalty for long names.
+
+        Args:
+            query (str): Text typed by the user (e.g., "札幌駅")
+            limit (int): Maximum number of candidates to return
+            levels (Optional[Iterable[str]]): Only return areas of these levels
+            min_coverage (float): Minimum share of query grams a name must contain
+
+        Returns:
+            List[Candidate]: Best candidates first
+        """
+        normalized = normalize(query)
+        query_text = ''.join(name_parts(normalized))
+        grams = ngrams(normalized)
+        if not grams:
+            return []
+
+        # Count how many query grams every entry shares
+        hits: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for entry_id in self._postings.get(gram, ()):
+                hits[entry_id] += 1
+
+        allowed = set(levels) if levels is not None else None
+        candidates = []
+        for entry_id, count in hits.items():
+            coverage = count / len(grams)
+            if coverage < min_coverage:
+                continue
+            code, name, level = self._entries[entry_id]
+            if allowed is not None and level not in allowed:
+                continue
+
+            name_text = self._normalized[entry_id]
+            parts = self._parts[entry_id]
+            score = coverage
+            if query_text == name_text or query_text in parts:
+                score += 1.0
+            elif name_text.startswith(query_text) or any(part.startswith(query_text) for part in parts):
+                score += 0.5
+            score -= 0.01 * max(len(name_text) - len(query_text), 0)
+            candidates.append(Candidate(code, name, level, round(score, 4)))
+
+        candidates.sort(key=lambda candidate: (-candidate.score, candidate.code))
+        return candidates[:limit]
+
+
+if __name__ == "__main__":
+    resolver = AreaResolver.load_or_build()
+    for text in sys.argv[1:] or ["すすきの", "札幌駅", "新札幌"]:
+        print(f"🔍 {text}")
+        for candidate in resolver.resolve(text):
+            print(f"   {candidate.code}: {candidate.name} ({candidate.level}, score {candidate.score})")
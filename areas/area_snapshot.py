@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Hot Pepper Area Hierarchy Snapshot
+
+This module exports the whole area hierarchy into one compact, versioned binary
+file and reads it back through mmap, resolving codes without materializing every
+node. All integers are little-endian.
+
+Layout:
+    header        HEADER (magic "HPAS", version, counts and section offsets)
+    string table  (string_count + 1) x u32 offsets, then the UTF-8 string data
+    nodes         node_count x NODE records in breadth-first order, so the
+                  children of every node are stored contiguously
+    code index    node_count x u32 node ids sorted by code, for binary search
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from area_index import AreaIndex, AreaNode, LEVELS
+
+
+MAGIC = b"HPAS"
+VERSION = 1
+
+# magic, version, reserved, node_count, string_count,
+# string_offsets_offset, string_data_offset, nodes_offset, code_index_offset
+HEADER = struct.Struct('<4sHHIIIIII')
+
+# code string id, name string id, level, parent node id (-1 for roots),
+# first child node id, child count
+NODE = struct.Struct('<IIB3xiII')
+
+NO_PARENT = -1
+UNKNOWN_LEVEL = 255
+
+DEFAULT_SNAPSHOT_FILENAME = "hotpepper_areas.snapshot"
+
+
+class SnapshotNode(NamedTuple):
+    """A node decoded from a snapshot."""
+    id: int
+    code: str
+    name: str
+    level: str
+    parent: int
+    first_child: int
+    child_count: int
+
+
+def _breadth_first(index: AreaIndex) -> List[AreaNode]:
+    """Order nodes so that the children of every node are contiguous."""
+    roots = [node for node in index if node.parent is None]
+    ordered = list(roots)
+    position = 0
+    while position < len(ordered):
+        ordered.extend(ordered[position].children)
+        position += 1
+    return ordered
+
+
+def encode_snapshot(index: AreaIndex) -> bytes:
+    """
+    Encode an AreaIndex into the snapshot format.
+
+    Args:
+        index (AreaIndex): Loaded area hierarchy
+
+    Returns:
+        bytes: Snapshot content
+    """
+    nodes = _breadth_first(index)
+    node_ids = {node.code: node_id for node_id, node in enumerate(nodes)}
+
+    # String table, deduplicated (many names repeat across levels)
+    strings: Dict[str, int] = {}
+    string_data = bytearray()
+    string_offsets = [0]
+
+    def string_id(text: str) -> int:
+        if text not in strings:
+            strings[text] = len(strings)
+            string_data.extend(text.encode('utf-8'))
+            string_offsets.append(len(string_data))
+        return strings[text]
+
+    # Breadth-first order places every child range after the roots, in node order
+    records = bytearray()
+    first_child = sum(1 for node in nodes if node.parent is None)
+    for node in nodes:
+        child_start = first_child if node.children else 0
+        first_child += len(node.children)
+        level = LEVELS.index(node.level) if node.level in LEVELS else UNKNOWN_LEVEL
+        parent = node_ids[node.parent.code] if node.parent is not None else NO_PARENT
+        records.extend(NODE.pack(
+            string_id(node.code), string_id(node.name), level, parent, child_start, len(node.children)
+        ))
+
+    code_index = sorted(range(len(nodes)), key=lambda node_id: nodes[node_id].code.encode('utf-8'))
+
+    string_offsets_offset = HEADER.size
+    string_data_offset = string_offsets_offset + 4 * len(string_offsets)
+    nodes_offset = string_data_offset + len(string_data)
+    nodes_offset += -nodes_offset % 4  # keep records 4-byte aligned
+    code_index_offset = nodes_offset + len(records)
+
+    output = bytearray(HEADER.pack(
+        MAGIC, VERSION, 0, len(nodes), len(strings),
+        string_offsets_offset, string_data_offset, nodes_offset, code_index_offset,
+    ))
+    output.extend(struct.pack(f'<{len(string_offsets)}I', *string_offsets))
+    output.extend(string_data)
+    output.extend(b'\0' * (nodes_offset - len(output)))
+    output.extend(records)
+    output.extend(struct.pack(f'<{len(code_index)}I', *code_index))
+    return bytes(output)
+
+
+def write_snapshot(index: AreaIndex, snapshot_path: str) -> str:
+    """
+    Write an AreaIndex to a snapshot file, replacing it atomically.
+
+    Args:
+        index (AreaIndex): Loaded area hierarchy
+        snapshot_path (str): Destination path
+
+    Returns:
+        str: Path to the written snapshot
+    """
+    data = encode_snapshot(index)
+    directory = os.path.dirname(os.path.abspath(snapshot_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.snapshot', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, snapshot_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return snapshot_path
+
+
+class AreaSnapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    Only the header is decoded on open; nodes and strings are decoded on access.
+
+    Example:
+        >>> with AreaSnapshot("areas/hotpepper_areas.snapshot") as snapshot:
+        ...     [node.code for node in snapshot.ancestors("Y500")]
+        ['SA41', 'SS01']
+    """
+
+    def __init__(self, snapshot_path: str):
+        self.path = snapshot_path
+        with open(snapshot_path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _reserved, self._node_count, self._string_count,
+         self._string_offsets_offset, self._string_data_offset,
+         self._nodes_offset, self._code_index_offset) = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not an area snapshot: {snapshot_path}")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}: {snapshot_path}")
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._buffer.close()
+
+    def __enter__(self) -> "AreaSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._node_count
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        start, end = struct.unpack_from('<II', self._buffer, self._string_offsets_offset + 4 * string_id)
+        return self._buffer[self._string_data_offset + start:self._string_data_offset + end]
+
+    def _string(self, string_id: int) -> str:
+        return self._string_bytes(string_id).decode('utf-8')
+
+    def _code_bytes(self, node_id: int) -> bytes:
+        code_id = struct.unpack_from('<I', self._buffer, self._nodes_offset + NODE.size * node_id)[0]
+        return self._string_bytes(code_id)
+
+    def node(self, node_id: int) -> SnapshotNode:
+        """Decode a node by id."""
+        if not 0 <= node_id < self._node_count:
+            raise IndexError(node_id)
+        code_id, name_id, level, parent, first_child, child_count = NODE.unpack_from(
+            self._buffer, self._nodes_offset + NODE.size * node_id
+        )
+        return SnapshotNode(
+            node_id,
+            self._string(code_id),
+            self._string(name_id),
+            LEVELS[level] if level < len(LEVELS) else "",
+            parent,
+            first_child,
+            child_count,
+        )
+
+    def find(self, code: str) -> Optional[int]:
+        """
+        Binary search the code index.
+
+        Args:
+            code (str): Area code (e.g., "Y500")
+
+        Returns:
+            Optional[int]: Node id, or None when the code is unknown
+        """
+        target = code.encode('utf-8')
+        low, high = 0, self._node_count
+        while low < high:
+            middle = (low + high) // 2
+            node_id = struct.unpack_from('<I', self._buffer, self._code_index_offset + 4 * middle)[0]
+            if self._code_bytes(node_id) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._node_count:
+            node_id = struct.unpack_from('<I', self._buffer, self._code_index_offset + 4 * low)[0]
+            if self._code_bytes(node_id) == target:
+                return node_id
+        return None
+
+    def get(self, code: str) -> Optional[SnapshotNode]:
+        """Return the node of a code, or None when it is unknown."""
+        node_id = self.find(code)
+        return self.node(node_id) if node_id is not None else None
+
+    def __contains__(self, code: object) -> bool:
+        return isinstance(code, str) and self.find(code) is not None
+
+    def children(self, code: str) -> List[SnapshotNode]:
+        """Return the direct children of a code (empty for leaves and unknown codes)."""
+        node = self.get(code)
+        if node is None:
+            return []
+        return [self.node(node_id) for node_id in range(node.first_child, node.first_child + node.child_count)]
+
+    def ancestors(self, code: str) -> List[SnapshotNode]:
+        """Return the parent chain of a code, nearest parent first."""
+        chain = []
+        node = self.get(code)
+        while node is not None and node.parent != NO_PARENT:
+            node = self.node(node.parent)
+            chain.append(node)
+        return chain
+
+    def __iter__(self) -> Iterator[SnapshotNode]:
+        for node_id in range(self._node_count):
+            yield self.node(node_id)
+
+    def to_index(self) -> AreaIndex:
+        """Materialize the whole snapshot as an AreaIndex."""
+        nodes = list(self)
+        return AreaIndex.from_records(
+            {
+                "code": node.code,
+                "name": node.name,
+                "level": node.level,
+                "parent": nodes[node.parent].code if node.parent != NO_PARENT else None,
+            }
+            for node in nodes
+        )
+
+
+def main():
+    """Command line entry point to export or inspect a snapshot."""
+    parser = argparse.ArgumentParser(description="Export or inspect the area hierarchy snapshot.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Write a snapshot from extracted area files")
+    export_parser.add_argument('directories', nargs='*', help="Directories containing area JSON files")
+    export_parser.add_argument('-o', '--output', help="Snapshot path (default: hotpepper_areas.snapshot)")
+
+    info_parser = subparsers.add_parser('info', help="Show snapshot statistics or look up codes")
+    info_parser.add_argument('snapshot', help="Snapshot path")
+    info_parser.add_argument('codes', nargs='*', help="Codes to look up")
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        directories = args.directories or [os.path.dirname(os.path.abspath(__file__))]
+        output = args.output or os.path.join(directories[0], DEFAULT_SNAPSHOT_FILENAME)
+        index = AreaIndex.load(*directories)
+        write_snapshot(index, output)
+        print(f"✅ Wrote {len(index)} areas to {output} ({os.path.getsize(output)} bytes)")
+        return
+
+    with AreaSnapshot(args.snapshot) as snapshot:
+        print(f"📊 {args.snapshot}: {len(snapshot)} areas")
+        for code in args.codes:
+            node = snapshot.get(code)
+            if node is None:
+                print(f"   {code}: not found")
+                continue
+            chain = ' → '.join(ancestor.code for ancestor in reversed(snapshot.ancestors(code)))
+            print(f"   {node.code}: {node.name} ({node.level}) under {chain or '-'}, {node.child_count} children")
+
+
+if __name__ == "__main__":
+    main()
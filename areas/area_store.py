@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Hot Pepper Area Store
+
+This module bulk-loads extractor output (hotpepper_areas.json, per-prefecture
+files, NDJSON record streams) into a single SQLite database. Codes, parent codes
+and names are indexed, and parent chains and subtrees are answered with
+recursive CTEs, so lookups need neither the JSON files nor a full in-memory load.
+"""
+
+import argparse
+import itertools
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from area_index import area_files, iter_records_from_file, level_of
+
+
+DEFAULT_DATABASE_FILENAME = "hotpepper_areas.sqlite"
+
+# Guard against parent cycles in malformed data
+MAX_DEPTH = 32
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS areas (
+    code   TEXT PRIMARY KEY,
+    name   TEXT NOT NULL,
+    level  TEXT NOT NULL,
+    parent TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS areas_parent ON areas (parent);
+CREATE INDEX IF NOT EXISTS areas_name ON areas (name);
+"""
+
+# Same merge rule as AreaIndex._add: the first record decides the level, later
+# records only replace the name or parent when they carry one
+UPSERT = """
+INSERT INTO areas (code, name, level, parent) VALUES (?, ?, ?, ?)
+ON CONFLICT (code) DO UPDATE SET
+    name = CASE WHEN excluded.name != '' THEN excluded.name ELSE areas.name END,
+    parent = COALESCE(excluded.parent, areas.parent)
+"""
+
+
+class AreaRow(NamedTuple):
+    """One area of the store."""
+
+    code: str
+    name: str
+    level: str
+    parent: Optional[str]
+
+
+class AreaStore:
+    """
+    SQLite-backed area hierarchy with indexed lookups and hierarchy queries.
+
+    Example:
+        >>> with AreaStore("hotpepper_areas.sqlite") as store:
+        ...     store.load("areas", "hokkaido_areas")
+        ...     [row.code for row in store.descendants("SA41", "small_area")]
+        ['X100', 'X101']
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "AreaStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def upsert(self, records: Iterable[Dict[str, Any]], batch_size: int = 1000,
+               replace: bool = False) -> int:
+        """
+        Insert or update flat area records inside a single transaction.
+
+        Later records for the same code update the name and parent of earlier
+        ones, so the order of the inputs decides which source wins.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Records with code, name, level and parent keys
+            batch_size (int): Number of rows sent to executemany at a time
+            replace (bool): Delete every stored area first, in the same
+                transaction, so readers see either the old or the new areas
+
+        Returns:
+            int: Number of records processed
+        """
+        rows = (
+            (
+                record["code"],
+                record.get("name") or "",
+                record.get("level") or level_of(record["code"]) or "",
+                record.get("parent") or None,
+            )
+            for record in records
+        )
+        count = 0
+        with self._connection:
+            if replace:
+                self._connection.execute("DELETE FROM areas")
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                self._connection.executemany(UPSERT, batch)
+                count += len(batch)
+        return count
+
+    def load_files(self, file_paths: Iterable[str], replace: bool = False) -> int:
+        """
+        Upsert every record of extracted area files (JSON or NDJSON).
+
+        Args:
+            file_paths (Iterable[str]): Paths in load order
+            replace (bool): Replace the stored areas instead of merging into them
+
+        Returns:
+            int: Number of records processed
+        """
+        return self.upsert(
+            (record for file_path in file_paths for record in iter_records_from_file(file_path)),
+            replace=replace,
+        )
+
+    def load(self, *directories: str, replace: bool = False) -> int:
+        """
+        Upsert every area JSON file of the given directories.
+
+        Args:
+            *directories (str): Directories containing extracted area files
+                (default: the directory of this module)
+            replace (bool): Replace the stored areas instead of merging into them
+
+        Returns:
+            int: Number of records processed
+        """
+        if not directories:
+            directories = (os.path.dirname(os.path.abspath(__file__)),)
+        return self.load_files(area_files(*directories), replace=replace)
+
+    def _rows(self, sql: str, parameters: tuple = ()) -> List[AreaRow]:
+        return [AreaRow(*row) for row in self._connection.execute(sql, parameters)]
+
+    def get(self, code: str) -> Optional[AreaRow]:
+        """Return the area of a code, or None when it is unknown."""
+        row = self._connection.execute(
+            "SELECT code, name, level, parent FROM areas WHERE code = ?", (code,)
+        ).fetchone()
+        return AreaRow(*row) if row else None
+
+    def __contains__(self, code: object) -> bool:
+        return self._connection.execute("SELECT 1 FROM areas WHERE code = ?", (code,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM areas").fetchone()[0]
+
+    def __iter__(self) -> Iterator[AreaRow]:
+        for row in self._connection.execute("SELECT code, name, level, parent FROM areas ORDER BY code"):
+            yield AreaRow(*row)
+
+    def parent(self, code: str) -> Optional[AreaRow]:
+        """Return the direct parent of a code, or None for roots and unknown codes."""
+        row = self._connection.execute(
+            "SELECT p.code, p.name, p.level, p.parent FROM areas c JOIN areas p ON p.code = c.parent WHERE c.code = ?",
+            (code,),
+        ).fetchone()
+        return AreaRow(*row) if row else None
+
+    def children(self, code: str) -> List[AreaRow]:
+        """Return the direct children of a code (empty for leaves and unknown codes)."""
+        return self._rows("SELECT code, name, level, parent FROM areas WHERE parent = ? ORDER BY code", (code,))
+
+    def ancestors(self, code: str) -> List[AreaRow]:
+        """
+        Return the parent chain of a code, nearest parent first.
+
+        Args:
+            code (str): Area code (e.g., "X100")
+
+        Returns:
+            List[AreaRow]: Ancestors up to the root (empty for unknown codes)
+        """
+        return self._rows(
+            """
+            WITH RECURSIVE chain (code, name, level, parent, depth) AS (
+                SELECT p.code, p.name, p.level, p.parent, 1
+                FROM areas c JOIN areas p ON p.code = c.parent
+                WHERE c.code = ?
+                UNION ALL
+                SELECT p.code, p.name, p.level, p.parent, chain.depth + 1
+                FROM chain JOIN areas p ON p.code = chain.parent
+                WHERE chain.depth < ?
+            )
+            SELECT code, name, level, parent FROM chain ORDER BY depth
+            """,
+            (code, MAX_DEPTH),
+        )
+
+    def descendants(self, code: str, level: Optional[str] = None) -> List[AreaRow]:
+        """
+        Return every area below a code.
+
+        Args:
+            code (str): Area code (e.g., "SA41")
+            level (Optional[str]): Only return areas of this level (e.g., "small_area")
+
+        Returns:
+            List[AreaRow]: Descendants ordered by code
+        """
+        return self._rows(
+            """
+            WITH RECURSIVE subtree (code, depth) AS (
+                SELECT code, 1 FROM areas WHERE parent = ?
+                UNION
+                SELECT a.code, subtree.depth + 1
+                FROM subtree JOIN areas a ON a.parent = subtree.code
+                WHERE subtree.depth < ?
+            )
+            SELECT DISTINCT a.code, a.name, a.level, a.parent
+            FROM subtree JOIN areas a ON a.code = subtree.code
+            WHERE ? IS NULL OR a.level = ?
+            ORDER BY a.code
+            """,
+            (code, MAX_DEPTH, level, level),
+        )
+
+    def by_level(self, level: str) -> List[AreaRow]:
+        """Return every area of a level (e.g., "service_area")."""
+        return self._rows("SELECT code, name, level, parent FROM areas WHERE level = ? ORDER BY code", (level,))
+
+    def by_name(self, name: str) -> List[AreaRow]:
+        """Return the areas whose name is exactly name."""
+        return self._rows("SELECT code, name, level, parent FROM areas WHERE name = ? ORDER BY code", (name,))
+
+
+def main():
+    """Command line entry point to build or query an area store."""
+    parser = argparse.ArgumentParser(description="Build or query the SQLite area store.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Load extracted area files into a database")
+    build_parser.add_argument('directories', nargs='*', help="Directories containing area JSON files")
+    build_parser.add_argument('-o', '--output', help="Database path (default: hotpepper_areas.sqlite)")
+
+    query_parser = subparsers.add_parser('query', help="Look up codes in a database")
+    query_parser.add_argument('database', help="Database path")
+    query_parser.add_argument('codes', nargs='*', help="Codes to look up")
+    query_parser.add_argument('--level', help="List the descendants of this level (e.g., small_area)")
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        directories = args.directories or [os.path.dirname(os.path.abspath(__file__))]
+        output = args.output or os.path.join(directories[0], DEFAULT_DATABASE_FILENAME)
+        with AreaStore(output) as store:
+            # Rebuild from scratch: areas dropped from the files must not survive
+            count = store.load(*directories, replace=True)
+            print(f"✅ Loaded {count} records into {output} ({len(store)} areas)")
+        return
+
+    with AreaStore(args.database) as store:
+        print(f"📊 {args.database}: {len(store)} areas")
+        for code in args.codes:
+            row = store.get(code)
+            if row is None:
+                print(f"   {code}: not found")
+                continue
+            chain = ' → '.join(ancestor.code for ancestor in reversed(store.ancestors(code)))
+            print(f"   {row.code}: {row.name} ({row.level}) under {chain or '-'}, {len(store.children(code))} children")
+            if args.level:
+                descendants = store.descendants(code, args.level)
+                print(f"      {len(descendants)} {args.level}: {', '.join(area.code for area in descendants)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Streaming Area Master Response Parser
+
+Turns area master API responses (XML, or JSON when ijson is installed) into
+area records while the bytes arrive, instead of loading the whole document and
+converting it afterwards. Each record is released from the parse tree as soon
+as it is complete, so memory stays flat however large the response is.
+
+Records have the shape of the API's JSON records (parent levels as
+{"code": ..., "name": ...} objects), so they feed area_crawler.build_hierarchy
+and write_outputs unchanged.
+
+Usage:
+    python area_stream.py recordings/*.xml --output-dir areas
+"""
+
+import argparse
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+sys.path.append(os.path.dirname(__file__))
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+LEVELS = ("large_service_area", "service_area", "large_area", "middle_area", "small_area")
+
+
+class ApiResponseError(Exception):
+    """Raised when a response carries an API error instead of records."""
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace ("{http://...}code" -> "code")."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _json_error(error: Any) -> ApiResponseError:
+    """Build the exception for an item of a JSON response's "error" list."""
+    if isinstance(error, dict):
+        message = ' '.join(str(value).strip() for value in error.values() if value not in (None, ''))
+    else:
+        message = str(error).strip()
+    return ApiResponseError(message or "API returned an error")
+
+
+def _element_record(element: ET.Element) -> Dict[str, Any]:
+    """Convert one record element into an API-style record."""
+    record: Dict[str, Any] = {}
+    for child in element:
+        name = _local_name(child.tag)
+        if len(child):
+            record[name] = {_local_name(field.tag): (field.text or '').strip() for field in child}
+        else:
+            record[name] = (child.text or '').strip()
+    return record
+
+
+class XmlRecordStream:
+    """
+    Incremental parser for XML area master responses.
+
+    Example:
+        >>> stream = XmlRecordStream("middle_area")
+        >>> for chunk in chunks:
+        ...     records.extend(stream.feed(chunk))
+        >>> records.extend(stream.close())
+    """
+
+    def __init__(self, level: str):
+        self.level = level
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._root: Optional[ET.Element] = None
+        self._depth = 0
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        records = []
+        for event, element in self._parser.read_events():
+            if event == 'start':
+                self._depth += 1
+                if self._root is None:
+                    self._root = element
+                continue
+            self._depth -= 1
+            # Only direct children of <results> are records or errors
+            if self._depth != 1:
+                continue
+            name = _local_name(element.tag)
+            if name == self.level:
+                records.append(_element_record(element))
+            elif name == 'error':
+                message = ' '.join((text or '').strip() for text in element.itertext()).strip()
+                raise ApiResponseError(message or "API returned an error")
+            # Drop finished top-level elements so the tree never grows
+            self._root.clear()
+        return records
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Parse a chunk and return the records it completed."""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the document and return any remaining records."""
+        self._parser.close()
+        return self._drain()
+
+
+class JsonRecordStream:
+    """
+    Incremental parser for JSON area master responses.
+
+    Uses ijson's push interface when it is installed, with a second coroutine
+    watching "results.error" so an error response raises ApiResponseError as
+    soon as its first error item is complete. Without ijson the body is
+    buffered and parsed on close(), which gives the same records at the cost of
+    holding the response once.
+    """
+
+    def __init__(self, level: str):
+        self.level = level
+        self._buffer: Optional[List[bytes]] = None
+        if ijson is not None:
+            self._events = ijson.sendable_list()
+            self._coroutine = ijson.items_coro(self._events, f"results.{level}.item")
+            self._errors = ijson.sendable_list()
+            self._error_coroutine = ijson.items_coro(self._errors, "results.error.item")
+        else:
+            self._buffer = []
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        if self._errors:
+            raise _json_error(self._errors[0])
+        records = list(self._events)
+        del self._events[:]
+        return records
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Parse a chunk and return the records it completed."""
+        if self._buffer is not None:
+            self._buffer.append(data)
+            return []
+        self._coroutine.send(data)
+        self._error_coroutine.send(data)
+        return self._drain()
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the document and return any remaining records."""
+        if self._buffer is not None:
+            results = json.loads(b''.join(self._buffer)).get("results", {})
+            self._buffer = None
+            errors = results.get("error")
+            if errors:
+                raise _json_error(errors[0] if isinstance(errors, list) else errors)
+            return results.get(self.level, [])
+        self._coroutine.close()
+        self._error_coroutine.close()
+        return self._drain()
+
+
+def record_stream(level: str, response_format: str = "xml"):
+    """
+    Create the incremental parser for a response format.
+
+    Args:
+        level (str): Area level whose records are wanted (e.g., "small_area")
+        response_format (str): "xml" or "json"
+
+    Returns:
+        XmlRecordStream | JsonRecordStream: Parser with feed() and close()
+    """
+    if response_format == "xml":
+        return XmlRecordStream(level)
+    if response_format == "json":
+        return JsonRecordStream(level)
+    raise ValueError(f"Unsupported response format: {response_format}")
+
+
+def iter_records(stream: BinaryIO, level: str, response_format: str = "xml",
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records of a response read from a binary stream.
+
+    Args:
+        stream (BinaryIO): Response body (file or socket-like object)
+        level (str): Area level whose records are wanted
+        response_format (str): "xml" or "json"
+        chunk_size (int): Number of bytes read at a time
+
+    Yields:
+        Dict[str, Any]: API-style records in document order
+    """
+    parser = record_stream(level, response_format)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def level_of_file(file_path: str) -> Optional[str]:
+    """Infer the level of a recorded response from its name ("middle_area__...xml")."""
+    stem = os.path.basename(file_path).split('__', 1)[0].split('.', 1)[0]
+    return stem if stem in LEVELS else None
+
+
+def records_from_files(file_paths: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Stream recorded responses into records keyed by level.
+
+    Args:
+        file_paths (List[str]): Recorded .xml/.json responses named by level
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Records of every level (empty lists for
+            levels without files), ready for build_hierarchy
+    """
+    records: Dict[str, List[Dict[str, Any]]] = {level: [] for level in LEVELS}
+    for file_path in file_paths:
+        level = level_of_file(file_path)
+        if level is None:
+            print(f"⚠️  Skipping {file_path}: level not recognized from the file name")
+            continue
+        response_format = "json" if file_path.endswith('.json') else "xml"
+        with open(file_path, 'rb') as f:
+            records[level].extend(iter_records(f, level, response_format))
+    return records
+
+
+def main():
+    """Command line entry point: convert recorded responses into area JSON files."""
+    from area_crawler import build_hierarchy, write_outputs
+
+    parser = argparse.ArgumentParser(description="Convert recorded area master responses into area JSON files.")
+    parser.add_argument('files', nargs='+', help="Recorded responses (e.g., recordings/middle_area__*.xml)")
+    parser.add_argument('--output-dir', default="areas", help="Directory to save the JSON files")
+    args = parser.parse_args()
+
+    try:
+        records = records_from_files(args.files)
+    except (ApiResponseError, ET.ParseError, ValueError) as e:
+        print(f"❌ Error reading responses: {e}")
+        return 1
+
+    files = write_outputs(build_hierarchy(records), args.output_dir)
+    print(f"✅ Wrote {len(files)} files to {args.output_dir}")
+    for level, level_records in records.items():
+        print(f"   - {level}: {len(level_records)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
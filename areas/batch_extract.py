@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Batch extraction of every prefecture area file from a directory of saved pages.
+
+Expected input layout (one page per service area code from hotpepper_areas.json):
+
+    pages/
+      SA41.html          <- page containing the middle area (Y) select
+      SA41/
+        Y500.html        <- optional page containing the small area (X) select
+        Y505.html
+
+Each service area is processed by a separate worker process, so every prefecture
+file is written by exactly one process. With --incremental, a manifest of content
+hashes in the output directory limits a re-run to the service areas whose pages
+changed, and within them to the changed pages (the areas of unchanged pages are
+copied from the previous output); --watch keeps polling the input directory and
+re-runs on changes.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional
+
+sys.path.append(os.path.dirname(__file__))
+from area_extractor import parse_middle_areas, area_json_path, locked_file, merge_small_areas, write_json_if_changed
+from extract_manifest import ExtractManifest, input_key
+from page_slicer import read_area_selects
+
+
+def load_service_area_codes(areas_json_path: str) -> List[str]:
+    """
+    Read the list of service area codes (SA##) from hotpepper_areas.json.
+
+    Args:
+        areas_json_path (str): Path to the consolidated hotpepper_areas.json file
+
+    Returns:
+        List[str]: Service area codes in file order
+    """
+    with open(areas_json_path, 'r', encoding='utf-8') as f:
+        areas = json.load(f)
+    return [area['code'] for area in areas.get('service_area', [])]
+
+
+def find_jobs(input_dir: str, service_area_codes: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build one extraction job per service area whose page exists in input_dir.
+
+    Args:
+        input_dir (str): Directory containing <SA code>.html pages
+        service_area_codes (List[str]): Service area codes to look for
+
+    Returns:
+        List[Dict[str, Any]]: Jobs with service_area_code, page and small_pages keys
+    """
+    jobs = []
+    for sa_code in service_area_codes:
+        page = os.path.join(input_dir, f"{sa_code}.html")
+        if not os.path.isfile(page):
+            continue
+
+        # Optional small area pages live in a sub-directory named after the SA code
+        small_pages = {}
+        small_dir = os.path.join(input_dir, sa_code)
+        if os.path.isdir(small_dir):
+            for filename in sorted(os.listdir(small_dir)):
+                code, ext = os.path.splitext(filename)
+                if ext == '.html' and code.startswith('Y'):
+                    small_pages[code] = os.path.join(small_dir, filename)
+
+        jobs.append({
+            "service_area_code": sa_code,
+            "page": page,
+            "small_pages": small_pages,
+        })
+    return jobs
+
+
+def load_previous_output(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Read the previous prefecture file of an incremental job, or None when there is none."""
+    previous_output = job.get('previous_output')
+    if not previous_output:
+        return None
+    try:
+        with open(previous_output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def extract_prefecture(job: Dict[str, Any], output_dir: str, fast: bool = False) -> Dict[str, Any]:
+    """
+    Extract one prefecture file (middle areas plus any small areas).
+
+    Runs inside a worker process, so it only takes and returns picklable data.
+    Pages listed in the job's unchanged_pages are not parsed: their areas are
+    copied from previous_output (both set by run_batch in incremental mode).
+
+    Args:
+        job (Dict[str, Any]): Job as returned by find_jobs
+        output_dir (str): Directory to save the prefecture JSON file
+        fast (bool): Read options without building a BeautifulSoup tree
+
+    Returns:
+        Dict[str, Any]: Per-prefecture statistics (file, written, pages, reused, options)
+    """
+    previous = load_previous_output(job)
+    unchanged = set(job.get('unchanged_pages', ())) if previous is not None else set()
+    previous_small_areas = {
+        middle_area['code']: middle_area['small_area'] for middle_area in previous['middle_area']
+    } if previous is not None else {}
+    pages = 0
+
+    if job['page'] in unchanged:
+        area_data = previous
+        # Small areas are filled again below, so pages removed since then leave none
+        for middle_area in area_data['middle_area']:
+            middle_area['small_area'] = []
+    else:
+        # Saved pages can be large: only their area selects are read into memory
+        select_html = read_area_selects(job['page'])
+        area_data = parse_middle_areas(select_html, job['service_area_code'], fast)
+        pages += 1
+
+    # Merge every small area page in memory so the prefecture file is written once
+    small_areas_by_code = {}
+    for middle_area_code, small_page in job['small_pages'].items():
+        if small_page in unchanged and middle_area_code in previous_small_areas:
+            small_areas_by_code[middle_area_code] = previous_small_areas[middle_area_code]
+        else:
+            small_areas_by_code[middle_area_code] = read_area_selects(small_page)
+            pages += 1
+    merge_small_areas(area_data, small_areas_by_code, fast)
+
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = area_json_path(area_data, output_dir)
+    with locked_file(filepath):
+        written = write_json_if_changed(filepath, area_data)
+    options = len(area_data['middle_area'])
+    options += sum(len(area['small_area']) for area in area_data['middle_area'])
+
+    return {
+        "service_area_code": job['service_area_code'],
+        "file": filepath,
+        "written": written,
+        "pages": pages,
+        "reused": 1 + len(job['small_pages']) - pages,
+        "options": options,
+    }
+
+
+def job_inputs(job: Dict[str, Any]) -> List[str]:
+    """Return every input page of a job."""
+    return [job['page'], *job['small_pages'].values()]
+
+
+def run_batch(input_dir: str, output_dir: str, areas_json_path: str, jobs: int = 0,
+              incremental: bool = False, fast: bool = False) -> Dict[str, Any]:
+    """
+    Extract every prefecture found in input_dir using a process pool.
+
+    Args:
+        input_dir (str): Directory of saved pages (see module docstring for layout)
+        output_dir (str): Directory to save the prefecture JSON files
+        areas_json_path (str): Path to hotpepper_areas.json listing the SA codes
+        jobs (int): Number of worker processes (0 = one per CPU core)
+        incremental (bool): Skip service areas whose pages and output file are
+            unchanged since the last run recorded in the manifest
+        fast (bool): Read options without building BeautifulSoup trees
+
+    Returns:
+        Dict[str, Any]: Throughput report with per-prefecture results and totals
+    """
+    service_area_codes = load_service_area_codes(areas_json_path)
+    batch = find_jobs(input_dir, service_area_codes)
+    found = {job['service_area_code'] for job in batch}
+    workers = jobs or os.cpu_count() or 1
+
+    # Hash the inputs up front; unchanged service areas are skipped entirely and
+    # unchanged pages of the others are taken from their previous output
+    manifest = ExtractManifest.load(output_dir) if incremental else None
+    digests = {}
+    skipped = []
+    if incremental:
+        stale = []
+        for job in batch:
+            sa_code = job['service_area_code']
+            digests[sa_code] = manifest.input_digests(input_dir, job_inputs(job))
+            if not manifest.is_stale(sa_code, digests[sa_code], output_dir):
+                skipped.append(sa_code)
+                continue
+            previous_output, unchanged = manifest.unchanged_inputs(sa_code, digests[sa_code], output_dir)
+            if previous_output:
+                job['previous_output'] = previous_output
+                job['unchanged_pages'] = [
+                    path for path in job_inputs(job) if input_key(input_dir, path) in unchanged
+                ]
+            stale.append(job)
+        batch = stale
+
+    results = []
+    errors = []
+    started = time.perf_counter()
+
+    if batch:
+        with ProcessPoolExecutor(max_workers=min(workers, len(batch))) as executor:
+            futures = {executor.submit(extract_prefecture, job, output_dir, fast): job for job in batch}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    result = future.result()
+                except Exception as error:
+                    errors.append({"service_area_code": job['service_area_code'], "error": str(error)})
+                    continue
+                results.append(result)
+                if manifest is not None:
+                    manifest.record(result['service_area_code'], digests[result['service_area_code']], result['file'])
+
+    if manifest is not None and results:
+        manifest.save()
+
+    elapsed = time.perf_counter() - started
+    pages = sum(result['pages'] for result in results)
+    options = sum(result['options'] for result in results)
+
+    return {
+        "jobs": workers,
+        "prefectures": len(results),
+        "written": sum(1 for result in results if result['written']),
+        "skipped": skipped,
+        "missing": [code for code in service_area_codes if code not in found],
+        "errors": errors,
+        "pages": pages,
+        "reused_pages": sum(result['reused'] for result in results),
+        "options": options,
+        "elapsed_seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+        "options_per_second": options / elapsed if elapsed else 0.0,
+        "results": sorted(results, key=lambda result: result['service_area_code']),
+    }
+
+
+def input_state(input_dir: str) -> Dict[str, Any]:
+    """Cheap snapshot (size and mtime of every page) used to detect changes in watch mode."""
+    state = {}
+    for root, _dirs, files in os.walk(input_dir):
+        for filename in files:
+            if filename.endswith('.html'):
+                path = os.path.join(root, filename)
+                stat = os.stat(path)
+                state[path] = (stat.st_size, stat.st_mtime_ns)
+    return state
+
+
+def watch(input_dir: str, output_dir: str, areas_json_path: str, jobs: int = 0, interval: float = 2.0,
+          fast: bool = False) -> None:
+    """
+    Re-run an incremental batch whenever pages are added or modified.
+
+    Args:
+        input_dir (str): Directory of saved pages
+        output_dir (str): Directory to save the prefecture JSON files
+        areas_json_path (str): Path to hotpepper_areas.json listing the SA codes
+        jobs (int): Number of worker processes (0 = one per CPU core)
+        interval (float): Seconds between polls of the input directory
+        fast (bool): Read options without building BeautifulSoup trees
+    """
+    print(f"👀 Watching {input_dir} (Ctrl+C to stop)")
+    state = None
+    try:
+        while True:
+            current = input_state(input_dir)
+            if current != state:
+                state = current
+                report = run_batch(input_dir, output_dir, areas_json_path, jobs, incremental=True, fast=fast)
+                if report['prefectures'] or report['errors']:
+                    print_report(report)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a human readable throughput report."""
+    print(f"\n✅ Extracted {report['prefectures']} prefecture files with {report['jobs']} workers")
+    print(f"📊 Throughput:")
+    print(f"   - Pages: {report['pages']} ({report['pages_per_second']:.1f} pages/s)")
+    print(f"   - Options: {report['options']} ({report['options_per_second']:.1f} options/s)")
+    print(f"   - Elapsed: {report['elapsed_seconds']:.3f}s")
+    print(f"   - Files rewritten: {report['written']}")
+    if report['reused_pages']:
+        print(f"   - Unchanged pages reused: {report['reused_pages']}")
+
+    if report['skipped']:
+        print(f"\n⏭️  Unchanged since last run: {len(report['skipped'])} service areas")
+
+    if report['missing']:
+        print(f"\n⚠️  No page found for {len(report['missing'])} service areas: {', '.join(report['missing'])}")
+    for error in report['errors']:
+        print(f"❌ {error['service_area_code']}: {error['error']}")
+
+
+def main():
+    """Command line entry point for batch extraction."""
+    parser = argparse.ArgumentParser(description="Extract every prefecture area file from saved pages.")
+    parser.add_argument('input_dir', help="Directory containing <SA code>.html pages")
+    parser.add_argument('--output-dir', default="areas", help="Directory to save prefecture JSON files")
+    parser.add_argument('--areas-json', default=os.path.join(os.path.dirname(__file__), "hotpepper_areas.json"),
+                        help="Path to hotpepper_areas.json listing the service area codes")
+    parser.add_argument('--jobs', type=int, default=0, help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--report', help="Optional path to save the throughput report as JSON")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only extract service areas whose pages changed since the last run")
+    parser.add_argument('--watch', action='store_true', help="Keep watching the input directory for changes")
+    parser.add_argument('--interval', type=float, default=2.0, help="Polling interval in seconds for --watch")
+    parser.add_argument('--fast', action='store_true',
+                        help="Read options with the streaming parser instead of BeautifulSoup")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch(args.input_dir, args.output_dir, args.areas_json, args.jobs, args.interval, args.fast)
+        return 0
+
+    report = run_batch(args.input_dir, args.output_dir, args.areas_json, args.jobs, args.incremental, args.fast)
+    print_report(report)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📁 Saved report to: {args.report}")
+
+    return 1 if report['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
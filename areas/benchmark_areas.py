@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the area extraction and merge paths.
+
+Generates synthetic selects, area lists and full saved pages, from one
+prefecture up to thousands of options, and measures every extraction function
+on them: wall time (best and median of several runs) with time.perf_counter,
+then peak and retained memory and the number of memory blocks still allocated
+by the run (tracemalloc snapshot) in a separate run so tracing does not skew
+the timings.
+
+retained_blocks only counts blocks that are still alive after the run:
+tracemalloc forgets a block when it is freed and CPython keeps no count of
+freed allocations, so temporary garbage does not show up there. Its size does
+show up in peak_kib, which is what catches a regression that allocates more
+and frees it again.
+
+Results can be saved as a baseline and compared on later runs; a case slower
+(or using more memory) than the baseline by more than the threshold is
+reported as a regression and the script exits with 1.
+
+Usage:
+    python benchmark_areas.py [--quick] [--save-baseline bench/bench_baseline.json]
+    python benchmark_areas.py --baseline bench/bench_baseline.json [--threshold 1.25]
+
+bench/bench_baseline.json is the committed baseline, kept out of this directory
+because every *.json here is loaded as area data. Refresh it with
+--save-baseline when a change is meant to move the numbers.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(__file__))
+from area_extractor import (
+    add_small_areas_to_json, extract_middle_areas_from_select, extract_small_areas_from_select
+)
+from extract_areas import extract_areas_from_html
+from unified_extractor import extract_all_areas
+
+
+NAME_CHARS = "すきのさっぽろ札幌駅大通新南郷白石厚別清田旭川函館小樽千歳"
+
+# (label, options per select, regions in the area list, kilobytes of page filler)
+SIZES = [
+    ("prefecture", 12, 2, 0),
+    ("medium", 500, 11, 0),
+    ("large", 5000, 11, 0),
+    ("saved_page", 5000, 11, 2048),
+]
+QUICK_SIZES = SIZES[:2]
+
+
+def synthetic_name(rng: random.Random) -> str:
+    return ''.join(rng.choice(NAME_CHARS) for _ in range(rng.randint(2, 10)))
+
+
+def synthetic_select(rng: random.Random, options: int, prefix: str, name: str = "テスト") -> str:
+    """Build a select.selectArea with an "all areas" option followed by coded options."""
+    lines = [f'<select name="MA" class="selectArea">', f'    <option value="">{name}のエリアすべて</option>']
+    for index in range(options):
+        lines.append(f'    <option value="{prefix}{index:03d}">{synthetic_name(rng)}</option>')
+    lines.append('</select>')
+    return '\n'.join(lines)
+
+
+def synthetic_area_list(rng: random.Random, regions: int, prefectures: int = 5) -> str:
+    """Build a ul.areaSelectList with regions of prefecture links."""
+    items = []
+    for region in range(regions):
+        links = ''.join(
+            f'<li><a href="/SA{region * 10 + index + 10}/">{synthetic_name(rng)}</a></li>'
+            for index in range(prefectures)
+        )
+        items.append(
+            f'<li><dl class="globalAreaList"><dt><a href="javascript:void(0);" data-ga="{synthetic_name(rng)}">'
+            f'x</a></dt><dd><ul class="saList">{links}</ul></dd></dl></li>'
+        )
+    return f'<ul class="areaSelectList">{"".join(items)}</ul>'
+
+
+def synthetic_page(rng: random.Random, options: int, regions: int, filler_kb: int) -> str:
+    """Build a saved page: filler markup and scripts around the area list and selects."""
+    filler_block = (
+        '<div class="shopCassette"><h3><a href="/strJ000000000/">' + synthetic_name(rng) +
+        '</a></h3><p class="text">' + synthetic_name(rng) * 8 + '</p><ul class="tags"><li>個室</li>'
+        '<li>禁煙</li></ul></div>\n<script>var data = {"id": 1, "name": "x"};</script>\n'
+    )
+    filler = filler_block * max(0, filler_kb * 1024 // len(filler_block.encode('utf-8')))
+    return (
+        '<!DOCTYPE html><html><head><title>ホットペッパー</title></head><body>'
+        + filler[:len(filler) // 2]
+        + synthetic_area_list(rng, regions)
+        + synthetic_select(rng, options, 'Y')
+        + synthetic_select(rng, options, 'X', "すすきの")
+        + filler[len(filler) // 2:]
+        + '</body></html>'
+    )
+
+
+def build_cases(sizes: List[Tuple[str, int, int, int]], work_dir: str,
+                seed: int = 0) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Create the benchmark cases: one callable per (function, input size).
+
+    Args:
+        sizes (List[Tuple[str, int, int, int]]): Entries of SIZES
+        work_dir (str): Scratch directory for the functions that write files
+        seed (int): Random seed so every run measures the same inputs
+
+    Returns:
+        List[Tuple[str, Callable[[], Any]]]: (case name, callable) pairs
+    """
+    rng = random.Random(seed)
+    cases = []
+    for label, options, regions, filler_kb in sizes:
+        if filler_kb:
+            middle_html = small_html = area_html = synthetic_page(rng, options, regions, filler_kb)
+        else:
+            middle_html = synthetic_select(rng, options, 'Y')
+            small_html = synthetic_select(rng, options, 'X', "すすきの")
+            area_html = synthetic_area_list(rng, regions)
+
+        output_dir = os.path.join(work_dir, label)
+        # add_small_areas_to_json needs an existing prefecture file
+        json_path = extract_middle_areas_from_select(middle_html, "SA41", output_dir)
+
+        cases += [
+            (f"extract_middle_areas_from_select[{label}]",
+             lambda html=middle_html, out=output_dir: extract_middle_areas_from_select(html, "SA41", out)),
+            (f"extract_middle_areas_from_select[{label},fast]",
+             lambda html=middle_html, out=output_dir: extract_middle_areas_from_select(html, "SA41", out, fast=True)),
+            (f"extract_small_areas_from_select[{label}]",
+             lambda html=small_html: extract_small_areas_from_select(html, "Y000")),
+            (f"extract_small_areas_from_select[{label},fast]",
+             lambda html=small_html: extract_small_areas_from_select(html, "Y000", fast=True)),
+            (f"extract_areas_from_html[{label}]",
+             lambda html=area_html: extract_areas_from_html(html)),
+            (f"add_small_areas_to_json[{label}]",
+             lambda path=json_path, html=small_html: add_small_areas_to_json(path, "Y000", html)),
+            (f"add_small_areas_to_json[{label},fast]",
+             lambda path=json_path, html=small_html: add_small_areas_to_json(path, "Y000", html, fast=True)),
+        ]
+        if filler_kb:
+            cases.append((f"extract_all_areas[{label}]",
+                          lambda html=middle_html: extract_all_areas(html, "SA41", "Y000")))
+    return cases
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Time a callable, then trace its memory in one extra run.
+
+    Args:
+        function (Callable[[], Any]): Benchmark body
+        repeat (int): Number of timed runs
+
+    Returns:
+        Dict[str, float]: best_ms, median_ms, peak_kib, retained_kib and
+            retained_blocks (allocations of the run still alive afterwards,
+            including its result; blocks freed during the run are not counted)
+    """
+    function()  # warm up imports and caches
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = function()
+        after, peak = tracemalloc.get_traced_memory()
+        # Only allocations made since start() are traced
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        "best_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "peak_kib": (peak - before) / 1024,
+        "retained_kib": (after - before) / 1024,
+        "retained_blocks": blocks,
+    }
+
+
+def run_benchmarks(sizes: List[Tuple[str, int, int, int]], repeat: int = 5,
+                   name_filter: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run every benchmark case.
+
+    Args:
+        sizes (List[Tuple[str, int, int, int]]): Entries of SIZES to generate
+        repeat (int): Timed runs per case
+        name_filter (Optional[str]): Only run cases whose name contains this text
+
+    Returns:
+        Dict[str, Any]: Environment description and per-case measurements
+    """
+    work_dir = tempfile.mkdtemp(prefix="area_bench_")
+    try:
+        results = {}
+        for name, function in build_cases(sizes, work_dir):
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(function, repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "cases": results,
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float) -> List[str]:
+    """
+    List the cases that regressed against a baseline.
+
+    Time is compared on best_ms (least sensitive to noise), memory on peak_kib
+    (which includes temporary allocations) and leftover allocations on
+    retained_blocks (skipped for baselines without it).
+
+    Args:
+        report (Dict[str, Any]): Output of run_benchmarks
+        baseline (Dict[str, Any]): A previously saved report
+        threshold (float): Allowed ratio (e.g., 1.25 = 25% slower)
+
+    Returns:
+        List[str]: One message per regression
+    """
+    regressions = []
+    for name, current in report["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is None:
+            continue
+        for metric in ("best_ms", "peak_kib", "retained_blocks"):
+            if previous.get(metric, 0) > 0 and current[metric] > previous[metric] * threshold:
+                regressions.append(
+                    f"{name}: {metric} {previous[metric]:.2f} → {current[metric]:.2f} "
+                    f"({current[metric] / previous[metric]:.2f}x)"
+                )
+    return regressions
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """Print a table of the measurements (with the change against a baseline)."""
+    print(f"🐍 Python {report['python']} on {report['platform']} ({report['repeat']} runs per case)\n")
+    print(f"{'case':58} {'best ms':>10} {'median ms':>10} {'peak KiB':>10} {'kept KiB':>9} "
+          f"{'kept blocks':>11}  vs baseline")
+    for name, result in report["cases"].items():
+        change = ""
+        previous = (baseline or {}).get("cases", {}).get(name)
+        if previous and previous["best_ms"] > 0:
+            change = f"{result['best_ms'] / previous['best_ms']:.2f}x"
+        print(f"{name:58} {result['best_ms']:10.3f} {result['median_ms']:10.3f} "
+              f"{result['peak_kib']:10.1f} {result['retained_kib']:9.1f} {result['retained_blocks']:11d}  {change}")
+
+
+def main():
+    """Command line entry point for the benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark the area extraction functions.")
+    parser.add_argument('--quick', action='store_true', help="Only run the small input sizes")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case")
+    parser.add_argument('--filter', help="Only run cases whose name contains this text")
+    parser.add_argument('--baseline', help="Compare against a saved report and fail on regressions")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Allowed slowdown/memory ratio against the baseline")
+    parser.add_argument('--save-baseline', help="Save this run as a baseline report")
+    args = parser.parse_args()
+
+    report = run_benchmarks(QUICK_SIZES if args.quick else SIZES, args.repeat, args.filter)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 Saved baseline to: {args.save_baseline}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions over {args.threshold:.2f}x:")
+            for message in regressions:
+                print(f"   {message}")
+            return 1
+        print(f"\n✅ No regressions over {args.threshold:.2f}x against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
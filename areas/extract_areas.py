@@ -4,10 +4,17 @@ Script to extract area codes and names from Hot Pepper HTML structure
 and organize them into a structured JSON format.
 """
 
+import argparse
+import itertools
 import json
+import os
 import re
+import sys
 from bs4 import BeautifulSoup
 
+import metrics
+from area_extractor import iter_area_records, iter_select_records, write_json_if_changed, write_ndjson
+
 def extract_middle_areas_from_select(select_html, service_area_code):
     """
     Extract middle area information from HTML select structure.
@@ -39,16 +46,27 @@ def extract_middle_areas_from_select(select_html, service_area_code):
     
     return middle_areas
 
-def extract_areas_from_html():
+def extract_areas_from_html(html_content=None):
     """
     Extract area information from the provided HTML structure.
     
+    Args:
+        html_content (str, optional): A ul.areaSelectList snippet or a full saved page.
+            Only the ul.areaSelectList element of a full page is parsed.
+            Defaults to the snippet provided by the user.
+    
     Returns:
         dict: Structured area data organized by type
     """
     
-    # The HTML content provided by the user
-    html_content = """
+    if html_content is not None:
+        # Parse only the area list instead of the whole page
+        from page_slicer import slice_area_select_list
+        with metrics.span("slice"):
+            html_content = slice_area_select_list(html_content)
+    else:
+        # The HTML content provided by the user
+        html_content = """
     <ul class="areaSelectList">
 		<li>
 				<dl class="globalAreaList">
@@ -283,7 +301,9 @@ def extract_areas_from_html():
     """
     
     # Parse HTML with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
+    metrics.count("pages")
+    with metrics.span("parse"):
+        soup = BeautifulSoup(html_content, 'html.parser')
     
     # Initialize the structure
     areas_data = {
@@ -341,20 +361,11 @@ def extract_areas_from_html():
                             }
                             areas_data["service_area"].append(service_area_data)
     
+    metrics.count("options", len(areas_data["large_service_area"]) + len(areas_data["service_area"]))
     return areas_data
 
-def demo_middle_area_extraction():
-    """Demonstrate middle area extraction from select HTML."""
-    print("\n🔍 Demonstrating Middle Area Extraction...")
-    
-    # Import the new extraction function
-    import sys
-    import os
-    sys.path.append(os.path.join(os.path.dirname(__file__), 'src', 'tools'))
-    from area_extractor import extract_middle_areas_from_select
-    
-    # Sample select HTML provided by user
-    sample_select_html = """
+# Sample select HTML provided by user (middle areas of Hokkaido, SA41)
+SAMPLE_MIDDLE_AREA_SELECT = """
     <select name="MA" class="selectArea">
         <option value="">北海道のエリアすべて</option>
         <option value="Y500">すすきの</option>
@@ -370,10 +381,20 @@ def demo_middle_area_extraction():
         <option value="Y885">帯広・釧路・北見・河東郡</option>
         <option value="Y502">富良野・その他北海道</option>
     </select>
-    """
+"""
+
+def demo_middle_area_extraction():
+    """Demonstrate middle area extraction from select HTML."""
+    print("\n🔍 Demonstrating Middle Area Extraction...")
+    
+    # Import the new extraction function
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), 'src', 'tools'))
+    from area_extractor import extract_middle_areas_from_select
     
     # Extract middle areas for Hokkaido (SA41) and create individual JSON file
-    output_file = extract_middle_areas_from_select(sample_select_html, "SA41")
+    output_file = extract_middle_areas_from_select(SAMPLE_MIDDLE_AREA_SELECT, "SA41")
     print(f"📁 Created individual area file: {output_file}")
     
     # Read the created file and display information
@@ -384,12 +405,51 @@ def demo_middle_area_extraction():
     for area in area_data['middle_area']:
         print(f"   {area['code']}: {area['name']} (belongs to {area['service_area']})")
     
-    print(f"🔧 File structure includes 'small_area' object ready to be filled: {type(area_data['small_area']).__name__}")
+    if area_data['middle_area']:
+        print(f"🔧 Each middle area includes a 'small_area' array ready to be filled: {area_data['middle_area'][0]['small_area']}")
     
     return area_data['middle_area']
 
+def stream_ndjson(destination):
+    """
+    Stream the extracted areas as NDJSON, one record (code, name, level, parent) per line.
+    
+    Records flow through generators from the parser to the output, so a consumer
+    of the file or pipe can start loading before extraction has finished.
+    
+    Args:
+        destination (str): Output file path, or "-" for stdout
+    
+    Returns:
+        int: Number of records written
+    """
+    records = itertools.chain(
+        iter_area_records(extract_areas_from_html()),
+        iter_select_records(SAMPLE_MIDDLE_AREA_SELECT, "SA41"),
+    )
+    return write_ndjson(records, destination)
+
 def main():
     """Main function to extract areas and save to JSON file."""
+    parser = argparse.ArgumentParser(description="Extract Hot Pepper area codes and names.")
+    parser.add_argument('--ndjson', metavar='PATH',
+                        help="Stream one area record per line to PATH ('-' for stdout) "
+                             "instead of writing hotpepper_areas.json")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="Save stage timings and counters to PATH (Prometheus text for *.prom, else JSON)")
+    args = parser.parse_args()
+    
+    if args.metrics:
+        metrics.enable()
+    
+    if args.ndjson:
+        count = stream_ndjson(args.ndjson)
+        # stdout may carry the records, so the summary goes to stderr
+        print(f"✅ Streamed {count} area records to {args.ndjson}", file=sys.stderr)
+        if args.metrics:
+            metrics.write_report(args.metrics)
+        return
+    
     print("Extracting area data from HTML...")
     
     # Extract the areas
@@ -401,13 +461,12 @@ def main():
     # Add sample middle areas to the main data structure for demonstration
     areas["middle_area"].extend(sample_middle_areas)
     
-    # Save to JSON file
+    # Save to JSON file (left untouched when nothing changed since the last run)
     output_file = "hotpepper_areas.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(areas, f, ensure_ascii=False, indent=2)
+    written = write_json_if_changed(output_file, areas)
     
     print(f"\n✅ Area data extracted successfully!")
-    print(f"📁 Saved to: {output_file}")
+    print(f"📁 {'Saved to' if written else 'Unchanged'}: {output_file}")
     print(f"📊 Statistics:")
     print(f"   - Large Service Areas (SS): {len(areas['large_service_area'])}")
     print(f"   - Service Areas (SA): {len(areas['service_area'])}")
@@ -428,6 +487,9 @@ def main():
         print(f"\n📋 Sample Middle Areas:")
         for area in areas['middle_area'][:5]:
             print(f"   {area['code']}: {area['name']} (belongs to {area['service_area']})")
+    
+    if args.metrics:
+        print(f"\n⏱️  Saved metrics to: {metrics.write_report(args.metrics)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
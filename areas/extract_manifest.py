@@ -0,0 +1,167 @@
+"""
+Extraction Manifest
+
+Records a content hash for every input page and every output file of a batch
+extraction, so a re-run only parses pages that changed and only rewrites the
+prefecture files they affect.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Optional, Any, Set, Tuple
+
+from area_extractor import write_json_atomic
+
+
+MANIFEST_FILENAME = ".extract_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_digest(file_path: str) -> Optional[str]:
+    """
+    Return the SHA-256 of a file, or None when it does not exist.
+
+    Args:
+        file_path (str): Path to hash
+
+    Returns:
+        Optional[str]: Hex digest
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def input_key(input_dir: str, input_path: str) -> str:
+    """Return the manifest key of an input page (its path relative to input_dir)."""
+    return os.path.relpath(input_path, input_dir).replace(os.sep, '/')
+
+
+class ExtractManifest:
+    """
+    Content hashes of the inputs and outputs of each service area.
+
+    Stored as JSON in the output directory:
+        {
+          "version": 1,
+          "prefectures": {
+            "SA41": {
+              "inputs": {"SA41.html": "<sha256>", "SA41/Y500.html": "<sha256>"},
+              "output": "北海道のエリアすべて.json",
+              "output_digest": "<sha256>"
+            }
+          }
+        }
+    """
+
+    def __init__(self, manifest_path: str, prefectures: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = manifest_path
+        self.prefectures: Dict[str, Dict[str, Any]] = prefectures or {}
+
+    @classmethod
+    def load(cls, output_dir: str) -> "ExtractManifest":
+        """
+        Load the manifest of an output directory (empty when missing or unreadable).
+
+        Args:
+            output_dir (str): Directory containing the prefecture files
+
+        Returns:
+            ExtractManifest: The manifest
+        """
+        manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return cls(manifest_path)
+        if data.get("version") != MANIFEST_VERSION:
+            return cls(manifest_path)
+        return cls(manifest_path, data.get("prefectures", {}))
+
+    def save(self) -> str:
+        """Write the manifest atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        write_json_atomic(self.path, {"version": MANIFEST_VERSION, "prefectures": self.prefectures})
+        return self.path
+
+    def input_digests(self, input_dir: str, input_paths: Iterable[str]) -> Dict[str, str]:
+        """Hash input pages, keyed by their path relative to input_dir."""
+        digests = {}
+        for path in input_paths:
+            digest = file_digest(path)
+            if digest is not None:
+                digests[input_key(input_dir, path)] = digest
+        return digests
+
+    def is_stale(self, service_area_code: str, input_digests: Dict[str, str], output_dir: str) -> bool:
+        """
+        Tell whether a service area must be extracted again.
+
+        A service area is stale when it was never extracted, when any of its input
+        pages was added, removed or modified, or when its output file was deleted
+        or edited since the last run.
+
+        Args:
+            service_area_code (str): Service area code (e.g., "SA41")
+            input_digests (Dict[str, str]): Current digests from input_digests
+            output_dir (str): Directory containing the prefecture files
+
+        Returns:
+            bool: True when the service area needs to be extracted
+        """
+        entry = self.prefectures.get(service_area_code)
+        if entry is None or entry.get("inputs") != input_digests:
+            return True
+        output = entry.get("output")
+        if not output:
+            return True
+        return file_digest(os.path.join(output_dir, output)) != entry.get("output_digest")
+
+    def unchanged_inputs(self, service_area_code: str, input_digests: Dict[str, str],
+                         output_dir: str) -> Tuple[Optional[str], Set[str]]:
+        """
+        Find the input pages whose previous extraction is still valid.
+
+        Their areas can be copied from the recorded output file instead of
+        parsing the page again. Nothing is reusable when the output file was
+        deleted or edited since the last run.
+
+        Args:
+            service_area_code (str): Service area code (e.g., "SA41")
+            input_digests (Dict[str, str]): Current digests from input_digests
+            output_dir (str): Directory containing the prefecture files
+
+        Returns:
+            Tuple[Optional[str], Set[str]]: Recorded output file (None when it
+            cannot be trusted) and the keys of the unchanged input pages
+        """
+        output_path = self.output_path(service_area_code, output_dir)
+        if output_path is None:
+            return None, set()
+        entry = self.prefectures[service_area_code]
+        if file_digest(output_path) != entry.get("output_digest"):
+            return None, set()
+        previous = entry.get("inputs", {})
+        return output_path, {key for key, digest in input_digests.items() if previous.get(key) == digest}
+
+    def record(self, service_area_code: str, input_digests: Dict[str, str], output_path: str) -> None:
+        """Remember the inputs and output of a completed extraction."""
+        self.prefectures[service_area_code] = {
+            "inputs": input_digests,
+            "output": os.path.basename(output_path),
+            "output_digest": file_digest(output_path),
+        }
+
+    def output_path(self, service_area_code: str, output_dir: str) -> Optional[str]:
+        """Return the recorded prefecture file of a service area, if any."""
+        entry = self.prefectures.get(service_area_code)
+        if not entry or not entry.get("output"):
+            return None
+        return os.path.join(output_dir, entry["output"])
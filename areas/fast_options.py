@@ -0,0 +1,170 @@
+"""
+Parser-free Option Extraction
+
+Reads the value attribute and text of <option> elements through html.parser
+event callbacks, without building a BeautifulSoup tree. The output matches
+BeautifulSoup's html.parser builder followed by option.get('value') and
+option.get_text(strip=True), including its handling of unclosed options and
+of end tags that close several elements at once.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+
+# Elements BeautifulSoup closes as soon as they open (HTMLTreeBuilder.empty_element_tags)
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer',
+))
+
+# Elements whose strings get_text() leaves out (HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+STRING_CONTAINERS = frozenset(('rt', 'rp', 'style', 'script', 'template'))
+
+_DECIMAL_REFERENCE = re.compile(r'^([0-9]+)(.*)')
+_HEX_REFERENCE = re.compile(r'^([0-9a-f]+)(.*)')
+
+
+class _OpenOption:
+    """An <option> whose end tag has not been seen yet."""
+
+    __slots__ = ("value", "depth", "pieces", "current")
+
+    def __init__(self, value: Optional[str], depth: int):
+        self.value = value
+        # Position of the option in the stack of open elements
+        self.depth = depth
+        self.pieces: List[str] = []
+        self.current: List[str] = []
+
+    def flush(self) -> None:
+        # Text split by tags becomes separate strings, each stripped on its own
+        if self.current:
+            text = ''.join(self.current).strip()
+            if text:
+                self.pieces.append(text)
+            self.current = []
+
+
+class OptionCollector(HTMLParser):
+    """
+    html.parser handler that collects (value, text) pairs of <option> elements.
+
+    Keeps the same stack of open elements as BeautifulSoup's tree builder: an end
+    tag closes the most recent open element of that name and everything opened
+    after it (so </select>, </optgroup> or </td> also close unclosed options), and
+    end tags without a matching open element are ignored.
+    """
+
+    def __init__(self):
+        # References are decoded by the handlers below, the way BeautifulSoup does
+        super().__init__(convert_charrefs=False)
+        self.options: List[Tuple[Optional[str], List[str]]] = []
+        self._stack: List[str] = []
+        self._open: List[_OpenOption] = []
+        # Stack positions of the open string containers
+        self._containers: List[int] = []
+
+    def _flush(self) -> None:
+        for option in self._open:
+            option.flush()
+
+    def _pop_to(self, depth: int) -> None:
+        """Close every open element from position depth of the stack up."""
+        del self._stack[depth:]
+        while self._open and self._open[-1].depth >= depth:
+            self._open.pop().flush()
+        while self._containers and self._containers[-1] >= depth:
+            self._containers.pop()
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in VOID_ELEMENTS:
+            return
+        if tag == 'option':
+            value = None
+            for name, attr_value in attrs:
+                if name == 'value':
+                    value = attr_value if attr_value is not None else ''
+            option = _OpenOption(value, len(self._stack))
+            # Reserve the slot now so options keep document order
+            self.options.append((option.value, option.pieces))
+            self._open.append(option)
+        elif tag in STRING_CONTAINERS:
+            self._containers.append(len(self._stack))
+        self._stack.append(tag)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth] == tag:
+                self._pop_to(depth)
+                break
+
+    def handle_data(self, data):
+        if self._containers:
+            return
+        for option in self._open:
+            option.current.append(data)
+
+    def handle_charref(self, name):
+        base, reference = (16, _HEX_REFERENCE) if name[:1] in ('x', 'X') else (10, _DECIMAL_REFERENCE)
+        digits = name[1:] if base == 16 else name
+        try:
+            number, rest = int(digits, base), ''
+        except ValueError:
+            match = reference.search(digits)
+            if match is None:
+                self.handle_data(digits)
+                return
+            number, rest = int(match.group(1), base), match.group(2)
+        self.handle_data(UnicodeDammit.numeric_character_reference(number)[0] + rest)
+
+    def handle_entityref(self, name):
+        # Unknown names stay literal text
+        self.handle_data(EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name, f'&{name}'))
+
+    def handle_comment(self, data):
+        # Comments, declarations and processing instructions are not part of
+        # get_text(), but they do split strings
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        # CDATA sections become strings of their own that get_text() includes
+        if data.upper().startswith('CDATA['):
+            text = data[len('CDATA['):].strip()
+            if text:
+                for option in self._open:
+                    option.pieces.append(text)
+
+    def close(self):
+        super().close()
+        self._pop_to(0)
+
+
+def iter_options(html: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Return the (value, text) pairs of every <option> in document order.
+
+    Args:
+        html (str): HTML content containing option elements
+
+    Returns:
+        List[Tuple[Optional[str], str]]: Value attribute (None when absent) and
+            stripped text of each option
+    """
+    collector = OptionCollector()
+    collector.feed(html)
+    collector.close()
+    return [(value, ''.join(pieces)) for value, pieces in collector.options]
@@ -0,0 +1,186 @@
+"""
+Extraction Metrics
+
+Optional instrumentation for the extraction pipeline: timing spans per stage
+(slice, parse, filter, serialize, read, write) and counters (pages, options,
+bytes written). Everything is off by default; while disabled, span() returns a
+shared no-op context manager and count() returns immediately, so the hooks cost
+one function call and a global lookup.
+
+Example:
+    >>> import metrics
+    >>> metrics.enable()
+    >>> extract_middle_areas_from_select(html, "SA41")
+    >>> print(metrics.to_prometheus())
+"""
+
+import json
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Optional
+
+
+class Metrics:
+    """Accumulated stage timings and counters."""
+
+    def __init__(self):
+        # stage -> [calls, total seconds, max seconds]
+        self.stages: Dict[str, list] = {}
+        self.counters: Dict[str, int] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [1, seconds, seconds]
+            return
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+
+    def add(self, counter: str, value: int) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "stages": {
+                stage: {"calls": calls, "total_seconds": total, "max_seconds": longest}
+                for stage, (calls, total, longest) in sorted(self.stages.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+class _Span:
+    """Times one stage and records it on exit."""
+
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics: Metrics, stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+_NULL_SPAN = nullcontext()
+
+# The active registry; None while instrumentation is disabled
+_metrics: Optional[Metrics] = None
+
+
+def enable() -> Metrics:
+    """Start collecting (keeps what was already collected) and return the registry."""
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+    return _metrics
+
+
+def disable() -> None:
+    """Stop collecting and drop the collected values."""
+    global _metrics
+    _metrics = None
+
+
+def enabled() -> bool:
+    return _metrics is not None
+
+
+def reset() -> None:
+    """Clear the collected values without changing whether collection is on."""
+    global _metrics
+    if _metrics is not None:
+        _metrics = Metrics()
+
+
+def span(stage: str):
+    """
+    Time a pipeline stage.
+
+    Args:
+        stage (str): Stage name (e.g., "parse")
+
+    Returns:
+        A context manager (a shared no-op one while disabled)
+
+    Example:
+        >>> with span("parse"):
+        ...     soup = BeautifulSoup(html, 'html.parser')
+    """
+    if _metrics is None:
+        return _NULL_SPAN
+    return _Span(_metrics, stage)
+
+
+def count(counter: str, value: int = 1) -> None:
+    """Add value to a counter (e.g., count("options", 12))."""
+    if _metrics is not None:
+        _metrics.add(counter, value)
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Return the collected values.
+
+    Returns:
+        Dict[str, Any]: {"stages": {stage: {calls, total_seconds, max_seconds}},
+            "counters": {name: value}} (empty while disabled)
+    """
+    return _metrics.snapshot() if _metrics is not None else {"stages": {}, "counters": {}}
+
+
+def to_json() -> str:
+    """Return the collected values as JSON."""
+    return json.dumps(snapshot(), ensure_ascii=False, indent=2)
+
+
+def to_prometheus(prefix: str = "area_extraction") -> str:
+    """
+    Return the collected values in the Prometheus text exposition format.
+
+    Args:
+        prefix (str): Metric name prefix
+
+    Returns:
+        str: Stage seconds/calls/max as labelled metrics and one
+            "<prefix>_<counter>_total" metric per counter
+    """
+    values = snapshot()
+    lines = []
+    stage_metrics = (
+        ("stage_seconds_total", "counter", "Time spent per pipeline stage", "total_seconds"),
+        ("stage_calls_total", "counter", "Number of times each stage ran", "calls"),
+        ("stage_max_seconds", "gauge", "Longest single run of each stage", "max_seconds"),
+    )
+    for name, kind, description, key in stage_metrics:
+        lines.append(f"# HELP {prefix}_{name} {description}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        for stage, entry in values["stages"].items():
+            lines.append(f'{prefix}_{name}{{stage="{stage}"}} {entry[key]}')
+    for counter, value in values["counters"].items():
+        lines.append(f"# TYPE {prefix}_{counter}_total counter")
+        lines.append(f"{prefix}_{counter}_total {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path: str) -> str:
+    """
+    Save the collected values, as Prometheus text for *.prom files and JSON otherwise.
+
+    Args:
+        path (str): Destination path
+
+    Returns:
+        str: The path written
+    """
+    text = to_prometheus() if path.endswith('.prom') else to_json() + "\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
@@ -0,0 +1,237 @@
+"""
+Targeted Page Slicing
+
+Saved Hot Pepper pages are several megabytes, but the extractors only need the
+area selects and the region list (ul.areaSelectList). This module cuts those
+elements out of a page with a tag scanner, so only the slices are handed to a
+parser. Files are read in chunks and only the current region is kept in memory,
+so peak memory does not grow with the page size.
+"""
+
+import io
+import re
+from typing import Iterator, List, Optional, TextIO
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# A '<' that does not start a valid tag this far before the end of the data read
+# so far is text; closer to the end, the tag may still be incomplete
+MAX_TAG_LENGTH = 1 << 16
+
+_CLASS_ATTRIBUTE = re.compile(r'''\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.IGNORECASE)
+
+# Markup as html.parser tokenizes it. Start tags follow locatestarttagend_tolerant;
+# comments, CDATA sections and other declarations are matched whole, so tags
+# inside them are never seen. "partial" is a '<' that may start a tag that is
+# not complete yet.
+_TOKEN = re.compile(r'''
+    <(?:
+        (?P<comment>!--.*?(?:--\s*>|\Z))
+      | (?P<cdata>!\[CDATA\[.*?(?:\]\s*\]\s*>|\Z))
+      | (?P<section>!\[.*?(?:\]\s*>|\Z))
+      | (?P<end>/(?P<end_name>[a-zA-Z][^\t\n\r\f />\x00]*)[^>]*(?:>|\Z))
+      | (?P<markup>[!?/][^>]*(?:>|\Z))
+      | (?P<start>(?P<start_name>[a-zA-Z][^\t\n\r\f />\x00]*)
+          (?:[\s/]*
+            (?:(?<=['"\s/])[^\s/>][^\s/=>]*
+              (?:\s*=+\s*(?:'[^']*'|"[^"]*"|(?!['"])[^>\s]*)\s*)?
+              (?:\s|/(?!>))*
+            )*
+          )?
+          \s*(?P<self_closing>/?)>)
+      | (?P<partial>[a-zA-Z]|\Z)
+    )''', re.VERBOSE | re.DOTALL)
+
+# Elements html.parser reads as raw text up to their end tag
+_RAW_TEXT_END = {
+    name: re.compile(rf'</\s*{name}\b[^>]*>', re.IGNORECASE) for name in ('script', 'style')
+}
+
+# Elements BeautifulSoup closes as soon as they open
+_VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem',
+    'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame',
+    'image', 'isindex', 'nextid', 'spacer',
+))
+
+
+def _has_class(start_tag: str, css_class: str) -> bool:
+    """Tell whether a start tag carries css_class in its class attribute."""
+    match = _CLASS_ATTRIBUTE.search(start_tag)
+    if not match:
+        return False
+    classes = next(group for group in match.groups() if group is not None)
+    return css_class in classes.split()
+
+
+def iter_regions(stream: TextIO, tag: str, css_class: Optional[str] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the outer HTML of every <tag class="css_class"> element of a stream.
+
+    The scanner keeps the stack of open elements the way BeautifulSoup's
+    html.parser builder does: comments, declarations and script/style content
+    are skipped, void elements never open, and an end tag closes the most recent
+    open element of its name together with everything opened after it. A region
+    therefore ends where a parser would close the element, also when that is an
+    ancestor's end tag (e.g. </td> around an unclosed select); such a region is
+    yielded with end tags for the elements it leaves open. A region still open at
+    the end of the stream is yielded up to the end.
+
+    Args:
+        stream (TextIO): Text stream of the page
+        tag (str): Element name (e.g., "select")
+        css_class (Optional[str]): Required class (None accepts any element)
+        chunk_size (int): Number of characters read at a time
+
+    Yields:
+        str: HTML of each matching element, in document order
+    """
+    buffer = ''
+    position = 0
+    stack: List[str] = []
+    region_start: Optional[int] = None
+    region_depth = 0
+    at_end = False
+
+    while not at_end:
+        chunk = stream.read(chunk_size)
+        at_end = not chunk
+        buffer += chunk
+
+        while True:
+            token = _TOKEN.search(buffer, position)
+            if token is None:
+                position = len(buffer)
+                break
+            start = token.start()
+            # Markup running into the end of the data read so far may be incomplete
+            if not at_end and token.end() == len(buffer):
+                position = start
+                break
+            kind = token.lastgroup
+
+            if kind == 'start':
+                position = token.end()
+                name = token.group('start_name').lower()
+                if token.group('self_closing') or name in _VOID_ELEMENTS:
+                    continue
+                if name in _RAW_TEXT_END:
+                    raw_end = _RAW_TEXT_END[name].search(buffer, position)
+                    if raw_end is None and not at_end:
+                        position = start
+                        break
+                    position = raw_end.end() if raw_end else len(buffer)
+                    continue
+                if region_start is None and name == tag and (
+                        css_class is None or _has_class(token.group(0), css_class)):
+                    region_start = start
+                    region_depth = len(stack)
+                stack.append(name)
+
+            elif kind == 'end':
+                position = token.end()
+                name = token.group('end_name').lower()
+                for depth in range(len(stack) - 1, -1, -1):
+                    if stack[depth] == name:
+                        break
+                else:
+                    # Nothing to close: BeautifulSoup ignores the end tag
+                    continue
+                closed = stack[depth:]
+                del stack[depth:]
+                if region_start is not None and depth <= region_depth:
+                    if depth == region_depth and name == tag:
+                        yield buffer[region_start:position]
+                    else:
+                        # Closed by an ancestor's end tag, which is not part of the region
+                        left_open = closed[region_depth - depth:]
+                        yield buffer[region_start:start] + ''.join(f'</{name}>' for name in reversed(left_open))
+                    region_start = None
+
+            elif kind == 'partial':
+                # Well before the end of the data, a '<' that starts no tag is text
+                if not at_end and len(buffer) - start < MAX_TAG_LENGTH:
+                    position = start
+                    break
+                position = start + 1
+
+            else:
+                position = token.end()
+
+        if at_end:
+            if region_start is not None:
+                yield buffer[region_start:]
+            return
+
+        # Outside a region nothing before the scan position is needed anymore
+        keep_from = region_start if region_start is not None else position
+        buffer = buffer[keep_from:]
+        position -= keep_from
+        if region_start is not None:
+            region_start = 0
+
+
+def slice_elements(html: str, tag: str, css_class: Optional[str] = None) -> List[str]:
+    """
+    Return the outer HTML of every <tag class="css_class"> element of html.
+
+    Args:
+        html (str): Page or fragment
+        tag (str): Element name (e.g., "ul")
+        css_class (Optional[str]): Required class (None accepts any element)
+
+    Returns:
+        List[str]: Matching elements in document order
+    """
+    return list(iter_regions(io.StringIO(html), tag, css_class))
+
+
+def slice_area_selects(html: str) -> str:
+    """
+    Narrow a page to its selects.
+
+    Every <select> is kept, whatever its class: the middle area select is a
+    select.selectArea, but a small area (X) select may not be. Bare <option>
+    snippets without a select are returned as they are.
+
+    Args:
+        html (str): Full page or select snippet
+
+    Returns:
+        str: HTML containing only the selects
+    """
+    regions = slice_elements(html, 'select')
+    return ''.join(regions) if regions else html
+
+
+def slice_area_select_list(html: str) -> str:
+    """
+    Narrow a page to its ul.areaSelectList (large service areas and service areas).
+
+    Args:
+        html (str): Full page or list snippet
+
+    Returns:
+        str: HTML containing only the area list, or the input when none is found
+    """
+    regions = slice_elements(html, 'ul', 'areaSelectList')
+    return ''.join(regions) if regions else html
+
+
+def read_area_selects(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Read only the selects of a saved page, streaming the file once.
+
+    Args:
+        file_path (str): Path to the saved page
+        chunk_size (int): Number of characters read at a time
+
+    Returns:
+        str: HTML of the select elements ("" when the page has none; unlike
+            slice_area_selects, the page is never returned whole, so memory
+            stays bounded by its selects)
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return ''.join(iter_regions(f, 'select', None, chunk_size))
@@ -0,0 +1,178 @@
+"""
+Lazy Prefecture Area Loader
+
+Loads per-prefecture area files (北海道のエリアすべて.json, ...) by service area
+code, only when a prefecture is first requested, and keeps a bounded LRU of the
+parsed files. Resident memory and startup cost follow the prefectures actually
+in use instead of all of them.
+
+The file of each service area comes from the extraction manifest when there is
+one, otherwise from the first bytes of each file, where "service_area_code" is
+written. No file is parsed in full until it is requested.
+"""
+
+import glob
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from area_index import CONSOLIDATED_FILENAME
+from extract_manifest import ExtractManifest
+
+
+# service_area_code is the first key the extractors write
+_SERVICE_AREA_CODE = re.compile(rb'"service_area_code"\s*:\s*"([^"]+)"')
+SNIFF_BYTES = 4096
+
+
+def sniff_service_area_code(file_path: str) -> Optional[str]:
+    """
+    Read the service area code of a prefecture file without parsing all of it.
+
+    Args:
+        file_path (str): Path to a per-prefecture area file
+
+    Returns:
+        Optional[str]: Service area code, or None for other files
+    """
+    with open(file_path, 'rb') as f:
+        match = _SERVICE_AREA_CODE.search(f.read(SNIFF_BYTES))
+    if match:
+        return match.group(1).decode('utf-8')
+
+    # Hand-edited files may order their keys differently
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except ValueError:
+        return None
+    code = data.get("service_area_code") if isinstance(data, dict) else None
+    return code if isinstance(code, str) else None
+
+
+class PrefectureLoader:
+    """
+    Load prefecture area files on demand with a bounded LRU cache.
+
+    Example:
+        >>> loader = PrefectureLoader("areas", max_prefectures=8)
+        >>> loader["SA41"]["middle_area"][0]["code"]
+        'Y500'
+        >>> loader.stats()["misses"]
+        1
+    """
+
+    def __init__(self, *directories: str, max_prefectures: int = 8):
+        if max_prefectures < 1:
+            raise ValueError("max_prefectures must be at least 1")
+        self.directories = directories or (os.path.dirname(os.path.abspath(__file__)),)
+        self.max_prefectures = max_prefectures
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._paths: Optional[Dict[str, str]] = None
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _discover(self) -> Dict[str, str]:
+        """Map every service area code to its file (manifest first, then sniffing)."""
+        paths: Dict[str, str] = {}
+        known_files = set()
+        for directory in self.directories:
+            manifest = ExtractManifest.load(directory)
+            for code in manifest.prefectures:
+                path = manifest.output_path(code, directory)
+                if path and os.path.isfile(path) and code not in paths:
+                    paths[code] = path
+                    known_files.add(os.path.abspath(path))
+
+        for directory in self.directories:
+            for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+                if os.path.basename(path) == CONSOLIDATED_FILENAME or os.path.abspath(path) in known_files:
+                    continue
+                code = sniff_service_area_code(path)
+                if code and code not in paths:
+                    paths[code] = path
+        return paths
+
+    def _file_paths(self) -> Dict[str, str]:
+        if self._paths is None:
+            self._paths = self._discover()
+        return self._paths
+
+    def path(self, service_area_code: str) -> Optional[str]:
+        """Return the file of a service area, or None when there is none."""
+        with self._lock:
+            return self._file_paths().get(service_area_code)
+
+    def codes(self) -> List[str]:
+        """Return every service area code that has a prefecture file."""
+        with self._lock:
+            return sorted(self._file_paths())
+
+    def get(self, service_area_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the parsed prefecture file of a service area, loading it if needed.
+
+        The returned data is shared with the cache and must not be modified.
+
+        Args:
+            service_area_code (str): Service area code (e.g., "SA41")
+
+        Returns:
+            Optional[Dict[str, Any]]: Area data, or None when no file exists
+        """
+        with self._lock:
+            data = self._cache.get(service_area_code)
+            if data is not None:
+                self._cache.move_to_end(service_area_code)
+                self.hits += 1
+                return data
+
+            path = self._file_paths().get(service_area_code)
+            if path is None:
+                return None
+            self.misses += 1
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            self._cache[service_area_code] = data
+            while len(self._cache) > self.max_prefectures:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+            return data
+
+    def __getitem__(self, service_area_code: str) -> Dict[str, Any]:
+        data = self.get(service_area_code)
+        if data is None:
+            raise KeyError(service_area_code)
+        return data
+
+    def __contains__(self, service_area_code: object) -> bool:
+        return self.path(service_area_code) is not None
+
+    def clear(self) -> None:
+        """Drop every cached prefecture and forget the discovered files."""
+        with self._lock:
+            self._cache.clear()
+            self._paths = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses, evictions, resident (prefectures in
+                memory) and capacity
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "resident": len(self._cache),
+                "capacity": self.max_prefectures,
+            }
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Area Master Replay Server
+
+Local stand-in for the Hot Pepper area master APIs. Serves responses recorded
+with `area_crawler.py --record DIR`, so the crawler can be run and timed without
+an API key or network access.
+
+A request is answered with the file named by recording_name() for its path and
+query (the API key is ignored), falling back to the level's whole recording
+"{level}.xml" (or .json, by the format parameter). A fallback answer keeps only
+the records matching the query's parent filters (large_area=Z011,Z012 etc.), as
+the API would. Unknown requests get a 404.
+
+Usage:
+    python replay_server.py recordings/ [--port 8765]
+    python area_crawler.py --base-url http://127.0.0.1:8765 --key test
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+sys.path.append(os.path.dirname(__file__))
+from area_crawler import recording_name
+
+# Parent filters of the area master APIs (comma separated codes)
+FILTER_PARAMS = ("large_service_area", "service_area", "large_area", "middle_area")
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace ("{http://...}code" -> "code")."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _matches(parent_code, filters: Dict[str, Set[str]]) -> bool:
+    """Whether every filtered parent of a record (looked up by parent_code) is one of the filter codes."""
+    return all(parent_code(name) in codes for name, codes in filters.items())
+
+
+def _json_code(value: Any) -> Optional[str]:
+    """Code of a parent of a JSON record ({"code": ..., "name": ...} or a bare code)."""
+    return value.get("code") if isinstance(value, dict) else value
+
+
+def _xml_code(element: ET.Element, name: str) -> Optional[str]:
+    """Code of the parent element name of an XML record (<large_area><code>...</code></large_area>)."""
+    for child in element:
+        if _local_name(child.tag) != name:
+            continue
+        for field in child:
+            if _local_name(field.tag) == "code":
+                return (field.text or '').strip()
+        return (child.text or '').strip()
+    return None
+
+
+def _filter_json(body: bytes, level: str, filters: Dict[str, Set[str]]) -> bytes:
+    data = json.loads(body)
+    results = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(results, dict) or not isinstance(results.get(level), list):
+        return body
+    records = [record for record in results[level]
+               if _matches(lambda name: _json_code(record.get(name)), filters)]
+    results[level] = records
+    if "results_returned" in results:
+        # Keep the recorded type (the API sends some counts as strings)
+        results["results_returned"] = type(results["results_returned"])(len(records))
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def _filter_xml(body: bytes, level: str, filters: Dict[str, Set[str]]) -> bytes:
+    root = ET.fromstring(body)
+    returned = None
+    kept = 0
+    for element in list(root):
+        name = _local_name(element.tag)
+        if name == "results_returned":
+            returned = element
+        elif name == level:
+            if _matches(lambda parent: _xml_code(element, parent), filters):
+                kept += 1
+            else:
+                root.remove(element)
+    if returned is not None:
+        returned.text = str(kept)
+    if root.tag.startswith('{'):
+        # Serialize the API namespace as the default one instead of ns0:
+        ET.register_namespace('', root.tag[1:].split('}', 1)[0])
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+def filter_recording(body: bytes, level: str, params: Dict[str, str]) -> bytes:
+    """
+    Keep the records of a whole-level recording that match the parent filters of a query.
+
+    Args:
+        body (bytes): Content of "{level}.xml" or "{level}.json"
+        level (str): Area level of the request (e.g., "middle_area")
+        params (Dict[str, str]): Query parameters of the request
+
+    Returns:
+        bytes: The body with only the matching records (unchanged without filters)
+    """
+    filters = {name: set(params[name].split(',')) for name in FILTER_PARAMS if params.get(name)}
+    if not filters:
+        return body
+    if params.get("format", "xml") == "xml":
+        return _filter_xml(body, level, filters)
+    return _filter_json(body, level, filters)
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Answer GET requests from the recordings directory of the server."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        directory = self.server.directory
+        exact = recording_name(url.path, params)
+        level = url.path.strip('/').split('/')[0]
+        candidates = [exact, level + os.path.splitext(exact)[1]]
+        for name in candidates:
+            file_path = os.path.join(directory, name)
+            if os.path.isfile(file_path):
+                with open(file_path, 'rb') as f:
+                    body = f.read()
+                if name != exact:
+                    body = filter_recording(body, level, params)
+                self.send_response(200)
+                content_type = 'application/json' if name.endswith('.json') else 'application/xml'
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+        self.send_error(404, f"No recording for {candidates[0]}")
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def start_replay_server(directory: str, port: int = 0, host: str = '127.0.0.1',
+                        quiet: bool = True) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start a replay server in a background thread.
+
+    Args:
+        directory (str): Directory of recorded responses
+        port (int): Port to listen on (0 picks a free port)
+        host (str): Address to bind
+        quiet (bool): Suppress the per-request log lines
+
+    Returns:
+        Tuple[ThreadingHTTPServer, str]: The server (call shutdown() when done)
+            and its base URL for AreaCrawler
+    """
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    server.directory = directory
+    server.quiet = quiet
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv: Optional[list] = None):
+    """Command line entry point for the replay server."""
+    parser = argparse.ArgumentParser(description="Replay recorded area master API responses.")
+    parser.add_argument('directory', help="Directory written by area_crawler.py --record")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to bind")
+    parser.add_argument('--port', type=int, default=8765, help="Port to listen on")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Recordings directory not found: {args.directory}")
+        return 1
+
+    server = ThreadingHTTPServer((args.host, args.port), ReplayHandler)
+    server.directory = args.directory
+    server.quiet = False
+    print(f"✅ Replaying {args.directory} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
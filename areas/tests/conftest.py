@@ -0,0 +1,22 @@
+"""Shared fixtures for the area pipeline tests."""
+
+import os
+import sys
+
+import pytest
+
+AREAS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(AREAS_DIR)
+
+# The pipeline modules import each other as top-level modules
+sys.path.insert(0, AREAS_DIR)
+
+
+@pytest.fixture
+def areas_dir() -> str:
+    return AREAS_DIR
+
+
+@pytest.fixture
+def hokkaido_dir() -> str:
+    return os.path.join(REPO_DIR, "hokkaido_areas")
@@ -0,0 +1,55 @@
+import json
+
+from area_diff import diff_areas, load_areas
+from area_index import AreaIndex
+from area_snapshot import write_snapshot
+
+
+def test_directory_and_its_snapshot_diff_clean(tmp_path):
+    areas = tmp_path / "areas"
+    areas.mkdir()
+    (areas / "hotpepper_areas.json").write_text(json.dumps({
+        "service_area": [{"code": "SA41", "name": "北海道", "large_service_area": "SS01"}],
+        "middle_area": [{"code": "Y500", "name": "すすきの", "service_area": "SA41"}],
+        # Parent that is not part of the data
+        "small_area": [{"code": "X001", "name": "南4条", "middle_area": "Y999"}],
+    }, ensure_ascii=False), encoding='utf-8')
+    snapshot = write_snapshot(AreaIndex.load(str(areas)), str(tmp_path / "areas.snapshot"))
+
+    directory_areas = load_areas(str(areas))
+    assert directory_areas["X001"].parent == "Y999"
+    assert directory_areas["SA41"].parent == "SS01"
+    # The snapshot drops parents it does not contain, which is not a move
+    assert load_areas(snapshot)["X001"].parent is None
+    assert diff_areas(directory_areas, load_areas(snapshot))["affected"] == []
+
+
+def test_snapshot_against_changed_directory(tmp_path):
+    areas = tmp_path / "areas"
+    areas.mkdir()
+    data = {"service_area": [{"code": "SA41", "name": "北海道"}],
+            "middle_area": [{"code": "Y500", "name": "すすきの", "service_area": "SA41"}]}
+    (areas / "hotpepper_areas.json").write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    snapshot = write_snapshot(AreaIndex.load(str(areas)), str(tmp_path / "areas.snapshot"))
+
+    data["middle_area"][0]["name"] = "すすきの・中島公園"
+    (areas / "hotpepper_areas.json").write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    changes = diff_areas(load_areas(snapshot), load_areas(str(areas)))
+    assert changes["summary"] == {"added": 0, "removed": 0, "renamed": 1, "moved": 0}
+
+
+def test_move_between_parents_that_are_not_in_the_data(tmp_path):
+    def write_prefecture(directory, service_area_code):
+        directory.mkdir()
+        (directory / "北海道のエリアすべて.json").write_text(json.dumps({
+            "service_area_code": service_area_code,
+            "area_name": "北海道のエリアすべて",
+            "middle_area": [{"code": "Y500", "name": "すすきの",
+                             "small_area": [{"code": "X001", "name": "南4条"}]}],
+        }, ensure_ascii=False), encoding='utf-8')
+
+    write_prefecture(tmp_path / "old", "SA41")
+    write_prefecture(tmp_path / "new", "SA42")
+    changes = diff_areas(load_areas(str(tmp_path / "old")), load_areas(str(tmp_path / "new")))
+    assert changes["moved"] == [{"code": "Y500", "old_parent": "SA41", "new_parent": "SA42"}]
+    assert changes["summary"] == {"added": 0, "removed": 0, "renamed": 0, "moved": 1}
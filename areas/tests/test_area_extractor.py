@@ -0,0 +1,57 @@
+import json
+import os
+import threading
+
+import area_extractor
+from area_extractor import add_small_areas_bulk, extract_middle_areas_from_select, locked_file
+
+MIDDLE_SELECT = ('<select class="selectArea"><option value="">北海道のエリアすべて</option>'
+                 '<option value="Y500">すすきの</option><option value="Y505">札幌駅</option></select>')
+
+
+def test_locked_file_leaves_no_sidecar_or_lock_entry(tmp_path):
+    path = tmp_path / "北海道のエリアすべて.json"
+    with locked_file(str(path)):
+        assert os.path.exists(tmp_path / ".北海道のエリアすべて.json.lock")
+    assert os.listdir(tmp_path) == []
+    assert area_extractor._file_locks == {}
+
+
+def test_locked_file_serializes_threads(tmp_path):
+    path = str(tmp_path / "counter.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(0, f)
+
+    def increment():
+        for _ in range(50):
+            with locked_file(path):
+                with open(path, encoding='utf-8') as f:
+                    value = json.load(f)
+                area_extractor.write_json_atomic(path, value + 1)
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == 200
+    assert os.listdir(tmp_path) == ["counter.json"]
+
+
+def small_areas_after_extracting_again(tmp_path, **options):
+    path = extract_middle_areas_from_select(MIDDLE_SELECT, "SA41", str(tmp_path))
+    add_small_areas_bulk(path, {"Y500": [{"code": "X001", "name": "南4条", "middle_area": "Y500"}]})
+
+    extract_middle_areas_from_select(MIDDLE_SELECT, "SA41", str(tmp_path), **options)
+    with open(path, encoding='utf-8') as f:
+        return {area['code']: area['small_area'] for area in json.load(f)['middle_area']}
+
+
+def test_extracting_middle_areas_again_resets_small_areas(tmp_path):
+    assert small_areas_after_extracting_again(tmp_path) == {"Y500": [], "Y505": []}
+
+
+def test_extracting_middle_areas_again_can_keep_merged_small_areas(tmp_path):
+    assert small_areas_after_extracting_again(tmp_path, keep_small_areas=True) == {
+        "Y500": [{"code": "X001", "name": "南4条", "middle_area": "Y500"}], "Y505": []}
@@ -0,0 +1,101 @@
+import json
+import os
+
+from area_index import MAX_DEPTH, AreaIndex, area_files
+
+
+def record(code, name="", parent=None, level=None):
+    return {"code": code, "name": name, "level": level, "parent": parent}
+
+
+def build():
+    return AreaIndex.from_records([
+        record("SS10", "北海道"),
+        record("SA41", "北海道", "SS10"),
+        record("Y500", "すすきの", "SA41"),
+        record("Y505", "札幌駅", "SA41"),
+        record("X001", "南4条", "Y500"),
+        record("X002", "南5条", "Y500"),
+        record("X010", "北口", "Y505"),
+    ])
+
+
+def codes(nodes):
+    return [node.code for node in nodes]
+
+
+def test_later_records_update_name_and_parent_only_when_they_carry_one():
+    index = AreaIndex.from_records([
+        record("SA41", "北海道"),
+        record("SA42", "青森"),
+        record("Y500", "すすきの", "SA41"),
+        # A later record without a name or parent keeps the earlier ones
+        record("Y500"),
+        record("Y505", "札幌", "SA41"),
+        record("Y505", "札幌駅", "SA42"),
+    ])
+    assert (index["Y500"].name, index["Y500"].parent.code) == ("すすきの", "SA41")
+    assert (index["Y505"].name, index["Y505"].parent.code) == ("札幌駅", "SA42")
+    assert codes(index.children("SA41")) == ["Y500"]
+    assert len(index) == 4
+
+
+def test_levels_come_from_records_or_code_prefixes():
+    index = AreaIndex.from_records([record("Z011"), record("Q1"), record("Y500", level="small_area")])
+    assert [node.level for node in index] == ["large_area", "", "small_area"]
+
+
+def test_unloaded_parents_leave_roots():
+    index = AreaIndex.from_records([record("Y500", "すすきの", "SA41")])
+    assert index.parent("Y500") is None
+    assert index.parent_code("Y500") == "SA41"
+
+
+def test_ancestors_nearest_first():
+    index = build()
+    assert codes(index.ancestors("X001")) == ["Y500", "SA41", "SS10"]
+    assert index.ancestors("SS10") == []
+    assert index.ancestors("X999") == []
+
+
+def test_ancestors_stop_on_parent_cycles():
+    index = AreaIndex.from_records([record("Y1", parent="Y2"), record("Y2", parent="Y1")])
+    chain = index.ancestors("Y1")
+    assert len(chain) == MAX_DEPTH
+    assert codes(chain[:3]) == ["Y2", "Y1", "Y2"]
+    assert len(list(index.descendants("Y1"))) == MAX_DEPTH
+
+
+def test_children_and_descendants():
+    index = build()
+    assert codes(index.children("SA41")) == ["Y500", "Y505"]
+    assert index.children("X001") == []
+    assert index.children("X999") == []
+    assert codes(index.descendants("SA41")) == ["Y500", "X001", "X002", "Y505", "X010"]
+    assert codes(index.descendants("SS10", "small_area")) == ["X001", "X002", "X010"]
+    assert list(index.descendants("X999")) == []
+
+
+def test_by_level_in_load_order():
+    index = build()
+    assert codes(index.by_level("middle_area")) == ["Y500", "Y505"]
+    assert index.by_level("large_area") == []
+
+
+def test_load_reads_the_consolidated_file_first(tmp_path):
+    (tmp_path / "hotpepper_areas.json").write_text(json.dumps({
+        "service_area": [{"code": "SA41", "name": "北海道"}],
+        "middle_area": [{"code": "Y500", "name": "すすきの（旧）", "service_area": "SA41"}],
+    }, ensure_ascii=False), encoding='utf-8')
+    # Sorts before hotpepper_areas.json, but must still refine it
+    (tmp_path / "a_prefecture.json").write_text(json.dumps({
+        "service_area_code": "SA41",
+        "middle_area": [{"code": "Y500", "name": "すすきの", "small_area": [{"code": "X001", "name": "南4条"}]}],
+    }, ensure_ascii=False), encoding='utf-8')
+    (tmp_path / "notes.txt").write_text("not area data", encoding='utf-8')
+
+    assert [os.path.basename(path) for path in area_files(str(tmp_path))] == [
+        "hotpepper_areas.json", "a_prefecture.json"]
+    index = AreaIndex.load(str(tmp_path))
+    assert index["Y500"].name == "すすきの"
+    assert codes(index.ancestors("X001")) == ["Y500", "SA41"]
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from area_index import AreaIndex
+from area_resolver import AreaResolver
+
+
+def test_resolve_with_prefecture_files(hokkaido_dir):
+    resolver = AreaResolver.from_index(AreaIndex.load(hokkaido_dir))
+    assert resolver.resolve("新札幌")[0].code == "Y511"
+
+
+def test_resolve_with_default_directory(areas_dir):
+    # areas/ only holds the Sapporo-station middle area, not 新札幌 itself
+    resolver = AreaResolver.from_index(AreaIndex.load(areas_dir))
+    assert resolver.resolve("新札幌")[0].code == "Y505"
+
+
+def test_load_or_build_reuses_persisted_index(hokkaido_dir, tmp_path):
+    index_path = str(tmp_path / "names.json")
+    built = AreaResolver.load_or_build(hokkaido_dir, index_path=index_path)
+    loaded = AreaResolver.load_or_build(hokkaido_dir, index_path=index_path)
+    assert loaded.fingerprint == built.fingerprint
+    assert loaded.resolve("すすきの")[0].code == built.resolve("すすきの")[0].code == "Y500"
+
+
+def test_failed_save_keeps_the_previous_index(hokkaido_dir, tmp_path, monkeypatch):
+    index_path = str(tmp_path / "names.json")
+    resolver = AreaResolver.from_index(AreaIndex.load(hokkaido_dir), "first")
+    resolver.save(index_path)
+
+    def interrupted(source, destination):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(os, "replace", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        AreaResolver.from_index(AreaIndex.load(hokkaido_dir), "second").save(index_path)
+
+    assert AreaResolver.load(index_path).fingerprint == "first"
+    assert os.listdir(tmp_path) == ["names.json"]
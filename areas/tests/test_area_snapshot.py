@@ -0,0 +1,76 @@
+import pytest
+
+from area_index import AreaIndex
+from area_snapshot import NO_PARENT, AreaSnapshot, write_snapshot
+
+
+def record(code, name, parent=None, level=None):
+    return {"code": code, "name": name, "level": level, "parent": parent}
+
+
+INDEXES = {
+    "hierarchy": [
+        record("SS10", "北海道"),
+        record("SA41", "北海道", "SS10"),
+        # Parent that is not part of the data
+        record("SA11", "東京", "SS20"),
+        record("Y505", "札幌駅", "SA41"),
+        record("Y500", "すすきの", "SA41"),
+        record("X010", "北口", "Y505"),
+        record("X001", "南4条", "Y500"),
+        record("X002", "", "Y500"),
+        # Unknown level
+        record("Q1", "その他", "SA11"),
+    ],
+    "empty": [],
+}
+
+
+@pytest.fixture(params=sorted(INDEXES))
+def exported(request, tmp_path):
+    index = AreaIndex.from_records(INDEXES[request.param])
+    with AreaSnapshot(write_snapshot(index, str(tmp_path / "areas.snapshot"))) as snapshot:
+        yield index, snapshot
+
+
+def summary(node):
+    return node.code, node.name, node.level
+
+
+def test_nodes_match_the_index(exported):
+    index, snapshot = exported
+    assert len(snapshot) == len(index)
+    assert sorted(summary(node) for node in snapshot) == sorted(summary(node) for node in index)
+    for node in index:
+        found = snapshot.get(node.code)
+        assert summary(found) == summary(node)
+        parent = index.parent(node.code)
+        assert (snapshot.node(found.parent).code if found.parent != NO_PARENT else None) == (
+            parent.code if parent else None)
+
+
+def test_children_and_ancestors_match_the_index(exported):
+    index, snapshot = exported
+    for node in index:
+        assert [child.code for child in snapshot.children(node.code)] == [
+            child.code for child in index.children(node.code)]
+        assert [ancestor.code for ancestor in snapshot.ancestors(node.code)] == [
+            ancestor.code for ancestor in index.ancestors(node.code)]
+
+
+def test_code_lookups_match_the_index(exported):
+    index, snapshot = exported
+    probes = [node.code for node in index] + ["", "A", "SA10", "SA12", "X000", "X0010", "Y501", "ZZZ"]
+    for code in probes:
+        assert (code in snapshot) == (code in index)
+        assert (snapshot.get(code) is None) == (index.get(code) is None)
+    assert snapshot.children("Y999") == []
+
+
+def test_to_index_round_trips(exported):
+    index, snapshot = exported
+    restored = snapshot.to_index()
+    assert [summary(node) for node in restored] == [summary(node) for node in snapshot]
+    for node in index:
+        assert [child.code for child in restored.children(node.code)] == [
+            child.code for child in index.children(node.code)]
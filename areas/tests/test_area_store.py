@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from area_store import AreaStore
+
+
+def write_areas(directory, middle_areas):
+    directory.mkdir(exist_ok=True)
+    (directory / "hotpepper_areas.json").write_text(json.dumps({
+        "service_area": [{"code": "SA41", "name": "北海道"}],
+        "middle_area": [{"code": code, "name": name, "service_area": "SA41"} for code, name in middle_areas],
+    }, ensure_ascii=False), encoding='utf-8')
+
+
+def test_replace_drops_areas_missing_from_the_new_load(tmp_path):
+    areas = tmp_path / "areas"
+    with AreaStore(str(tmp_path / "areas.sqlite")) as store:
+        write_areas(areas, [("Y500", "すすきの"), ("Y505", "札幌駅")])
+        store.load(str(areas), replace=True)
+        write_areas(areas, [("Y500", "すすきの")])
+        store.load(str(areas), replace=True)
+        assert [row.code for row in store.children("SA41")] == ["Y500"]
+
+
+def test_merge_keeps_earlier_areas(tmp_path):
+    areas = tmp_path / "areas"
+    with AreaStore() as store:
+        write_areas(areas, [("Y505", "札幌駅")])
+        store.load(str(areas))
+        write_areas(areas, [("Y500", "すすきの")])
+        store.load(str(areas))
+        assert [row.code for row in store.children("SA41")] == ["Y500", "Y505"]
+
+
+def test_failed_replace_keeps_the_old_areas():
+    def records():
+        yield {"code": "Y500", "name": "すすきの"}
+        raise ValueError("broken input")
+
+    with AreaStore() as store:
+        store.upsert([{"code": "Y505", "name": "札幌駅"}])
+        with pytest.raises(ValueError):
+            store.upsert(records(), replace=True)
+        assert [row.code for row in store] == ["Y505"]
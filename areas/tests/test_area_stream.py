@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+
+import area_stream
+from area_stream import ApiResponseError, iter_records
+
+RECORDS = {"results": {"middle_area": [{"code": "Y500", "name": "すすきの"}]}}
+ERROR = {"results": {"api_version": "1.20", "error": [{"message": "APIキーまたはIPアドレスの認証エラーです", "code": 2000}]}}
+
+
+@pytest.fixture(params=["ijson", "buffered"])
+def json_backend(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(area_stream, "ijson", None)
+
+
+def body(data):
+    return io.BytesIO(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+
+def test_json_records(json_backend):
+    assert list(iter_records(body(RECORDS), "middle_area", "json", chunk_size=7)) == RECORDS["results"]["middle_area"]
+
+
+def test_json_error_raises(json_backend):
+    with pytest.raises(ApiResponseError, match="認証エラーです 2000"):
+        list(iter_records(body(ERROR), "middle_area", "json", chunk_size=7))
+
+
+def test_xml_error_raises():
+    xml = ('<results><api_version>1.20</api_version><error>'
+           '<message>APIキーまたはIPアドレスの認証エラーです</message><code>2000</code></error></results>')
+    with pytest.raises(ApiResponseError, match="認証エラーです 2000"):
+        list(iter_records(io.BytesIO(xml.encode('utf-8')), "middle_area", chunk_size=7))
@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+from batch_extract import run_batch
+
+
+def select(name, options):
+    lines = ['<select class="selectArea">', f'<option value="">{name}</option>']
+    lines += [f'<option value="{code}">{label}</option>' for code, label in options]
+    lines.append('</select>')
+    return '\n'.join(lines)
+
+
+def write_page(path, html):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'<html><body>{html}</body></html>')
+
+
+@pytest.fixture
+def batch_dirs(tmp_path):
+    pages = tmp_path / "pages"
+    write_page(str(pages / "SA41.html"), select("北海道のエリアすべて", [("Y500", "すすきの"), ("Y505", "札幌駅")]))
+    write_page(str(pages / "SA41" / "Y500.html"), select("すすきの", [("X001", "南4条")]))
+    write_page(str(pages / "SA41" / "Y505.html"), select("札幌駅", [("X010", "北口")]))
+    areas_json = tmp_path / "hotpepper_areas.json"
+    areas_json.write_text(json.dumps({"service_area": [{"code": "SA41"}]}), encoding='utf-8')
+    return str(pages), str(tmp_path / "out"), str(areas_json)
+
+
+def load_output(output_dir):
+    with open(os.path.join(output_dir, "北海道のエリアすべて.json"), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_full_run_writes_no_manifest(batch_dirs):
+    pages, output_dir, areas_json = batch_dirs
+    report = run_batch(pages, output_dir, areas_json, jobs=1)
+    assert report['pages'] == 3
+    assert not os.path.exists(os.path.join(output_dir, ".extract_manifest.json"))
+
+
+def test_incremental_run_parses_only_changed_pages(batch_dirs):
+    pages, output_dir, areas_json = batch_dirs
+    assert run_batch(pages, output_dir, areas_json, jobs=1, incremental=True)['pages'] == 3
+
+    report = run_batch(pages, output_dir, areas_json, jobs=1, incremental=True)
+    assert report['skipped'] == ["SA41"] and report['pages'] == 0
+
+    write_page(os.path.join(pages, "SA41", "Y505.html"), select("札幌駅", [("X010", "北口"), ("X011", "南口")]))
+    report = run_batch(pages, output_dir, areas_json, jobs=1, incremental=True)
+    assert (report['pages'], report['reused_pages']) == (1, 2)
+
+    middle_areas = {area['code']: area for area in load_output(output_dir)['middle_area']}
+    assert [small['code'] for small in middle_areas['Y500']['small_area']] == ["X001"]
+    assert [small['code'] for small in middle_areas['Y505']['small_area']] == ["X010", "X011"]
+
+
+def test_incremental_run_clears_small_areas_of_removed_pages(batch_dirs):
+    pages, output_dir, areas_json = batch_dirs
+    run_batch(pages, output_dir, areas_json, jobs=1, incremental=True)
+
+    os.remove(os.path.join(pages, "SA41", "Y500.html"))
+    report = run_batch(pages, output_dir, areas_json, jobs=1, incremental=True)
+    assert (report['pages'], report['reused_pages']) == (0, 2)
+
+    middle_areas = {area['code']: area for area in load_output(output_dir)['middle_area']}
+    assert middle_areas['Y500']['small_area'] == []
+    assert [small['code'] for small in middle_areas['Y505']['small_area']] == ["X010"]
+
+
+def test_edited_output_is_extracted_again(batch_dirs):
+    pages, output_dir, areas_json = batch_dirs
+    run_batch(pages, output_dir, areas_json, jobs=1, incremental=True)
+
+    output = os.path.join(output_dir, "北海道のエリアすべて.json")
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    report = run_batch(pages, output_dir, areas_json, jobs=1, incremental=True)
+    assert (report['pages'], report['reused_pages']) == (3, 0)
@@ -0,0 +1,41 @@
+import io
+import json
+import sys
+
+from area_extractor import iter_select_records, write_ndjson
+from area_index import iter_records_from_file, iter_records_from_ndjson
+from extract_areas import SAMPLE_MIDDLE_AREA_SELECT, main
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['extract_areas.py', *args])
+    main()
+
+
+def test_ndjson_output_has_the_records_of_the_json_output(tmp_path, monkeypatch):
+    # Both modes write relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    run_main(monkeypatch)
+    run_main(monkeypatch, '--ndjson', 'areas.ndjson')
+
+    json_records = list(iter_records_from_file(str(tmp_path / "hotpepper_areas.json")))
+    ndjson_records = list(iter_records_from_ndjson(str(tmp_path / "areas.ndjson")))
+    assert ndjson_records == json_records
+    assert {record["level"] for record in ndjson_records} == {"large_service_area", "service_area", "middle_area"}
+
+
+def test_write_ndjson_writes_one_record_per_line():
+    stream = io.StringIO()
+    records = iter_select_records(SAMPLE_MIDDLE_AREA_SELECT, "SA41")
+    assert write_ndjson(records, stream) == 12
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 12
+    assert json.loads(lines[0]) == {"code": "Y500", "name": "すすきの", "level": "middle_area", "parent": "SA41"}
+
+
+def test_select_records_skip_options_without_area_codes():
+    html = ('<select><option value="">すすきののエリアすべて</option><option value="X001">南4条</option>'
+            '<option value="SA41">北海道</option><option value="Y500">すすきの</option></select>')
+    assert [(record["code"], record["level"], record["parent"]) for record in iter_select_records(html, "Y500")] == [
+        ("X001", "small_area", "Y500"), ("Y500", "middle_area", "Y500")]
@@ -0,0 +1,38 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from fast_options import iter_options
+
+
+def soup_options(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    return [(option.get('value'), option.get_text(strip=True)) for option in soup.find_all('option')]
+
+
+@pytest.mark.parametrize("html, expected", [
+    # An unclosed option takes in the options nested after it
+    ('<select><option value="Y1">A<option value="Y2">B</select>', [("Y1", "AB"), ("Y2", "B")]),
+    # </optgroup> closes the options opened inside it
+    ('<select><optgroup label="g"><option value="Y1">A</optgroup>B</select>', [("Y1", "A")]),
+    # An ancestor's end tag closes the select and its options
+    ('<table><tr><td><select><option value="Y1">A</td><td>B</td></tr></table>', [("Y1", "A")]),
+    ('<div><select><option value="Y1">A</div>B</select>', [("Y1", "A")]),
+    # End tags without an open element are ignored
+    ('<select><option value="Y1">A</td></div>B</option></select>', [("Y1", "AB")]),
+    ('<select><option value="Y1">A<br>B</br>C</option></select>', [("Y1", "ABC")]),
+    # CDATA and textarea strings are text; script, style, template and ruby annotations are not
+    ('<select><option value="Y1">A<![CDATA[ c ]]>B</option></select>', [("Y1", "AcB")]),
+    ('<select><option value="Y1">A<textarea> t </textarea>B</option></select>', [("Y1", "AtB")]),
+    ('<select><option value="Y1">A<script>s</script><style>s</style>B</option></select>', [("Y1", "AB")]),
+    ('<select><option value="Y1">漢<template>t<b>x</b></template><rp>(</rp><rt>かん</rt></option></select>',
+     [("Y1", "漢")]),
+    # Comments, declarations and processing instructions split strings
+    ('<select><option value="Y1">A <!-- c --> B <?pi?> C <![if x]> D</option></select>', [("Y1", "ABCD")]),
+    # References are decoded the way BeautifulSoup decodes them
+    ('<select><option value="Y1">&foo; &ampx; &#0; &#128; &amp</option></select>', [("Y1", "&foo &ampx � € &")]),
+    ('<select><option value>A</option><option>B</option><option value="Y1" value="Y2"></select>',
+     [("", "A"), (None, "B"), ("Y2", "")]),
+])
+def test_matches_beautifulsoup(html, expected):
+    assert iter_options(html) == expected
+    assert soup_options(html) == expected
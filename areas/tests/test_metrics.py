@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+import metrics
+
+
+@pytest.fixture(autouse=True)
+def disabled_metrics():
+    metrics.disable()
+    yield
+    metrics.disable()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """perf_counter returning the listed times, one per call."""
+    times = iter([0.0, 0.5, 1.0, 3.0, 10.0, 10.25])
+    monkeypatch.setattr(metrics.time, 'perf_counter', lambda: next(times))
+
+
+def test_span_is_a_shared_no_op_while_disabled():
+    assert not metrics.enabled()
+    assert metrics.span("parse") is metrics.span("slice")
+    with metrics.span("parse"):
+        metrics.count("options", 3)
+    assert metrics.snapshot() == {"stages": {}, "counters": {}}
+
+
+def test_records_calls_durations_and_counters(clock):
+    metrics.enable()
+    with metrics.span("parse"):
+        pass
+    with metrics.span("parse"):
+        pass
+    with metrics.span("write"):
+        metrics.count("pages")
+    metrics.count("options", 12)
+    metrics.count("options", 3)
+
+    assert metrics.snapshot() == {
+        "stages": {
+            "parse": {"calls": 2, "total_seconds": 2.5, "max_seconds": 2.0},
+            "write": {"calls": 1, "total_seconds": 0.25, "max_seconds": 0.25},
+        },
+        "counters": {"options": 15, "pages": 1},
+    }
+    assert json.loads(metrics.to_json()) == metrics.snapshot()
+
+
+def test_span_records_failed_stages(clock):
+    metrics.enable()
+    with pytest.raises(ValueError):
+        with metrics.span("parse"):
+            raise ValueError("bad page")
+    assert metrics.snapshot()["stages"]["parse"]["calls"] == 1
+
+
+def test_enable_keeps_and_reset_clears_collected_values():
+    registry = metrics.enable()
+    metrics.count("pages")
+    assert metrics.enable() is registry
+    metrics.reset()
+    assert metrics.enabled() and metrics.snapshot()["counters"] == {}
+
+
+def test_prometheus_rendering(clock):
+    metrics.enable()
+    with metrics.span("parse"):
+        pass
+    metrics.count("bytes_written", 42)
+
+    assert metrics.to_prometheus("test").splitlines() == [
+        "# HELP test_stage_seconds_total Time spent per pipeline stage",
+        "# TYPE test_stage_seconds_total counter",
+        'test_stage_seconds_total{stage="parse"} 0.5',
+        "# HELP test_stage_calls_total Number of times each stage ran",
+        "# TYPE test_stage_calls_total counter",
+        'test_stage_calls_total{stage="parse"} 1',
+        "# HELP test_stage_max_seconds Longest single run of each stage",
+        "# TYPE test_stage_max_seconds gauge",
+        'test_stage_max_seconds{stage="parse"} 0.5',
+        "# TYPE test_bytes_written_total counter",
+        "test_bytes_written_total 42",
+    ]
+
+
+def test_write_report_picks_the_format_by_extension(tmp_path):
+    metrics.enable()
+    metrics.count("pages", 2)
+    prom = metrics.write_report(str(tmp_path / "metrics.prom"))
+    report = metrics.write_report(str(tmp_path / "metrics.json"))
+
+    with open(prom, encoding='utf-8') as f:
+        assert "area_extraction_pages_total 2\n" in f.read()
+    with open(report, encoding='utf-8') as f:
+        assert json.load(f)["counters"] == {"pages": 2}
@@ -0,0 +1,75 @@
+import builtins
+import io
+
+import pytest
+
+from page_slicer import iter_regions, read_area_selects, slice_area_selects, slice_elements
+
+
+def test_keeps_every_select_in_document_order():
+    html = ('<select class="selectArea"><option value="Y500">すすきの</option></select>'
+            '<p>x</p><select name="SA"><option value="X001">南4条</option></select>')
+    assert slice_elements(html, 'select') == [
+        '<select class="selectArea"><option value="Y500">すすきの</option></select>',
+        '<select name="SA"><option value="X001">南4条</option></select>',
+    ]
+
+
+@pytest.mark.parametrize("noise", [
+    '<!-- <select class="selectArea"><option value="Y998">old</option></select> -->',
+    '<script>html = \'<select class="selectArea"><option value="Y997">\';</script>',
+    '<style>select > option { color: red }</style>',
+    '<![CDATA[ <select><option value="X996"></option></select> ]]>',
+    '<a title="<select>" href="/x/">link</a>',
+])
+def test_skips_selects_that_are_not_markup(noise):
+    select = '<select><option value="Y500">すすきの</option></select>'
+    assert slice_elements(noise + select, 'select') == [select]
+
+
+def test_ancestor_end_tag_closes_the_region():
+    html = '<table><tr><td><select><option value="Y500">A<b>x</td><td>B</td></tr></table>'
+    assert slice_elements(html, 'select') == ['<select><option value="Y500">A<b>x</b></option></select>']
+
+
+def test_stray_end_tags_do_not_close_the_region():
+    html = '<select><option value="Y500">A</td></div>B</option></select>'
+    assert slice_elements(html, 'select') == [html]
+
+
+def test_region_open_at_the_end_is_kept():
+    assert slice_elements('<p><select><option>A', 'select') == ['<select><option>A']
+
+
+def test_snippets_without_select_are_kept_whole():
+    assert slice_area_selects('<option value="Y500">A</option>') == '<option value="Y500">A</option>'
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_chunk_boundaries_do_not_change_the_regions(chunk_size):
+    html = ('<!-- <select> --><div title="a>b"><select class="selectArea"><option value="Y1">A'
+            '<script>"<select>"</script></div><br/><select name="SA"><option value=X1>B</option></select>')
+    expected = slice_elements(html, 'select')
+    assert len(expected) == 2
+    assert list(iter_regions(io.StringIO(html), 'select', chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("body, expected", [
+    ('<p>x</p><select><option value="Y500">A</option></select><p>y</p>',
+     '<select><option value="Y500">A</option></select>'),
+    # Pages without a select are not read whole
+    ('<option value="Y500">A</option><p>no select</p>', ''),
+])
+def test_read_area_selects_opens_the_page_once(tmp_path, monkeypatch, body, expected):
+    page = tmp_path / "SA41.html"
+    page.write_text(f'<html><body>{body}</body></html>', encoding='utf-8')
+    opened = []
+    real_open = builtins.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(builtins, 'open', counting_open)
+    assert read_area_selects(str(page), chunk_size=8) == expected
+    assert opened.count(str(page)) == 1
@@ -0,0 +1,31 @@
+import json
+
+from batch_extract import run_batch
+from prefecture_loader import PrefectureLoader
+
+
+def test_files_come_from_the_manifest(tmp_path):
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    (pages / "SA41.html").write_text(
+        '<select class="selectArea"><option value="">北海道</option><option value="Y500">すすきの</option></select>',
+        encoding='utf-8')
+    areas_json = tmp_path / "hotpepper_areas.json"
+    areas_json.write_text(json.dumps({"service_area": [{"code": "SA41"}]}), encoding='utf-8')
+    output_dir = tmp_path / "out"
+    run_batch(str(pages), str(output_dir), str(areas_json), jobs=1, incremental=True)
+
+    loader = PrefectureLoader(str(output_dir))
+    assert loader.path("SA41") == str(output_dir / "北海道.json")
+    assert loader["SA41"]["middle_area"][0]["code"] == "Y500"
+
+
+def test_files_without_manifest_are_sniffed(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps({"service_area_code": "SA13", "middle_area": []}), encoding='utf-8')
+    (tmp_path / "hotpepper_areas.json").write_text(json.dumps({"service_area": []}), encoding='utf-8')
+
+    loader = PrefectureLoader(str(tmp_path), max_prefectures=1)
+    assert loader.codes() == ["SA13"]
+    loader.get("SA13")
+    loader.get("SA13")
+    assert loader.stats()["hits"] == 1 and loader.stats()["misses"] == 1
@@ -0,0 +1,127 @@
+import asyncio
+import io
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from area_crawler import recording_name
+from area_stream import iter_records
+from replay_server import start_replay_server
+
+NAMESPACE = "http://webservice.recruit.co.jp/HotPepper/"
+
+
+def xml_recording(level, records):
+    """A whole-level recording; records are (code, name, {parent: code}) tuples."""
+    items = []
+    for code, name, parents in records:
+        fields = ''.join(f'<{parent}><code>{value}</code><name>{value}</name></{parent}>'
+                         for parent, value in parents.items())
+        items.append(f'<{level}><code>{code}</code><name>{name}</name>{fields}</{level}>')
+    return (f'<?xml version="1.0" encoding="UTF-8"?><results xmlns="{NAMESPACE}">'
+            f'<results_returned>{len(records)}</results_returned>{"".join(items)}</results>')
+
+
+@pytest.fixture
+def replay(tmp_path):
+    (tmp_path / recording_name("/middle_area/v1/", {"format": "json", "large_area": "Z011"})).write_text(
+        '{"exact": true}', encoding='utf-8')
+    (tmp_path / "middle_area.json").write_text(json.dumps({"results": {"results_returned": "2", "middle_area": [
+        {"code": "Y500", "large_area": {"code": "Z011"}},
+        {"code": "Y600", "large_area": {"code": "Z099"}},
+    ]}}), encoding='utf-8')
+    (tmp_path / "middle_area.xml").write_text(xml_recording("middle_area", [
+        ("Y500", "すすきの", {"large_area": "Z011"}),
+        ("Y600", "札幌駅", {"large_area": "Z099"}),
+    ]), encoding='utf-8')
+    server, base_url = start_replay_server(str(tmp_path))
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    with urllib.request.urlopen(url) as response:
+        return response.read().decode('utf-8')
+
+
+def test_exact_recording_wins(replay):
+    assert get(f"{replay}/middle_area/v1/?key=secret&large_area=Z011&format=json") == '{"exact": true}'
+
+
+def test_json_fallback_keeps_the_filtered_records(replay):
+    results = json.loads(get(f"{replay}/middle_area/v1/?key=secret&large_area=Z099,Z012&format=json"))["results"]
+    assert [area["code"] for area in results["middle_area"]] == ["Y600"]
+    assert results["results_returned"] == "1"
+
+
+def test_xml_fallback_keeps_the_filtered_records(replay):
+    body = get(f"{replay}/middle_area/v1/?key=secret&large_area=Z011")
+    records = list(iter_records(io.BytesIO(body.encode('utf-8')), "middle_area"))
+    assert [record["code"] for record in records] == ["Y500"]
+    assert records[0]["name"] == "すすきの"
+    assert f'<results xmlns="{NAMESPACE}">' in body
+    assert '<results_returned>1</results_returned>' in body
+
+
+def test_fallback_without_filters_is_the_whole_recording(replay, tmp_path):
+    assert get(f"{replay}/middle_area/v1/?key=secret") == (tmp_path / "middle_area.xml").read_text(encoding='utf-8')
+
+
+def test_unknown_level_is_not_found(replay):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(f"{replay}/small_area/v1/?format=json")
+    assert error.value.code == 404
+
+
+def test_chunked_crawl_of_whole_level_recordings_has_no_duplicates(tmp_path):
+    pytest.importorskip("aiohttp")
+    from area_crawler import MAX_LARGE_AREA_CODES, crawl_to_directory
+
+    large_areas = [f"Z01{i}" for i in range(1, 5)]
+    assert len(large_areas) > MAX_LARGE_AREA_CODES
+    recordings = tmp_path / "recordings"
+    recordings.mkdir()
+    level_records = {
+        "large_service_area": [("SS10", "北海道", {})],
+        "service_area": [("SA41", "北海道", {"large_service_area": "SS10"})],
+        "large_area": [(code, code, {"service_area": "SA41"}) for code in large_areas],
+        "middle_area": [(f"Y5{i:02d}", f"Y5{i:02d}", {"service_area": "SA41", "large_area": code})
+                        for i, code in enumerate(large_areas)],
+        "small_area": [(f"X{i:03d}", f"X{i:03d}", {"middle_area": f"Y5{i:02d}"}) for i in range(len(large_areas))],
+    }
+    for level, records in level_records.items():
+        (recordings / f"{level}.xml").write_text(xml_recording(level, records), encoding='utf-8')
+
+    server, base_url = start_replay_server(str(recordings))
+    try:
+        stats = asyncio.run(crawl_to_directory("test", str(tmp_path / "out"), base_url=base_url, rate=0))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stats["counts"]["middle_area"] == len(large_areas)
+    with open(tmp_path / "out" / "北海道のエリアすべて.json", encoding='utf-8') as f:
+        middle_codes = [area["code"] for area in json.load(f)["middle_area"]]
+    assert sorted(middle_codes) == ["Y500", "Y501", "Y502", "Y503"]
+    with open(tmp_path / "out" / "hotpepper_areas.json", encoding='utf-8') as f:
+        hierarchy = json.load(f)
+    for level, areas in hierarchy.items():
+        codes = [area["code"] for area in areas]
+        assert len(codes) == len(set(codes)), level
+
+
+def test_fetch_level_keeps_each_code_once(monkeypatch):
+    pytest.importorskip("aiohttp")
+    from area_crawler import AreaCrawler
+
+    async def fetch(level, params=None):
+        # Every chunk answers with the whole level, as an unfiltered replay would
+        return [{"code": "Y500"}, {"code": "Y505"}]
+
+    crawler = AreaCrawler("test")
+    monkeypatch.setattr(crawler, "fetch", fetch)
+    records = asyncio.run(crawler.fetch_level("middle_area", "large_area", ["Z011", "Z012", "Z013"], 1))
+    assert records == [{"code": "Y500"}, {"code": "Y505"}]
@@ -0,0 +1,71 @@
+import glob
+import os
+import random
+
+import pytest
+
+from unified_extractor import extract_all_areas
+from verify_fast_path import chained, random_area_list, random_select
+
+AREA_LIST = (
+    '<ul class="areaSelectList"><li><dl class="globalAreaList">'
+    '<dt><a href="javascript:void(0);" data-ga="北海道・東北">x</a></dt>'
+    '<dd><ul class="saList"><li><a href="/SA41/">北海道</a></li><li><a href="/SA42/">青森</a></li></ul></dd>'
+    '</dl></li></ul>'
+)
+
+PREFECTURE_PAGE = (
+    f'<html><body>{AREA_LIST}'
+    '<select name="MA" class="selectArea"><option value="">北海道のエリアすべて</option>'
+    '<option value="Y500">すすきの</option><option value="Y505">札幌駅&amp;大通</option></select>'
+    '<script>var x = "<option value=\'Y999\'>fake</option>";</script>'
+    '</body></html>'
+)
+
+MIDDLE_AREA_PAGE = (
+    '<html><body><select name="SA" class="selectArea"><option value="">すすきののエリアすべて</option>'
+    '<option value="X001">南4条</option><option value="X002"><b>南5条</b></option></select>'
+    '<!-- <select class="selectArea"><option value="X998">old</option></select> -->'
+    '</body></html>'
+)
+
+FIXTURE_PAGES = {
+    "prefecture": PREFECTURE_PAGE,
+    "middle_area": MIDDLE_AREA_PAGE,
+    "both": PREFECTURE_PAGE + MIDDLE_AREA_PAGE,
+    "snippet": '<option value="Y500">すすきの</option>',
+    "empty": '<html><body><p>no areas</p></body></html>',
+}
+
+DOC_PAGES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', '..', 'Doc', '*.html')))
+
+
+@pytest.mark.parametrize("middle_area_code", ["Y500", "Y505"])
+@pytest.mark.parametrize("name", sorted(FIXTURE_PAGES))
+def test_matches_the_chained_extractors_on_fixture_pages(name, middle_area_code):
+    html = FIXTURE_PAGES[name]
+    assert extract_all_areas(html, "SA41", middle_area_code) == chained(html, "SA41", middle_area_code)
+
+
+@pytest.mark.parametrize("path", DOC_PAGES, ids=os.path.basename)
+def test_matches_the_chained_extractors_on_saved_pages(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        html = f.read()
+    assert extract_all_areas(html, "SA41", "Y500") == chained(html, "SA41", "Y500")
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_the_chained_extractors_on_generated_pages(seed):
+    rng = random.Random(seed)
+    html = random_select(rng)
+    if rng.random() < 0.5:
+        html = random_area_list(rng) + html
+    assert extract_all_areas(html, "SA00", "Y000") == chained(html, "SA00", "Y000")
+
+
+def test_prefecture_page_areas():
+    areas = extract_all_areas(PREFECTURE_PAGE, "SA41", "Y500")
+    assert areas["area_name"] == "北海道のエリアすべて"
+    assert [(area["code"], area["name"]) for area in areas["middle_area"]] == [
+        ("Y500", "すすきの"), ("Y505", "札幌駅&大通")]
+    assert [area["code"] for area in areas["service_area"]] == ["SA41", "SA42"]
@@ -0,0 +1,247 @@
+"""
+Single-pass Multi-level Area Extraction
+
+Walks a saved page once and emits every area level it contains: large service
+areas and service areas from ul.areaSelectList, middle areas (Y) and small areas
+(X) from the area selects, already linked parent to child. The result is the
+same as chaining extract_areas_from_html, parse_middle_areas and
+extract_small_areas_from_select on the same page, without parsing it three times.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from fast_options import OptionCollector
+
+
+_SA_HREF = re.compile(r'/SA(\d+)/')
+_INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+
+class _Text:
+    """Collects get_text(strip=True) of an element from parser events."""
+
+    __slots__ = ("pieces", "current")
+
+    def __init__(self):
+        self.pieces: List[str] = []
+        self.current: List[str] = []
+
+    def flush(self) -> None:
+        if self.current:
+            text = ''.join(self.current).strip()
+            if text:
+                self.pieces.append(text)
+            self.current = []
+
+    def text(self) -> str:
+        self.flush()
+        return ''.join(self.pieces)
+
+
+class _GlobalArea:
+    """State of one dl.globalAreaList (a large service area and its prefectures)."""
+
+    __slots__ = ("in_area_list", "name", "dt_seen", "in_dt", "dt_anchor_seen",
+                 "sa_list_seen", "sa_list_depth", "li_anchor_seen", "service_areas")
+
+    def __init__(self, in_area_list: bool):
+        self.in_area_list = in_area_list
+        self.name: Optional[str] = None
+        self.dt_seen = False
+        self.in_dt = False
+        self.dt_anchor_seen = False
+        self.sa_list_seen = False
+        self.sa_list_depth = 0
+        self.li_anchor_seen = True
+        self.service_areas: List[List[Any]] = []
+
+
+class AreaPageParser(OptionCollector):
+    """html.parser handler collecting every area level of a page in one pass."""
+
+    def __init__(self):
+        super().__init__()
+        # Whether each collected option sits inside a select
+        self.option_in_select: List[bool] = []
+        # Stack positions of the open selects
+        self._selects: List[int] = []
+        self._area_list_depth = 0
+        self.has_area_list = False
+        self.has_select = False
+        self.global_areas: List[_GlobalArea] = []
+        self._global_area: Optional[_GlobalArea] = None
+        self._anchor: Optional[_Text] = None
+        self._anchor_target: Optional[List[Any]] = None
+
+    def _flush_anchor(self) -> None:
+        if self._anchor is not None:
+            self._anchor.flush()
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_anchor()
+        attributes = dict(attrs)
+        classes = (attributes.get('class') or '').split()
+
+        if tag == 'option':
+            self.option_in_select.append(bool(self._selects))
+        elif tag == 'select':
+            self.has_select = True
+            self._selects.append(len(self._stack))
+        elif tag == 'ul':
+            if 'areaSelectList' in classes or self._area_list_depth:
+                self.has_area_list = True
+                self._area_list_depth += 1
+            area = self._global_area
+            if area is not None:
+                if area.sa_list_depth:
+                    area.sa_list_depth += 1
+                elif not area.sa_list_seen and 'saList' in classes:
+                    area.sa_list_seen = True
+                    area.sa_list_depth = 1
+        elif tag == 'dl' and 'globalAreaList' in classes and self._global_area is None:
+            self._global_area = _GlobalArea(self._area_list_depth > 0)
+        elif self._global_area is not None:
+            self._global_area_tag(tag, attributes)
+
+        super().handle_starttag(tag, attrs)
+
+    def _global_area_tag(self, tag: str, attributes: Dict[str, Optional[str]]) -> None:
+        area = self._global_area
+        if tag == 'dt' and not area.dt_seen:
+            area.dt_seen = True
+            area.in_dt = True
+        elif tag == 'li' and area.sa_list_depth:
+            area.li_anchor_seen = False
+        elif tag == 'a':
+            if area.in_dt and not area.dt_anchor_seen:
+                area.dt_anchor_seen = True
+                if attributes.get('data-ga'):
+                    area.name = attributes['data-ga']
+            elif area.sa_list_depth and not area.li_anchor_seen and self._anchor is None:
+                # First link of a prefecture item: [href, text] filled at </a>
+                area.li_anchor_seen = True
+                self._anchor = _Text()
+                self._anchor_target = [attributes.get('href'), None]
+                area.service_areas.append(self._anchor_target)
+
+    def handle_endtag(self, tag):
+        self._flush_anchor()
+        if tag == 'ul':
+            if self._area_list_depth:
+                self._area_list_depth -= 1
+            area = self._global_area
+            if area is not None and area.sa_list_depth:
+                area.sa_list_depth -= 1
+        elif tag == 'dl' and self._global_area is not None:
+            self.global_areas.append(self._global_area)
+            self._global_area = None
+        elif tag == 'dt' and self._global_area is not None:
+            self._global_area.in_dt = False
+        elif tag == 'a' and self._anchor is not None:
+            self._anchor_target[1] = self._anchor.text()
+            self._anchor = None
+            self._anchor_target = None
+
+        super().handle_endtag(tag)
+        # Any end tag that closes a select's ancestor closes the select too
+        while self._selects and self._selects[-1] >= len(self._stack):
+            self._selects.pop()
+
+    def handle_data(self, data):
+        if self._anchor is not None:
+            self._anchor.current.append(data)
+        super().handle_data(data)
+
+    def handle_comment(self, data):
+        self._flush_anchor()
+        super().handle_comment(data)
+
+    def close(self):
+        super().close()
+        if self._anchor is not None:
+            self._anchor_target[1] = self._anchor.text()
+            self._anchor = None
+        if self._global_area is not None:
+            self.global_areas.append(self._global_area)
+            self._global_area = None
+
+
+def extract_all_areas(html: str, service_area_code: Optional[str] = None,
+                      middle_area_code: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract every area level of a page in a single pass.
+
+    Args:
+        html (str): Full saved page or snippet
+        service_area_code (Optional[str]): Parent service area of the Y options (e.g., "SA41")
+        middle_area_code (Optional[str]): Parent middle area of the X options (e.g., "Y500")
+
+    Returns:
+        Dict[str, Any]: The keys of extract_areas_from_html (large_service_area,
+            service_area, large_area, middle_area, small_area) plus service_area_code
+            and area_name. middle_area holds parse_middle_areas entries whose
+            small_area arrays are already filled, and small_area holds the result of
+            extract_small_areas_from_select.
+
+    Example:
+        >>> areas = extract_all_areas(page_html, "SA41", "Y500")
+        >>> areas["middle_area"][0]["small_area"][0]["code"]
+        'X100'
+    """
+    parser = AreaPageParser()
+    parser.feed(html)
+    parser.close()
+
+    # Same region choice as page_slicer: area lists/selects when present, else everything
+    global_areas = [area for area in parser.global_areas if area.in_area_list or not parser.has_area_list]
+    large_service_areas = []
+    service_areas = []
+    for area in global_areas:
+        if not area.name:
+            continue
+        ss_code = f"SS{len(large_service_areas) + 1:02d}"
+        large_service_areas.append({"code": ss_code, "name": area.name})
+        for href, name in area.service_areas:
+            sa_match = _SA_HREF.search(href) if isinstance(href, str) else None
+            if sa_match:
+                service_areas.append({
+                    "code": f"SA{sa_match.group(1)}",
+                    "name": name,
+                    "large_service_area": ss_code,
+                })
+
+    options = [
+        (value, ''.join(pieces))
+        for (value, pieces), in_select in zip(parser.options, parser.option_in_select)
+        if in_select or not parser.has_select
+    ]
+
+    area_name = _INVALID_FILENAME_CHARS.sub('_', options[0][1]) if options else ""
+    small_areas = [
+        {"code": value, "name": name, "middle_area": middle_area_code}
+        for value, name in options
+        if value and value.startswith('X')
+    ]
+    middle_areas = [
+        {"code": value, "name": name, "service_area": service_area_code, "small_area": []}
+        for value, name in options
+        if value and value.startswith('Y')
+    ]
+
+    # Link the small areas to their middle area (the last one when a code repeats,
+    # as merge_small_areas does)
+    for middle_area in reversed(middle_areas):
+        if middle_area["code"] == middle_area_code:
+            middle_area["small_area"] = list(small_areas)
+            break
+
+    return {
+        "service_area_code": service_area_code,
+        "area_name": area_name,
+        "large_service_area": large_service_areas,
+        "service_area": service_areas,
+        "large_area": [],
+        "middle_area": middle_areas,
+        "small_area": small_areas,
+    }
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Differential check of the parser-free option path against BeautifulSoup.
+
+Runs read_options, parse_middle_areas and extract_small_areas_from_select with
+fast=False and fast=True on saved pages and on randomly generated selects, and
+reports every input where the two paths disagree. iter_options is also checked
+against BeautifulSoup on the whole input, which includes selects closed by an
+ancestor's end tag, and the sliced read_options against BeautifulSoup on the
+whole unsliced page. The single-pass
+extract_all_areas is checked against chaining the BeautifulSoup extractors.
+
+Usage:
+    python verify_fast_path.py [page.html | pages_dir ...] [--cases 500] [--seed 0]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+from typing import Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(__file__))
+from area_extractor import read_options, parse_middle_areas, extract_small_areas_from_select, merge_small_areas
+from extract_areas import extract_areas_from_html
+from fast_options import iter_options
+from unified_extractor import extract_all_areas
+
+
+NAME_CHARS = "すきのさっぽろ札幌駅大通新南郷白石厚別清田ｱｲｳabcXYZ０１２"
+SPACES = ["", " ", "\n    ", "　", "\t"]
+ENTITIES = ["&amp;", "&lt;", "&gt;", "&quot;", "&#12354;", "&#x3042;", "&nbsp;"]
+# Unknown names, missing semicolons and out of range or control code points
+ODD_ENTITIES = ["&foo;", "&amp", "&ampx;", "&#0;", "&#x110000;", "&#128;", "&#1;", "&#65x", "&#X41;", "& "]
+# Content whose strings BeautifulSoup keeps (CDATA, textarea) or leaves out of get_text()
+OPTION_EXTRAS = [
+    "<![CDATA[ cdata ]]>", "<![if x]>", "<?pi x?>", "<textarea> memo </textarea>",
+    "<template>tmpl<b>x</b></template>", "<ruby>漢<rp>(</rp><rt>かん</rt><rp>)</rp></ruby>",
+]
+
+
+def random_name(rng: random.Random) -> str:
+    """Build option text with entities, inline tags, comments and odd whitespace."""
+    parts = []
+    for _ in range(rng.randint(0, 4)):
+        roll = rng.random()
+        if roll < 0.6:
+            parts.append(''.join(rng.choice(NAME_CHARS) for _ in range(rng.randint(1, 6))))
+        elif roll < 0.75:
+            parts.append(rng.choice(ENTITIES))
+        elif roll < 0.85:
+            tag = rng.choice(["b", "span", "em"])
+            parts.append(f"<{tag}>{rng.choice(NAME_CHARS)}</{tag}>")
+        elif roll < 0.92:
+            parts.append("<!-- note -->")
+        else:
+            parts.append("<br>")
+        parts.append(rng.choice(SPACES))
+    return rng.choice(SPACES) + ''.join(parts)
+
+
+def random_option(rng: random.Random, index: int) -> str:
+    """Build one option tag with a variety of attribute spellings and endings."""
+    prefix = rng.choice(["Y", "X", "Z", "", "y"])
+    code = f"{prefix}{rng.randint(0, 999):03d}" if prefix else ""
+    attribute = rng.choice([
+        f'value="{code}"', f"value='{code}'", f"value={code or 'none'}", "value", "",
+        f'VALUE="{code}"', f'value="{code}" value="Y{index:03d}"', f'selected value="{code}"',
+    ])
+    tag = rng.choice(["option", "OPTION", "Option"])
+    end = rng.choice([f"</{tag}>", "</option>", "", f"</{tag}>"])
+    text = random_name(rng)
+    if rng.random() < 0.3:
+        text += rng.choice(ODD_ENTITIES + OPTION_EXTRAS) + random_name(rng)
+    return f"<{tag} {attribute}>{text}{end}"
+
+
+def random_options(rng: random.Random) -> str:
+    """Build the options of a select, sometimes grouped in optgroups that close unclosed options."""
+    groups = []
+    for _ in range(rng.randint(1, 3)):
+        options = ''.join(random_option(rng, index) for index in range(rng.randint(0, 6)))
+        if rng.random() < 0.3:
+            end = rng.choice(["</optgroup>", ""])
+            options = f'<optgroup label="{random_name(rng).strip()}">{options}{end}'
+        groups.append(options)
+    return ''.join(groups)
+
+
+def random_select(rng: random.Random) -> str:
+    """Build a select (sometimes several, sometimes surrounded by page noise)."""
+    chunks = []
+    for _ in range(rng.randint(1, 3)):
+        first = f'<option value="">{random_name(rng)}のエリアすべて</option>'
+        chunks.append(f'<select name="MA" class="selectArea">{first}{random_options(rng)}</select>')
+        if rng.random() < 0.2:
+            chunks.append(random_enclosed_select(rng))
+        if rng.random() < 0.3:
+            chunks.append('<script>var x = "<option value=\'Y999\'>fake</option>";</script>')
+        if rng.random() < 0.2:
+            # Markup that looks like a select to a naive scanner
+            chunks.append(rng.choice([
+                '<!-- <select class="selectArea"><option value="Y998">old</option></select> -->',
+                '<script>html = \'<select class="selectArea"><option value="Y997">js\';</script>',
+                '<![CDATA[ <select><option value="X996">cdata</option></select> ]]>',
+                '<a title="<select>" href="/x/">link</a>',
+            ]))
+        if rng.random() < 0.3:
+            chunks.append('<ul class="areaSelectList"><li><a href="/SA41/">北海道</a></li></ul>')
+    return ''.join(chunks)
+
+
+def random_enclosed_select(rng: random.Random) -> str:
+    """Build a select whose unclosed options are closed by the end tag of an ancestor."""
+    select = f'<select name="SA">{random_options(rng)}'
+    roll = rng.random()
+    if roll < 0.4:
+        return f'<table><tr><td>{select}</td><td>{random_name(rng)}</td></tr></table>'
+    if roll < 0.7:
+        return f'<div>{select}</div>{random_name(rng)}</select>'
+    # No open element matches the stray end tags, so they change nothing
+    return f'{select}</td></div>{random_name(rng)}</select>'
+
+
+def random_area_list(rng: random.Random) -> str:
+    """Build a ul.areaSelectList (or a stray dl.globalAreaList) with random regions."""
+    regions = []
+    for _ in range(rng.randint(0, 3)):
+        trigger = rng.choice([
+            f'<a href="javascript:void(0);" data-ga="{random_name(rng).strip() or "関東"}">x</a>',
+            '<a href="javascript:void(0);">no data-ga</a>', '',
+        ])
+        items = ''.join(
+            rng.choice([
+                f'<li><a href="/SA{rng.randint(10, 99)}/">{random_name(rng)}</a></li>',
+                f'<li><span>-</span><a href="/SA{rng.randint(10, 99)}/x">{random_name(rng)}</a><a href="/SA1/">2nd</a></li>',
+                '<li><a href="/other/">other</a></li>',
+                '<li>no link</li>',
+            ])
+            for _ in range(rng.randint(0, 5))
+        )
+        sa_list = rng.choice([f'<ul class="saList">{items}</ul>', f'<ul class="saList other">{items}</ul>', ''])
+        regions.append(f'<li><dl class="globalAreaList"><dt>{trigger}</dt><dd>{sa_list}</dd></dl></li>')
+    html = f'<ul class="areaSelectList">{"".join(regions)}</ul>'
+    if rng.random() < 0.2:
+        html = f'<dl class="globalAreaList"><dt><a data-ga="outside">x</a></dt><dd><ul class="saList"><li><a href="/SA99/">x</a></li></ul></dd></dl>' + html
+    if rng.random() < 0.2:
+        html = html.replace('<ul class="areaSelectList">', '<ul>')
+    return html
+
+
+def chained(html: str, service_area_code: str, middle_area_code: str) -> dict:
+    """Run the three BeautifulSoup extractors on the same page and link their output."""
+    areas = extract_areas_from_html(html)
+    middle = parse_middle_areas(html, service_area_code)
+    small_areas = extract_small_areas_from_select(html, middle_area_code)
+    merge_small_areas(middle, {middle_area_code: small_areas})
+    return {
+        **areas,
+        "service_area_code": service_area_code,
+        "area_name": middle["area_name"],
+        "middle_area": middle["middle_area"],
+        "small_area": small_areas,
+    }
+
+
+def saved_pages(paths: List[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (label, html) for every saved page given on the command line."""
+    for path in paths:
+        files = sorted(glob.glob(os.path.join(path, '**', '*.html'), recursive=True)) if os.path.isdir(path) else [path]
+        for file_path in files:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                yield file_path, f.read()
+
+
+def soup_options(html: str) -> List[Tuple[Optional[str], str]]:
+    """Read every option of html with BeautifulSoup, without any slicing."""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [(option.get('value'), option.get_text(strip=True)) for option in soup.find_all('option')]
+
+
+def page_options(html: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Oracle for the slicing: BeautifulSoup on the whole unsliced page, keeping the
+    options inside a select (or every option when the page has no select).
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    options = soup.find_all('option')
+    if soup.find('select') is not None:
+        options = [option for option in options if option.find_parent('select') is not None]
+    return [(option.get('value'), option.get_text(strip=True)) for option in options]
+
+
+def compare(html: str) -> List[str]:
+    """Return the names of the functions whose two paths disagree on html."""
+    mismatches = []
+    if iter_options(html) != soup_options(html):
+        mismatches.append("iter_options")
+    if read_options(html, fast=False) != page_options(html):
+        mismatches.append("slice_area_selects")
+    if read_options(html, fast=False) != read_options(html, fast=True):
+        mismatches.append("read_options")
+    if parse_middle_areas(html, "SA00", fast=False) != parse_middle_areas(html, "SA00", fast=True):
+        mismatches.append("parse_middle_areas")
+    if extract_small_areas_from_select(html, "Y000", fast=False) != extract_small_areas_from_select(html, "Y000", fast=True):
+        mismatches.append("extract_small_areas_from_select")
+    for middle_area_code in ("Y000", "Y002"):
+        if extract_all_areas(html, "SA00", middle_area_code) != chained(html, "SA00", middle_area_code):
+            mismatches.append("extract_all_areas")
+            break
+    return mismatches
+
+
+def main():
+    """Command line entry point for the differential check."""
+    default_pages = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Doc')]
+    parser = argparse.ArgumentParser(description="Compare the fast option path with BeautifulSoup.")
+    parser.add_argument('pages', nargs='*', default=default_pages, help="Saved pages or directories of pages")
+    parser.add_argument('--cases', type=int, default=500, help="Number of synthetic inputs to generate")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for synthetic inputs")
+    parser.add_argument('--show', type=int, default=3, help="Number of failing synthetic inputs to print")
+    args = parser.parse_args()
+
+    failures = 0
+    checked = 0
+
+    for label, html in saved_pages(args.pages):
+        checked += 1
+        mismatches = compare(html)
+        if mismatches:
+            failures += 1
+            print(f"❌ {label}: {', '.join(mismatches)}")
+
+    rng = random.Random(args.seed)
+    shown = 0
+    for case in range(args.cases):
+        html = random_select(rng)
+        if rng.random() < 0.5:
+            html = random_area_list(rng) + html if rng.random() < 0.5 else html + random_area_list(rng)
+        checked += 1
+        mismatches = compare(html)
+        if mismatches:
+            failures += 1
+            if shown < args.show:
+                shown += 1
+                print(f"❌ synthetic #{case}: {', '.join(mismatches)}\n   {html!r}")
+
+    if failures:
+        print(f"\n❌ {failures} of {checked} inputs differ between the BeautifulSoup and fast paths")
+        return 1
+    print(f"✅ {checked} inputs produce identical output on both paths")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
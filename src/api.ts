@@ -1,26 +1,221 @@
 import axios from 'axios';
+import { cacheKey, type CacheStats, ResponseCache } from './cache.js';
 import { config } from './config.js';
+import { isLogEnabled, logger } from './logger.js';
+import { PersistentCache } from './persistentCache.js';
 
-export async function fetchData(endpoint: string, params: Record<string, string>): Promise<any> {
+const responseCache = new ResponseCache(config.CACHE.MAX_ENTRIES);
+
+const persistentCache = config.CACHE.DIR
+    ? new PersistentCache(config.CACHE.DIR, {
+          maxBytes: config.CACHE.DISK_MAX_BYTES,
+          staleWhileRevalidateMs: config.CACHE.STALE_WHILE_REVALIDATE_MS,
+      })
+    : undefined;
+
+// Keys whose stale disk entry is being refreshed in the background
+const revalidating = new Set<string>();
+
+const isCacheable = (data: any): boolean => !data?.results?.error;
+
+export type ResponseListener = (
+    endpoint: string,
+    params: Record<string, string>,
+    data: any,
+    fetchedAt: number,
+) => void;
+
+const responseListeners: ResponseListener[] = [];
+
+/**
+ * Register a callback for every successful response fetched upstream or read
+ * fresh from the disk cache (memory cache hits were already reported).
+ * fetchedAt is when the data came from the API, also for disk reads.
+ */
+export function addResponseListener(listener: ResponseListener): void {
+    responseListeners.push(listener);
+}
+
+function notifyListeners(endpoint: string, params: Record<string, string>, data: any, fetchedAt: number): void {
+    if (!isCacheable(data)) {
+        return;
+    }
+    for (const listener of responseListeners) {
+        try {
+            listener(endpoint, params, data, fetchedAt);
+        } catch (error) {
+            logger.warn(`Response listener failed for ${endpoint}:`, error);
+        }
+    }
+}
+
+export interface FetchedData {
+    data: any;
+    /** When the data came from the API (earlier than now for cached data) */
+    fetchedAt: number;
+}
+
+export interface FetchOptions {
+    /** Refetch cached data older than this; 0 always calls the API */
+    maxAgeMs?: number;
+}
+
+/**
+ * Fetch an API endpoint, answering repeated calls from the response cache.
+ * Identical concurrent calls share one upstream request.
+ */
+export async function fetchData(
+    endpoint: string,
+    params: Record<string, string>,
+    options: FetchOptions = {},
+): Promise<any> {
+    return (await fetchDataWithTime(endpoint, params, options)).data;
+}
+
+/**
+ * fetchData, also returning when the data was fetched from the API.
+ */
+export async function fetchDataWithTime(
+    endpoint: string,
+    params: Record<string, string>,
+    options: FetchOptions = {},
+): Promise<FetchedData> {
+    const ttlMs = config.CACHE.TTL_MS[endpoint] ?? config.CACHE.DEFAULT_TTL_MS;
+    if (!config.CACHE.ENABLED || ttlMs <= 0) {
+        return requestAndNotify(endpoint, params);
+    }
+
+    // API errors come back with status 200 in results.error; never cache them
+    const key = cacheKey(endpoint, params);
+    const cached = responseCache.get<Fetched>(key);
+    if (cached && isTooOld(cached.fetchedAt, options.maxAgeMs)) {
+        responseCache.delete(key);
+    }
+    return responseCache.getOrFetch(
+        key,
+        // Set by fetchThroughDisk: how long the value stays fresh
+        (fetched) => fetched.ttlMs,
+        () => fetchThroughDisk(key, endpoint, params, ttlMs, options.maxAgeMs),
+        (fetched) => isCacheable(fetched.data),
+    );
+}
+
+interface Fetched extends FetchedData {
+    /** Freshness left on data; 0 for a stale value that must not be cached in memory */
+    ttlMs: number;
+}
+
+function isTooOld(fetchedAt: number, maxAgeMs: number | undefined): boolean {
+    return maxAgeMs !== undefined && Date.now() - fetchedAt >= maxAgeMs;
+}
+
+async function requestAndNotify(endpoint: string, params: Record<string, string>): Promise<FetchedData> {
+    const data = await requestData(endpoint, params);
+    const fetchedAt = Date.now();
+    notifyListeners(endpoint, params, data, fetchedAt);
+    return { data, fetchedAt };
+}
+
+/**
+ * Serve from the on-disk cache when configured: fresh entries directly, stale
+ * entries immediately while a background request refreshes both cache layers.
+ * A value read from disk is only fresh for what is left of its disk TTL, and
+ * entries older than maxAgeMs are skipped.
+ */
+async function fetchThroughDisk(
+    key: string,
+    endpoint: string,
+    params: Record<string, string>,
+    ttlMs: number,
+    maxAgeMs: number | undefined,
+): Promise<Fetched> {
+    if (!persistentCache) {
+        return { ...(await requestAndNotify(endpoint, params)), ttlMs };
+    }
+
+    const stored = await persistentCache.read<any>(key);
+    if (stored && !isTooOld(stored.storedAt, maxAgeMs)) {
+        const fetched = { data: stored.value, fetchedAt: stored.storedAt };
+        if (stored.fresh) {
+            notifyListeners(endpoint, params, fetched.data, fetched.fetchedAt);
+            return { ...fetched, ttlMs: stored.freshForMs };
+        }
+        revalidate(key, endpoint, params, ttlMs);
+        return { ...fetched, ttlMs: 0 };
+    }
+
+    const fetched = await requestAndNotify(endpoint, params);
+    if (isCacheable(fetched.data)) {
+        await persistentCache.write(key, fetched.data, ttlMs);
+    }
+    return { ...fetched, ttlMs };
+}
+
+function revalidate(
+    key: string,
+    endpoint: string,
+    params: Record<string, string>,
+    ttlMs: number,
+): void {
+    if (!persistentCache || revalidating.has(key)) {
+        return;
+    }
+    revalidating.add(key);
+    requestAndNotify(endpoint, params)
+        .then(async (fetched) => {
+            if (isCacheable(fetched.data)) {
+                responseCache.set(key, { ...fetched, ttlMs }, ttlMs);
+                await persistentCache.write(key, fetched.data, ttlMs);
+            }
+        })
+        // The stale value was already served; the next call retries
+        .catch(() => undefined)
+        .finally(() => {
+            revalidating.delete(key);
+        });
+}
+
+/**
+ * Return the error message of an API response, or undefined for a successful one.
+ * The API reports errors with status 200 and results.error: [{ code, message }].
+ */
+export function apiErrorMessage(data: any): string | undefined {
+    const error = data?.results?.error;
+    if (!error) {
+        return undefined;
+    }
+    return Array.isArray(error) ? error.map((e: any) => e.message).join(', ') : String(error);
+}
+
+export function getCacheStats(): CacheStats {
+    return responseCache.stats();
+}
+
+export function clearCache(): void {
+    responseCache.clear();
+}
+
+async function requestData(endpoint: string, params: Record<string, string>): Promise<any> {
     const url = `${config.BASE_URL}${endpoint}`;
 
-    console.log(`Fetching data from URL: ${url} with params:`, params);
+    logger.debug(`Fetching ${url}`, params);
     try {
         // Sample: http://webservice.recruit.co.jp/hotpepper/gourmet/v1/?key=[APIキー]&lat=34.67&lng=135.52&range=5&order=4
         const response = await axios.get(url, { params: { ...params, key: config.API_KEY } });
-        
-        console.log('Response data:', response.data);
-        
+
         if (response.status !== 200) {
             throw new Error(`API request failed with status ${response.status}`);
-        }   
+        }
 
         const data = response.data;
-        console.log('Fetched data:', data);
+        // Serializing a full payload is expensive; only do it when it is printed
+        if (isLogEnabled('debug')) {
+            logger.debug(`Response from ${url}: ${JSON.stringify(data)}`);
+        }
         return data;
 
     } catch (error) {
-        console.error('Error fetching data:', error);
+        logger.error(`Error fetching ${url}:`, error);
         throw error;
     }
 }
@@ -0,0 +1,365 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+
+/**
+ * Read-only views of the area hierarchy built by the Python pipeline in areas/.
+ *
+ * The preferred source is the binary snapshot written by
+ * `python areas/area_snapshot.py export` (format "HPAS", see area_snapshot.py):
+ * nodes are decoded on access, so opening it costs one file read. When no
+ * snapshot exists, the extracted JSON files (hotpepper_areas.json plus the
+ * per-prefecture files) are loaded into memory instead, with the same
+ * precedence rules as AreaIndex.
+ */
+
+export const AREA_LEVELS = [
+  'large_service_area',
+  'service_area',
+  'large_area',
+  'middle_area',
+  'small_area',
+] as const;
+
+export type AreaLevel = (typeof AREA_LEVELS)[number];
+
+export const CONSOLIDATED_FILENAME = 'hotpepper_areas.json';
+
+// Code prefix of each level (e.g. "SA41" is a service area)
+const LEVEL_PREFIXES: [string, AreaLevel][] = [
+  ['SS', 'large_service_area'],
+  ['SA', 'service_area'],
+  ['Z', 'large_area'],
+  ['Y', 'middle_area'],
+  ['X', 'small_area'],
+];
+
+export interface AreaEntry {
+  code: string;
+  name: string;
+  /** Empty when the level is unknown */
+  level: AreaLevel | '';
+  /** Parent code, or null for roots */
+  parent: string | null;
+  childCount: number;
+}
+
+export interface AreaTree {
+  readonly size: number;
+  get(code: string): AreaEntry | undefined;
+  /** Direct children (empty for leaves and unknown codes) */
+  children(code: string): AreaEntry[];
+  roots(): AreaEntry[];
+}
+
+export function levelOf(code: string): AreaLevel | '' {
+  const match = LEVEL_PREFIXES.find(([prefix]) => code.startsWith(prefix));
+  return match ? match[1] : '';
+}
+
+/**
+ * Parent chain of a code, nearest parent first.
+ */
+export function ancestors(tree: AreaTree, code: string): AreaEntry[] {
+  const chain: AreaEntry[] = [];
+  let parent = tree.get(code)?.parent;
+  while (parent) {
+    const node = tree.get(parent);
+    if (!node) {
+      break;
+    }
+    chain.push(node);
+    parent = node.parent;
+  }
+  return chain;
+}
+
+/**
+ * Descendants of a code in depth-first order, optionally only those of a level.
+ */
+export function descendants(tree: AreaTree, code: string, level?: AreaLevel): AreaEntry[] {
+  const found: AreaEntry[] = [];
+  const stack = tree.children(code).reverse();
+  while (stack.length > 0) {
+    const node = stack.pop()!;
+    if (!level || node.level === level) {
+      found.push(node);
+    }
+    // Nothing below the requested level can match
+    if (!level || AREA_LEVELS.indexOf(node.level as AreaLevel) < AREA_LEVELS.indexOf(level)) {
+      stack.push(...tree.children(node.code).reverse());
+    }
+  }
+  return found;
+}
+
+// magic, version, reserved, node_count, string_count,
+// string_offsets_offset, string_data_offset, nodes_offset, code_index_offset
+const HEADER_SIZE = 32;
+// code string id, name string id, level, parent node id (-1 for roots),
+// first child node id, child count
+const NODE_SIZE = 24;
+const SNAPSHOT_MAGIC = 'HPAS';
+const SNAPSHOT_VERSION = 1;
+const NO_PARENT = -1;
+
+/**
+ * AreaTree over a snapshot buffer. Lookups binary search the code index.
+ */
+export class SnapshotAreaTree implements AreaTree {
+  readonly size: number;
+  private readonly stringOffsetsOffset: number;
+  private readonly stringDataOffset: number;
+  private readonly nodesOffset: number;
+  private readonly codeIndexOffset: number;
+
+  constructor(private readonly buffer: Buffer) {
+    if (buffer.length < HEADER_SIZE || buffer.toString('latin1', 0, 4) !== SNAPSHOT_MAGIC) {
+      throw new Error('Not an area snapshot');
+    }
+    const version = buffer.readUInt16LE(4);
+    if (version !== SNAPSHOT_VERSION) {
+      throw new Error(`Unsupported snapshot version ${version}`);
+    }
+    this.size = buffer.readUInt32LE(8);
+    this.stringOffsetsOffset = buffer.readUInt32LE(16);
+    this.stringDataOffset = buffer.readUInt32LE(20);
+    this.nodesOffset = buffer.readUInt32LE(24);
+    this.codeIndexOffset = buffer.readUInt32LE(28);
+  }
+
+  private stringBytes(stringId: number): Buffer {
+    const offset = this.stringOffsetsOffset + 4 * stringId;
+    const start = this.stringDataOffset + this.buffer.readUInt32LE(offset);
+    const end = this.stringDataOffset + this.buffer.readUInt32LE(offset + 4);
+    return this.buffer.subarray(start, end);
+  }
+
+  private codeBytes(nodeId: number): Buffer {
+    return this.stringBytes(this.buffer.readUInt32LE(this.nodesOffset + NODE_SIZE * nodeId));
+  }
+
+  private node(nodeId: number): AreaEntry {
+    const offset = this.nodesOffset + NODE_SIZE * nodeId;
+    const level = this.buffer.readUInt8(offset + 8);
+    const parent = this.buffer.readInt32LE(offset + 12);
+    return {
+      code: this.stringBytes(this.buffer.readUInt32LE(offset)).toString('utf-8'),
+      name: this.stringBytes(this.buffer.readUInt32LE(offset + 4)).toString('utf-8'),
+      level: AREA_LEVELS[level] ?? '',
+      parent: parent === NO_PARENT ? null : this.codeBytes(parent).toString('utf-8'),
+      childCount: this.buffer.readUInt32LE(offset + 20),
+    };
+  }
+
+  private find(code: string): number | undefined {
+    const target = Buffer.from(code, 'utf-8');
+    let low = 0;
+    let high = this.size;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      const nodeId = this.buffer.readUInt32LE(this.codeIndexOffset + 4 * middle);
+      if (Buffer.compare(this.codeBytes(nodeId), target) < 0) {
+        low = middle + 1;
+      } else {
+        high = middle;
+      }
+    }
+    if (low < this.size) {
+      const nodeId = this.buffer.readUInt32LE(this.codeIndexOffset + 4 * low);
+      if (this.codeBytes(nodeId).equals(target)) {
+        return nodeId;
+      }
+    }
+    return undefined;
+  }
+
+  get(code: string): AreaEntry | undefined {
+    const nodeId = this.find(code);
+    return nodeId === undefined ? undefined : this.node(nodeId);
+  }
+
+  children(code: string): AreaEntry[] {
+    const nodeId = this.find(code);
+    if (nodeId === undefined) {
+      return [];
+    }
+    const offset = this.nodesOffset + NODE_SIZE * nodeId;
+    const first = this.buffer.readUInt32LE(offset + 16);
+    const count = this.buffer.readUInt32LE(offset + 20);
+    return Array.from({ length: count }, (_, i) => this.node(first + i));
+  }
+
+  roots(): AreaEntry[] {
+    // Breadth-first order stores every root before the first child
+    const roots: AreaEntry[] = [];
+    for (let nodeId = 0; nodeId < this.size; nodeId++) {
+      const node = this.node(nodeId);
+      if (node.parent !== null) {
+        break;
+      }
+      roots.push(node);
+    }
+    return roots;
+  }
+}
+
+export interface AreaRecord {
+  code: string;
+  name: string;
+  level: AreaLevel | '';
+  parent: string | null;
+}
+
+function parentOf(area: any, level: AreaLevel): string | null {
+  switch (level) {
+    case 'service_area':
+      return area.large_service_area || null;
+    case 'large_area':
+      return area.service_area || null;
+    case 'middle_area':
+      // Z codes sit between SA and Y when the data contains them
+      return area.large_area || area.service_area || null;
+    case 'small_area':
+      return area.middle_area || null;
+    default:
+      return null;
+  }
+}
+
+/**
+ * Flat area records of one extracted JSON file, consolidated
+ * (lists keyed by level) or per-prefecture (service_area_code + nested areas).
+ */
+export function recordsFromAreaData(data: any): AreaRecord[] {
+  const records: AreaRecord[] = [];
+  if (data && 'service_area_code' in data) {
+    for (const middle of data.middle_area ?? []) {
+      records.push({
+        code: middle.code,
+        name: middle.name ?? '',
+        level: 'middle_area',
+        parent: parentOf(middle, 'middle_area') ?? data.service_area_code,
+      });
+      if (Array.isArray(middle.small_area)) {
+        for (const small of middle.small_area) {
+          records.push({
+            code: small.code,
+            name: small.name ?? '',
+            level: 'small_area',
+            parent: parentOf(small, 'small_area') ?? middle.code,
+          });
+        }
+      }
+    }
+    return records;
+  }
+  for (const level of AREA_LEVELS) {
+    const areas = data?.[level];
+    if (!Array.isArray(areas)) {
+      continue;
+    }
+    for (const area of areas) {
+      records.push({
+        code: area.code,
+        name: area.name ?? '',
+        level,
+        parent: parentOf(area, level),
+      });
+    }
+  }
+  return records;
+}
+
+/**
+ * AreaTree built in memory from area records. Later records for a code update
+ * its name and parent, as in AreaIndex.from_records.
+ */
+export class RecordAreaTree implements AreaTree {
+  private readonly nodes = new Map<string, AreaEntry>();
+  private readonly childCodes = new Map<string, string[]>();
+
+  constructor(records: Iterable<AreaRecord>) {
+    const parents = new Map<string, string | null>();
+    for (const record of records) {
+      const node = this.nodes.get(record.code);
+      if (!node) {
+        this.nodes.set(record.code, {
+          code: record.code,
+          name: record.name,
+          level: record.level || levelOf(record.code),
+          parent: null,
+          childCount: 0,
+        });
+      } else if (record.name) {
+        node.name = record.name;
+      }
+      if (record.parent || !parents.has(record.code)) {
+        parents.set(record.code, record.parent);
+      }
+    }
+    // Parents that were never loaded leave the node as a root
+    for (const [code, parent] of parents) {
+      if (parent && this.nodes.has(parent)) {
+        this.nodes.get(code)!.parent = parent;
+        const siblings = this.childCodes.get(parent) ?? [];
+        siblings.push(code);
+        this.childCodes.set(parent, siblings);
+        this.nodes.get(parent)!.childCount = siblings.length;
+      }
+    }
+  }
+
+  get size(): number {
+    return this.nodes.size;
+  }
+
+  get(code: string): AreaEntry | undefined {
+    return this.nodes.get(code);
+  }
+
+  children(code: string): AreaEntry[] {
+    return (this.childCodes.get(code) ?? []).map((child) => this.nodes.get(child)!);
+  }
+
+  roots(): AreaEntry[] {
+    return [...this.nodes.values()].filter((node) => node.parent === null);
+  }
+}
+
+/**
+ * Area JSON files of a directory, the consolidated file first so that
+ * per-prefecture files refine it. Dotfiles (e.g. the resolver's
+ * .area_name_index.json) are skipped, as Python's glob("*.json") does.
+ */
+export async function areaFiles(directory: string): Promise<string[]> {
+  const names = (await fs.readdir(directory))
+    .filter((name) => name.endsWith('.json') && !name.startsWith('.'))
+    .sort();
+  const ordered = names.includes(CONSOLIDATED_FILENAME)
+    ? [CONSOLIDATED_FILENAME, ...names.filter((name) => name !== CONSOLIDATED_FILENAME)]
+    : names;
+  return ordered.map((name) => path.join(directory, name));
+}
+
+/**
+ * Open the area hierarchy: the snapshot when it exists, otherwise the JSON
+ * files of directory.
+ */
+export async function loadAreaTree(snapshotPath: string, directory: string): Promise<AreaTree> {
+  const snapshot = await fs.readFile(snapshotPath).catch((error) => {
+    if (error.code === 'ENOENT') {
+      return undefined;
+    }
+    throw error;
+  });
+  if (snapshot) {
+    return new SnapshotAreaTree(snapshot);
+  }
+
+  const records: AreaRecord[] = [];
+  for (const file of await areaFiles(directory)) {
+    const data = JSON.parse(await fs.readFile(file, 'utf-8'));
+    records.push(...recordsFromAreaData(data));
+  }
+  return new RecordAreaTree(records);
+}
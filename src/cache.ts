@@ -0,0 +1,144 @@
+/**
+ * In-memory response cache for Hot Pepper API calls.
+ *
+ * Entries expire after a per-endpoint TTL, the number of entries is bounded
+ * with LRU eviction (a Map keeps insertion order, so the first key is the least
+ * recently used), and concurrent requests for the same key share one upstream
+ * call.
+ */
+
+export interface CacheStats {
+  hits: number;
+  misses: number;
+  coalesced: number;
+  evictions: number;
+  size: number;
+}
+
+interface CacheEntry {
+  value: unknown;
+  expiresAt: number;
+}
+
+/**
+ * Build a cache key from an endpoint and its query parameters.
+ * Parameters are sorted, values trimmed, and empty values and the API key dropped,
+ * so equivalent calls map to the same key.
+ */
+export function cacheKey(endpoint: string, params: Record<string, string>): string {
+  const query = Object.keys(params)
+    .filter((name) => name !== 'key')
+    .sort()
+    .map((name) => [name, String(params[name] ?? '').trim()] as const)
+    .filter(([, value]) => value !== '')
+    .map(([name, value]) => `${encodeURIComponent(name)}=${encodeURIComponent(value)}`)
+    .join('&');
+  return `${endpoint}?${query}`;
+}
+
+export class ResponseCache {
+  private readonly entries = new Map<string, CacheEntry>();
+  private readonly inFlight = new Map<string, Promise<unknown>>();
+  private hits = 0;
+  private misses = 0;
+  private coalesced = 0;
+  private evictions = 0;
+
+  constructor(
+    private readonly maxEntries: number,
+    private readonly now: () => number = Date.now,
+  ) {}
+
+  /**
+   * Return a fresh cached value and mark it as recently used.
+   */
+  get<T>(key: string): T | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+    if (entry.expiresAt <= this.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+    // Re-insert to move the key to the most recently used end
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value as T;
+  }
+
+  set(key: string, value: unknown, ttlMs: number): void {
+    if (ttlMs <= 0 || this.maxEntries <= 0) {
+      return;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: this.now() + ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+      this.evictions++;
+    }
+  }
+
+  /**
+   * Return the cached value for a key, or run the fetcher once for all
+   * concurrent callers of that key and cache its result.
+   *
+   * @param key Key from cacheKey()
+   * @param ttlMs Time to live of the fetched value, or a function of the value
+   *   (e.g. the freshness left on a value read from another cache); values
+   *   with a TTL of 0 or less are not stored
+   * @param fetcher Upstream call
+   * @param isCacheable Decides whether a fetched value may be stored (e.g. not API errors)
+   */
+  async getOrFetch<T>(
+    key: string,
+    ttlMs: number | ((value: T) => number),
+    fetcher: () => Promise<T>,
+    isCacheable: (value: T) => boolean = () => true,
+  ): Promise<T> {
+    const cached = this.get<T>(key);
+    if (cached !== undefined) {
+      this.hits++;
+      return cached;
+    }
+
+    const pending = this.inFlight.get(key);
+    if (pending) {
+      this.coalesced++;
+      return pending as Promise<T>;
+    }
+
+    this.misses++;
+    const request = fetcher()
+      .then((value) => {
+        if (isCacheable(value)) {
+          this.set(key, value, typeof ttlMs === 'function' ? ttlMs(value) : ttlMs);
+        }
+        return value;
+      })
+      .finally(() => {
+        this.inFlight.delete(key);
+      });
+    this.inFlight.set(key, request);
+    return request;
+  }
+
+  delete(key: string): boolean {
+    return this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  stats(): CacheStats {
+    return {
+      hits: this.hits,
+      misses: this.misses,
+      coalesced: this.coalesced,
+      evictions: this.evictions,
+      size: this.entries.size,
+    };
+  }
+}
@@ -4,19 +4,71 @@ import path from 'path';
 // Load environment variables from .env file
 dotenv.config({ path: path.resolve(__dirname, '../.env') });
 
+const END_POINT = {
+    GOURMET: '/gourmet/v1/',
+    SHOP: '/shop/v1/',
+    BUDGET: '/budget/v1/',
+    LARGE_SERVICE_AREA: '/large_service_area/v1/',
+    SERVICE_AREA: '/service_area/v1/',
+    LARGE_AREA: '/large_area/v1/',
+    MIDDLE_AREA: '/middle_area/v1/',
+    SMALL_AREA: '/small_area/v1/',
+} as const;
+
+const AREAS_DIR = process.env.HOTPEPPER_AREAS_DIR || path.resolve(__dirname, '../areas');
+
+const MINUTE_MS = 60 * 1000;
+const DAY_MS = 24 * 60 * MINUTE_MS;
+
 export const config = {
     API_KEY: process.env.HOTPEPPER_API_KEY || '',
     BASE_URL: 'http://webservice.recruit.co.jp/hotpepper',
-    END_POINT: {
-        GOURMET: '/gourmet/v1/',
-        SHOP: '/shop/v1/',
-        BUDGET: '/budget/v1/',
-        LARGE_SERVICE_AREA: '/large_service_area/v1/',
-        SERVICE_AREA: '/service_area/v1/',
-        LARGE_AREA: '/large_area/v1/',
-        MIDDLE_AREA: '/middle_area/v1/',
-        SMALL_AREA: '/small_area/v1/',
-    }
+    END_POINT,
+    CACHE: {
+        // Set HOTPEPPER_CACHE=off to send every call upstream
+        ENABLED: process.env.HOTPEPPER_CACHE !== 'off',
+        MAX_ENTRIES: Number(process.env.HOTPEPPER_CACHE_MAX_ENTRIES) || 500,
+        DEFAULT_TTL_MS: 5 * MINUTE_MS,
+        // Master data rarely changes; shop and gourmet results change more often
+        TTL_MS: {
+            [END_POINT.GOURMET]: 5 * MINUTE_MS,
+            [END_POINT.SHOP]: 5 * MINUTE_MS,
+            [END_POINT.BUDGET]: DAY_MS,
+            [END_POINT.LARGE_SERVICE_AREA]: DAY_MS,
+            [END_POINT.SERVICE_AREA]: DAY_MS,
+            [END_POINT.LARGE_AREA]: DAY_MS,
+            [END_POINT.MIDDLE_AREA]: DAY_MS,
+            [END_POINT.SMALL_AREA]: DAY_MS,
+        } as Record<string, number>,
+        // Set HOTPEPPER_CACHE_DIR to share responses across server processes on disk
+        DIR: process.env.HOTPEPPER_CACHE_DIR || '',
+        DISK_MAX_BYTES: Number(process.env.HOTPEPPER_CACHE_MAX_BYTES) || 50 * 1024 * 1024,
+        // Expired disk entries are served for this long while they are refreshed
+        STALE_WHILE_REVALIDATE_MS: 60 * MINUTE_MS,
+    },
+    PAGING: {
+        // The gourmet API returns at most 100 shops per page
+        PAGE_SIZE: 100,
+        // Pages requested in parallel when collecting every result
+        CONCURRENCY: Number(process.env.HOTPEPPER_PAGE_CONCURRENCY) || 4,
+        // Upper bound for an "all results" search
+        MAX_RESULTS: Number(process.env.HOTPEPPER_MAX_RESULTS) || 1000,
+    },
+    GEO: {
+        // About 1.1 km north-south; a 3 km search visits roughly 7 x 8 cells
+        CELL_DEGREES: 0.01,
+        // Nearby searches are answered locally from shops fetched this recently
+        FRESHNESS_MS: Number(process.env.HOTPEPPER_GEO_FRESHNESS_MS) || 5 * MINUTE_MS,
+        MAX_SHOPS: 50000,
+    },
+    AREAS: {
+        // Extracted area JSON files, used when no snapshot has been exported
+        DIR: AREAS_DIR,
+        // Written by `python areas/area_snapshot.py export`
+        SNAPSHOT_PATH: process.env.HOTPEPPER_AREA_SNAPSHOT || path.join(AREAS_DIR, 'hotpepper_areas.snapshot'),
+        // Rendered area resource bodies kept in memory
+        BODY_CACHE_ENTRIES: 1000,
+    },
 
 } as const;
 
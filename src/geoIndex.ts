@@ -0,0 +1,303 @@
+/**
+ * In-memory spatial index over shops returned by the gourmet API.
+ *
+ * Shops are bucketed into a fixed lat/lng grid, so a radius query only visits
+ * the cells overlapping the circle's bounding box. Besides the shops, the index
+ * records covered regions: circles for which a location search returned every
+ * matching shop. A radius query is answered locally only inside a fresh
+ * covered region, because outside one a missing shop cannot be told apart
+ * from one that was never fetched.
+ *
+ * Shops and regions carry the time their response came from the API (not when
+ * it was read from a cache), so freshness checks see the real age of the data.
+ */
+
+const EARTH_RADIUS_M = 6_371_008.8;
+const METERS_PER_DEGREE_LAT = 111_320;
+
+// Query parameters that do not narrow a location search
+const LOCATION_PARAMS = new Set([
+  'lat',
+  'lng',
+  'range',
+  'datum',
+  'start',
+  'count',
+  'format',
+  'order',
+]);
+
+// Search radius of the API's range parameter (1-5)
+export const RANGE_METERS: Record<number, number> = { 1: 300, 2: 500, 3: 1000, 4: 2000, 5: 3000 };
+
+export interface GeoIndexOptions {
+  /** Grid cell size in degrees */
+  cellDegrees: number;
+  /** Default maximum age of shops and covered regions used to answer a query */
+  freshnessMs: number;
+  /** Upper bound for the number of indexed shops */
+  maxShops: number;
+  /** Applied to every shop before it is stored, e.g. a compact projection */
+  project?: (shop: any) => any;
+}
+
+export interface NearbyShop {
+  shop: any;
+  distanceM: number;
+}
+
+export interface GeoIndexStats {
+  shops: number;
+  cells: number;
+  regions: number;
+}
+
+interface Entry {
+  shop: any;
+  lat: number;
+  lng: number;
+  cell: string;
+  fetchedAt: number;
+}
+
+interface Region {
+  lat: number;
+  lng: number;
+  radiusM: number;
+  fetchedAt: number;
+}
+
+/**
+ * Great-circle distance in meters (haversine).
+ */
+export function distanceMeters(lat1: number, lng1: number, lat2: number, lng2: number): number {
+  const toRad = Math.PI / 180;
+  const dLat = (lat2 - lat1) * toRad;
+  const dLng = (lng2 - lng1) * toRad;
+  const a =
+    Math.sin(dLat / 2) ** 2 +
+    Math.cos(lat1 * toRad) * Math.cos(lat2 * toRad) * Math.sin(dLng / 2) ** 2;
+  return 2 * EARTH_RADIUS_M * Math.asin(Math.min(1, Math.sqrt(a)));
+}
+
+export class GeoIndex {
+  private readonly entries = new Map<string, Entry>();
+  private readonly cells = new Map<string, Set<string>>();
+  private regions: Region[] = [];
+
+  constructor(
+    private readonly options: GeoIndexOptions,
+    private readonly now: () => number = Date.now,
+  ) {}
+
+  private cellOf(lat: number, lng: number): string {
+    const size = this.options.cellDegrees;
+    return `${Math.floor(lat / size)}:${Math.floor(lng / size)}`;
+  }
+
+  /**
+   * Add or refresh shops. Shops without a usable lat/lng are skipped.
+   */
+  add(shops: readonly any[], fetchedAt: number = this.now()): void {
+    for (const shop of shops) {
+      const lat = Number(shop?.lat);
+      const lng = Number(shop?.lng);
+      if (!shop?.id || !Number.isFinite(lat) || !Number.isFinite(lng)) {
+        continue;
+      }
+      this.remove(shop.id);
+      const cell = this.cellOf(lat, lng);
+      const stored = this.options.project ? this.options.project(shop) : shop;
+      this.entries.set(shop.id, { shop: stored, lat, lng, cell, fetchedAt });
+      let members = this.cells.get(cell);
+      if (!members) {
+        members = new Set();
+        this.cells.set(cell, members);
+      }
+      members.add(shop.id);
+    }
+    if (this.entries.size > this.options.maxShops) {
+      this.evict();
+    }
+  }
+
+  private remove(id: string): void {
+    const entry = this.entries.get(id);
+    if (!entry) {
+      return;
+    }
+    this.entries.delete(id);
+    const members = this.cells.get(entry.cell);
+    members?.delete(id);
+    if (members?.size === 0) {
+      this.cells.delete(entry.cell);
+    }
+  }
+
+  private evict(): void {
+    this.prune();
+    if (this.entries.size <= this.options.maxShops) {
+      return;
+    }
+    // Map order is update order, so the first entries are the oldest
+    for (const id of this.entries.keys()) {
+      if (this.entries.size <= this.options.maxShops) {
+        break;
+      }
+      this.remove(id);
+    }
+    // A region with evicted shops is no longer complete
+    this.regions = [];
+  }
+
+  /**
+   * Record that every shop within radiusM of the point was fetched at fetchedAt.
+   */
+  markCovered(lat: number, lng: number, radiusM: number, fetchedAt: number = this.now()): void {
+    const region = { lat, lng, radiusM, fetchedAt };
+    const oldest = this.now() - this.options.freshnessMs;
+    if (fetchedAt < oldest) {
+      return;
+    }
+    // Drop expired regions and older ones the new one contains; they carry no extra information
+    this.regions = this.regions.filter(
+      (other) =>
+        other.fetchedAt >= oldest &&
+        !(other.fetchedAt <= fetchedAt && this.contains(region, other)),
+    );
+    this.regions.push(region);
+  }
+
+  private contains(outer: Region, inner: { lat: number; lng: number; radiusM: number }): boolean {
+    const centers = distanceMeters(outer.lat, outer.lng, inner.lat, inner.lng);
+    return centers + inner.radiusM <= outer.radiusM;
+  }
+
+  /**
+   * True when the circle lies inside a covered region fetched within maxAgeMs.
+   */
+  isCovered(
+    lat: number,
+    lng: number,
+    radiusM: number,
+    maxAgeMs: number = this.options.freshnessMs,
+  ): boolean {
+    const oldest = this.now() - maxAgeMs;
+    return this.regions.some(
+      (region) => region.fetchedAt >= oldest && this.contains(region, { lat, lng, radiusM }),
+    );
+  }
+
+  /**
+   * Indexed shops within radiusM of the point, nearest first. Only shops
+   * fetched within maxAgeMs are returned; call isCovered() to know whether the
+   * list is complete.
+   */
+  withinRadius(
+    lat: number,
+    lng: number,
+    radiusM: number,
+    maxAgeMs: number = this.options.freshnessMs,
+  ): NearbyShop[] {
+    const size = this.options.cellDegrees;
+    const dLat = radiusM / METERS_PER_DEGREE_LAT;
+    const cosLat = Math.max(Math.cos((lat * Math.PI) / 180), 1e-6);
+    const dLng = radiusM / (METERS_PER_DEGREE_LAT * cosLat);
+    const oldest = this.now() - maxAgeMs;
+
+    const found: NearbyShop[] = [];
+    for (let i = Math.floor((lat - dLat) / size); i <= Math.floor((lat + dLat) / size); i++) {
+      for (let j = Math.floor((lng - dLng) / size); j <= Math.floor((lng + dLng) / size); j++) {
+        const members = this.cells.get(`${i}:${j}`);
+        if (!members) {
+          continue;
+        }
+        for (const id of members) {
+          const entry = this.entries.get(id)!;
+          if (entry.fetchedAt < oldest) {
+            continue;
+          }
+          const distanceM = distanceMeters(lat, lng, entry.lat, entry.lng);
+          if (distanceM <= radiusM) {
+            found.push({ shop: entry.shop, distanceM });
+          }
+        }
+      }
+    }
+    return found.sort((a, b) => a.distanceM - b.distanceM);
+  }
+
+  /**
+   * The n nearest shops within radiusM, or undefined when the index cannot
+   * guarantee them: either the whole circle is covered, or the circle out to
+   * the n-th nearest indexed shop is.
+   */
+  nearest(
+    lat: number,
+    lng: number,
+    n: number,
+    radiusM: number,
+    maxAgeMs: number = this.options.freshnessMs,
+  ): NearbyShop[] | undefined {
+    const candidates = this.withinRadius(lat, lng, radiusM, maxAgeMs);
+    if (this.isCovered(lat, lng, radiusM, maxAgeMs)) {
+      return candidates.slice(0, n);
+    }
+    if (candidates.length >= n && this.isCovered(lat, lng, candidates[n - 1].distanceM, maxAgeMs)) {
+      return candidates.slice(0, n);
+    }
+    return undefined;
+  }
+
+  /**
+   * Index the shops of a gourmet API response fetched at fetchedAt. A first
+   * page that holds every result of a plain location search (lat/lng/range and
+   * no other conditions) also marks its circle as covered.
+   */
+  addResponse(params: Record<string, string>, data: any, fetchedAt: number = this.now()): void {
+    // Shops are indexed in world coordinates only
+    if (params.datum && params.datum !== 'world') {
+      return;
+    }
+    const results = data?.results;
+    const shops = results?.shop;
+    if (!Array.isArray(shops)) {
+      return;
+    }
+    this.add(shops, fetchedAt);
+
+    const lat = Number(params.lat);
+    const lng = Number(params.lng);
+    const radiusM = RANGE_METERS[Number(params.range ?? 3)];
+    const plain = Object.keys(params).every((name) => LOCATION_PARAMS.has(name));
+    const complete =
+      Number(params.start ?? 1) === 1 &&
+      Number(results.results_returned) >= Number(results.results_available);
+    if (plain && complete && Number.isFinite(lat) && Number.isFinite(lng) && radiusM) {
+      this.markCovered(lat, lng, radiusM, fetchedAt);
+    }
+  }
+
+  /**
+   * Drop shops and covered regions older than the freshness window.
+   */
+  prune(): void {
+    const oldest = this.now() - this.options.freshnessMs;
+    for (const [id, entry] of this.entries) {
+      if (entry.fetchedAt < oldest) {
+        this.remove(id);
+      }
+    }
+    this.regions = this.regions.filter((region) => region.fetchedAt >= oldest);
+  }
+
+  clear(): void {
+    this.entries.clear();
+    this.cells.clear();
+    this.regions = [];
+  }
+
+  stats(): GeoIndexStats {
+    return { shops: this.entries.size, cells: this.cells.size, regions: this.regions.length };
+  }
+}
@@ -1,24 +1,41 @@
 import { McpError, ErrorCode } from "@modelcontextprotocol/sdk/types.js";
-import { handleSearchById } from "./tools/index.js";
-import { SEARCH_GOURMET_BY_ANY, SEARCH_GOURMET_BY_ID, SEARCH_GOURMET_BY_NAME,SEARCH_GOURMET_BY_NAME_KANA, SEARCH_GOURMET_BY_TEL } from "./tools/index.js";
+import { logger } from "./logger.js";
+import {
+    handleSearchByAny,
+    handleSearchById,
+    handleSearchByIds,
+    handleSearchByName,
+    handleSearchByNameKana,
+    handleSearchByTel,
+    handleSearchByArea,
+    handleSearchNearby,
+    type ToolContext,
+} from "./tools/index.js";
+import { SEARCH_GOURMET_BY_ANY, SEARCH_GOURMET_BY_AREA, SEARCH_GOURMET_BY_ID, SEARCH_GOURMET_BY_IDS, SEARCH_GOURMET_BY_NAME,SEARCH_GOURMET_BY_NAME_KANA, SEARCH_GOURMET_BY_TEL, SEARCH_GOURMET_NEARBY } from "./tools/index.js";
 /**
  * Dispatch tools on request
  */
 
-export async function handleToolCall(toolName: string, params: any): Promise<any> {
-    console.log(`Handling tool call for: ${toolName} with params:`, params);
+export async function handleToolCall(toolName: string, params: any, context: ToolContext = {}): Promise<any> {
+    logger.debug(`Handling tool call for: ${toolName} with params:`, params);
     // Dispatch based on tool name
     switch (toolName) {
         case SEARCH_GOURMET_BY_ID.name:
             return await handleSearchById(params);
+        case SEARCH_GOURMET_BY_IDS.name:
+            return await handleSearchByIds(params);
         case SEARCH_GOURMET_BY_NAME.name:
-            return await handleSearchByName(params);
+            return await handleSearchByName(params, context);
         case SEARCH_GOURMET_BY_NAME_KANA.name:
-            return await handleSearchByNameKana(params);
+            return await handleSearchByNameKana(params, context);
         case SEARCH_GOURMET_BY_ANY.name:
-            return await handleSearchByAny(params);
+            return await handleSearchByAny(params, context);
         case SEARCH_GOURMET_BY_TEL.name:
-            return await handleSearchByTel(params);
+            return await handleSearchByTel(params, context);
+        case SEARCH_GOURMET_BY_AREA.name:
+            return await handleSearchByArea(params, context);
+        case SEARCH_GOURMET_NEARBY.name:
+            return await handleSearchNearby(params);
         default:
             throw new McpError(ErrorCode.MethodNotFound, `Unknown tool: ${toolName}`);
     }
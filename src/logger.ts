@@ -0,0 +1,43 @@
+/**
+ * Level-gated logger.
+ *
+ * Everything goes to stderr: stdout carries the MCP stdio transport, so a
+ * stray console.log there corrupts the protocol stream. Payload dumps belong at
+ * debug, which is off by default; set HOTPEPPER_LOG_LEVEL=debug to see them.
+ */
+
+export const LOG_LEVELS = ['debug', 'info', 'warn', 'error', 'silent'] as const;
+
+export type LogLevel = (typeof LOG_LEVELS)[number];
+
+function parseLevel(value: string | undefined): LogLevel {
+  const level = (value ?? '').toLowerCase();
+  return (LOG_LEVELS as readonly string[]).includes(level) ? (level as LogLevel) : 'info';
+}
+
+let threshold = LOG_LEVELS.indexOf(parseLevel(process.env.HOTPEPPER_LOG_LEVEL));
+
+export function setLogLevel(level: LogLevel): void {
+  threshold = LOG_LEVELS.indexOf(level);
+}
+
+/**
+ * True when messages at level are written. Check it before building an
+ * expensive message (e.g., serializing a payload).
+ */
+export function isLogEnabled(level: Exclude<LogLevel, 'silent'>): boolean {
+  return LOG_LEVELS.indexOf(level) >= threshold;
+}
+
+function write(level: Exclude<LogLevel, 'silent'>, message: string, args: unknown[]): void {
+  if (isLogEnabled(level)) {
+    console.error(`[${level}] ${message}`, ...args);
+  }
+}
+
+export const logger = {
+  debug: (message: string, ...args: unknown[]) => write('debug', message, args),
+  info: (message: string, ...args: unknown[]) => write('info', message, args),
+  warn: (message: string, ...args: unknown[]) => write('warn', message, args),
+  error: (message: string, ...args: unknown[]) => write('error', message, args),
+};
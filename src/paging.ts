@@ -0,0 +1,141 @@
+import { ErrorCode, McpError } from '@modelcontextprotocol/sdk/types.js';
+import { apiErrorMessage, fetchDataWithTime, type FetchedData } from './api.js';
+import { mapWithConcurrency } from './concurrency.js';
+import { config } from './config.js';
+
+/**
+ * Collect every page of a paged search (gourmet and similar endpoints).
+ *
+ * The first page reports results_available; the remaining pages are then
+ * requested in parallel (at most `concurrency` at a time) instead of walking
+ * start=1, 101, 201, ... one round trip after another. Shops are
+ * de-duplicated by id, since results can shift between pages while they are
+ * being fetched.
+ */
+
+export interface PageUpdate {
+  /** Shops from this page that were not seen on an earlier page (projected) */
+  shops: any[];
+  /** Unique shops received so far */
+  received: number;
+  /** Number of shops the search will return (results_available, capped) */
+  total: number;
+}
+
+export interface FetchAllPagesOptions {
+  /** Maximum number of shops to collect */
+  maxResults?: number;
+  /** Maximum number of pages in flight */
+  concurrency?: number;
+  /** Refetch cached pages older than this (see FetchOptions) */
+  maxAgeMs?: number;
+  /** Applied once to every unique shop before it is streamed or returned */
+  project?: (shop: any) => any;
+  /** Called per page as it arrives, in arrival order; skipped when the page has no new shops */
+  onPage?: (update: PageUpdate) => void | Promise<void>;
+}
+
+export interface AllPagesResult {
+  /** results_available reported by the API */
+  resultsAvailable: number;
+  /** Unique (projected) shops in page order */
+  shops: any[];
+  /** True when maxResults cut the result set short */
+  truncated: boolean;
+  /** When the oldest page was fetched from the API (pages may come from the cache) */
+  fetchedAt: number;
+}
+
+/**
+ * Start positions and page sizes for results 1..limit after the first page.
+ */
+export function remainingPages(
+  limit: number,
+  pageSize: number,
+): { start: number; count: number }[] {
+  const pages: { start: number; count: number }[] = [];
+  for (let start = pageSize + 1; start <= limit; start += pageSize) {
+    pages.push({ start, count: Math.min(pageSize, limit - start + 1) });
+  }
+  return pages;
+}
+
+async function fetchPage(
+  endpoint: string,
+  params: Record<string, string>,
+  start: number,
+  count: number,
+  maxAgeMs: number | undefined,
+): Promise<FetchedData> {
+  const fetched = await fetchDataWithTime(
+    endpoint,
+    { ...params, start: String(start), count: String(count), format: 'json' },
+    { maxAgeMs },
+  );
+  const error = apiErrorMessage(fetched.data);
+  if (error) {
+    throw new McpError(ErrorCode.InternalError, `Hot Pepper API error: ${error}`);
+  }
+  return fetched;
+}
+
+/**
+ * Fetch every result of a search.
+ *
+ * @param endpoint Endpoint path (e.g., config.END_POINT.GOURMET)
+ * @param params Search parameters, without start/count/format
+ */
+export async function fetchAllPages(
+  endpoint: string,
+  params: Record<string, string>,
+  options: FetchAllPagesOptions = {},
+): Promise<AllPagesResult> {
+  const pageSize = config.PAGING.PAGE_SIZE;
+  const maxResults = options.maxResults ?? config.PAGING.MAX_RESULTS;
+  const concurrency = options.concurrency ?? config.PAGING.CONCURRENCY;
+  const project = options.project ?? ((shop: any) => shop);
+
+  // Unique shops by id, projected once when first seen
+  const seen = new Map<string, any>();
+  let total = 0;
+  const accept = async (shops: any[]): Promise<void> => {
+    const fresh: any[] = [];
+    for (const shop of shops) {
+      if (!seen.has(shop.id)) {
+        const projected = project(shop);
+        seen.set(shop.id, projected);
+        fresh.push(projected);
+      }
+    }
+    if (fresh.length > 0) {
+      await options.onPage?.({ shops: fresh, received: seen.size, total });
+    }
+  };
+
+  const first = await fetchPage(
+    endpoint,
+    params,
+    1,
+    Math.min(pageSize, maxResults),
+    options.maxAgeMs,
+  );
+  let fetchedAt = first.fetchedAt;
+  const resultsAvailable = Number(first.data.results?.results_available) || 0;
+  const limit = Math.min(resultsAvailable, maxResults);
+  total = limit;
+  const pages: any[][] = [first.data.results?.shop ?? []];
+  await accept(pages[0]);
+
+  const rest = remainingPages(limit, pageSize);
+  await mapWithConcurrency(rest, concurrency, async ({ start, count }, index) => {
+    const page = await fetchPage(endpoint, params, start, count, options.maxAgeMs);
+    fetchedAt = Math.min(fetchedAt, page.fetchedAt);
+    pages[index + 1] = page.data.results?.shop ?? [];
+    await accept(pages[index + 1]);
+  });
+
+  // Merge in page order so the final list matches the API's sort order
+  const ids = new Set(pages.flat().map((shop) => shop.id as string));
+  const shops = [...ids].map((id) => seen.get(id));
+  return { resultsAvailable, shops, truncated: resultsAvailable > limit, fetchedAt };
+}
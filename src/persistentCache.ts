@@ -0,0 +1,170 @@
+import crypto from 'crypto';
+import { promises as fs } from 'fs';
+import path from 'path';
+
+/**
+ * Content-addressed on-disk response cache shared by every server process.
+ *
+ * Each entry is one JSON file named after the SHA-256 of its cache key
+ * (<dir>/ab/abcdef....json) and written atomically (temp file + rename), so
+ * concurrent processes never read partial entries. Entries are fresh until
+ * their TTL, then may still be served as stale for a revalidation window while
+ * the caller refreshes them. The file mtime is set to the end of that window,
+ * so pruning can drop expired entries and enforce the size cap from stat alone.
+ */
+
+export interface PersistentCacheOptions {
+  /** Upper bound for the total size of the cache files */
+  maxBytes: number;
+  /** How long an expired entry may still be served while it is refreshed */
+  staleWhileRevalidateMs: number;
+  /** Minimum time between two prune passes */
+  pruneIntervalMs?: number;
+}
+
+export interface StoredResponse<T> {
+  value: T;
+  /** False when the entry is past its TTL but inside the revalidation window */
+  fresh: boolean;
+  /** Time left until the entry stops being fresh (0 when it is stale) */
+  freshForMs: number;
+  /** When the entry was written, i.e. when its value was fetched */
+  storedAt: number;
+}
+
+interface EntryFile {
+  key: string;
+  storedAt: number;
+  freshUntil: number;
+  staleUntil: number;
+  value: unknown;
+}
+
+export class PersistentCache {
+  private lastPrune = 0;
+  private pruning: Promise<void> | undefined;
+
+  constructor(
+    private readonly directory: string,
+    private readonly options: PersistentCacheOptions,
+    private readonly now: () => number = Date.now,
+  ) {}
+
+  private pathFor(key: string): string {
+    const digest = crypto.createHash('sha256').update(key).digest('hex');
+    return path.join(this.directory, digest.slice(0, 2), `${digest}.json`);
+  }
+
+  /**
+   * Read an entry; returns undefined when it is missing, unreadable or past
+   * its revalidation window.
+   */
+  async read<T>(key: string): Promise<StoredResponse<T> | undefined> {
+    const file = this.pathFor(key);
+    let entry: EntryFile;
+    try {
+      entry = JSON.parse(await fs.readFile(file, 'utf-8'));
+    } catch {
+      return undefined;
+    }
+    // Guard against hash collisions and foreign files
+    if (entry.key !== key) {
+      return undefined;
+    }
+    const now = this.now();
+    if (entry.staleUntil <= now) {
+      await fs.rm(file, { force: true }).catch(() => undefined);
+      return undefined;
+    }
+    const freshForMs = Math.max(0, entry.freshUntil - now);
+    return { value: entry.value as T, fresh: freshForMs > 0, freshForMs, storedAt: entry.storedAt };
+  }
+
+  /**
+   * Store a value for ttlMs (plus the revalidation window).
+   * Failures are swallowed: the disk cache must never break a request.
+   */
+  async write(key: string, value: unknown, ttlMs: number): Promise<void> {
+    if (ttlMs <= 0) {
+      return;
+    }
+    const file = this.pathFor(key);
+    const now = this.now();
+    const entry: EntryFile = {
+      key,
+      storedAt: now,
+      freshUntil: now + ttlMs,
+      staleUntil: now + ttlMs + this.options.staleWhileRevalidateMs,
+      value,
+    };
+    const temp = `${file}.${process.pid}.${crypto.randomBytes(4).toString('hex')}.tmp`;
+    try {
+      await fs.mkdir(path.dirname(file), { recursive: true });
+      await fs.writeFile(temp, JSON.stringify(entry), 'utf-8');
+      const expires = new Date(entry.staleUntil);
+      await fs.utimes(temp, expires, expires);
+      await fs.rename(temp, file);
+    } catch {
+      await fs.rm(temp, { force: true }).catch(() => undefined);
+      return;
+    }
+    this.schedulePrune();
+  }
+
+  private schedulePrune(): void {
+    const interval = this.options.pruneIntervalMs ?? 60_000;
+    if (this.pruning || this.now() - this.lastPrune < interval) {
+      return;
+    }
+    this.lastPrune = this.now();
+    this.pruning = this.prune()
+      .catch(() => undefined)
+      .finally(() => {
+        this.pruning = undefined;
+      });
+  }
+
+  /**
+   * Delete expired entries, then the entries closest to expiry until the
+   * cache fits in maxBytes.
+   */
+  async prune(): Promise<void> {
+    const now = this.now();
+    const files: { file: string; size: number; expires: number }[] = [];
+    let total = 0;
+
+    const shards = await fs.readdir(this.directory).catch(() => [] as string[]);
+    for (const shard of shards) {
+      const shardPath = path.join(this.directory, shard);
+      const names = await fs.readdir(shardPath).catch(() => [] as string[]);
+      for (const name of names) {
+        if (!name.endsWith('.json')) {
+          continue;
+        }
+        const file = path.join(shardPath, name);
+        const stat = await fs.stat(file).catch(() => undefined);
+        if (!stat) {
+          continue;
+        }
+        if (stat.mtimeMs <= now) {
+          await fs.rm(file, { force: true }).catch(() => undefined);
+          continue;
+        }
+        files.push({ file, size: stat.size, expires: stat.mtimeMs });
+        total += stat.size;
+      }
+    }
+
+    if (total <= this.options.maxBytes) {
+      return;
+    }
+    files.sort((a, b) => a.expires - b.expires);
+    for (const { file, size } of files) {
+      if (total <= this.options.maxBytes) {
+        break;
+      }
+      await fs.rm(file, { force: true }).catch(() => undefined);
+      total -= size;
+    }
+  }
+}
@@ -0,0 +1,122 @@
+/**
+ * Field projection for API results.
+ *
+ * Shop objects carry photos, coupon URLs and nested genre/budget blocks that a
+ * caller rarely needs. A projection keeps only the requested dotted paths
+ * (e.g. "budget.average"), so unused data is dropped before serialization.
+ * Arrays are projected element by element, and paths that do not exist are
+ * skipped.
+ */
+
+type ProjectionTree = Map<string, ProjectionTree | true>;
+
+export type Projection = (value: any) => any;
+
+// A small shop summary: identity, location and price range
+export const COMPACT_SHOP_FIELDS = [
+  'id',
+  'name',
+  'address',
+  'lat',
+  'lng',
+  'budget.name',
+  'budget.average',
+  'genre.name',
+  'urls.pc',
+] as const;
+
+const identity: Projection = (value) => value;
+
+function buildTree(fields: readonly string[]): ProjectionTree {
+  const root: ProjectionTree = new Map();
+  for (const field of fields) {
+    const parts = field.split('.').filter((part) => part !== '');
+    let node = root;
+    for (let i = 0; i < parts.length; i++) {
+      const existing = node.get(parts[i]);
+      // An ancestor that is kept whole already covers this path
+      if (existing === true) {
+        break;
+      }
+      if (i === parts.length - 1) {
+        node.set(parts[i], true);
+        break;
+      }
+      let child = existing;
+      if (!child) {
+        child = new Map();
+        node.set(parts[i], child);
+      }
+      node = child;
+    }
+  }
+  return root;
+}
+
+function applyTree(value: any, tree: ProjectionTree): any {
+  if (Array.isArray(value)) {
+    return value.map((item) => applyTree(item, tree));
+  }
+  if (value === null || typeof value !== 'object') {
+    return value;
+  }
+  const result: Record<string, unknown> = {};
+  for (const [key, child] of tree) {
+    if (!(key in value)) {
+      continue;
+    }
+    result[key] = child === true ? value[key] : applyTree(value[key], child);
+  }
+  return result;
+}
+
+/**
+ * Compile a list of dotted field paths into a projection function.
+ * The field list is parsed once, so apply the result to every shop of a call.
+ *
+ * @param fields Paths to keep (e.g., ['id', 'name', 'budget.average']);
+ *     undefined or empty keeps everything
+ */
+export function compileProjection(fields?: readonly string[]): Projection {
+  if (!fields || fields.length === 0) {
+    return identity;
+  }
+  const tree = buildTree(fields);
+  return (value) => applyTree(value, tree);
+}
+
+/**
+ * Projection for a tool's fields argument: 'compact' selects
+ * COMPACT_SHOP_FIELDS, a list selects those paths, undefined keeps everything.
+ */
+export function fieldsProjection(fields?: 'compact' | readonly string[]): Projection {
+  return compileProjection(fields === 'compact' ? COMPACT_SHOP_FIELDS : fields);
+}
+
+/**
+ * True when every path of fields is available from values projected to
+ * available, i.e. it is one of the available paths or lies below one.
+ * Undefined fields (everything) is only covered when nothing was dropped.
+ */
+export function fieldsCovered(
+  fields: 'compact' | readonly string[] | undefined,
+  available: readonly string[],
+): boolean {
+  const paths = fields === 'compact' ? COMPACT_SHOP_FIELDS : fields;
+  if (!paths || paths.length === 0) {
+    return available.length === 0;
+  }
+  return paths.every((path) =>
+    available.some((kept) => path === kept || path.startsWith(`${kept}.`)),
+  );
+}
+
+/**
+ * Project the shop list of a results block, keeping its counters.
+ */
+export function projectResults(results: any, project: Projection): any {
+  if (project === identity || !Array.isArray(results?.shop)) {
+    return results;
+  }
+  return { ...results, shop: results.shop.map(project) };
+}
@@ -0,0 +1,145 @@
+import {
+  ErrorCode,
+  McpError,
+  type Resource,
+  type ResourceTemplate,
+} from '@modelcontextprotocol/sdk/types.js';
+import {
+  AREA_LEVELS,
+  type AreaEntry,
+  type AreaLevel,
+  type AreaTree,
+  ancestors,
+  descendants,
+  loadAreaTree,
+} from './areaTree.js';
+import { ResponseCache } from './cache.js';
+import { config } from './config.js';
+
+/**
+ * The area hierarchy as MCP resources:
+ *
+ *   area://SA41         one area with its parent chain and direct children
+ *   area://Y500/small   every area of a level below an area
+ *
+ * The hierarchy is opened on the first resource request, not at startup, and
+ * rendered bodies are kept in an LRU cache because the data never changes while
+ * the server runs.
+ */
+
+const SCHEME = 'area://';
+const MIME_TYPE = 'application/json';
+
+// Accepted level names in area://<code>/<level>
+const LEVEL_ALIASES: Record<string, AreaLevel> = {
+  large_service: 'large_service_area',
+  service: 'service_area',
+  large: 'large_area',
+  middle: 'middle_area',
+  small: 'small_area',
+  ...Object.fromEntries(AREA_LEVELS.map((level) => [level, level])),
+};
+
+let treePromise: Promise<AreaTree> | undefined;
+
+const bodyCache = new ResponseCache(config.AREAS.BODY_CACHE_ENTRIES);
+
+function getAreaTree(): Promise<AreaTree> {
+  if (!treePromise) {
+    treePromise = loadAreaTree(config.AREAS.SNAPSHOT_PATH, config.AREAS.DIR).catch((error) => {
+      // Let the next request retry, e.g. once the snapshot has been exported
+      treePromise = undefined;
+      throw new McpError(ErrorCode.InternalError, `Area data is not available: ${error.message}`);
+    });
+  }
+  return treePromise;
+}
+
+function summary(node: AreaEntry) {
+  return { code: node.code, name: node.name, level: node.level };
+}
+
+function renderArea(tree: AreaTree, node: AreaEntry): string {
+  return JSON.stringify({
+    ...summary(node),
+    parent: node.parent,
+    // Root first, e.g. SS01 > SA41 for Y500
+    path: ancestors(tree, node.code).reverse().map(summary),
+    children: tree.children(node.code).map(summary),
+  });
+}
+
+function renderLevel(tree: AreaTree, node: AreaEntry, level: AreaLevel): string {
+  const areas = descendants(tree, node.code, level).map((area) => ({
+    ...summary(area),
+    parent: area.parent,
+  }));
+  return JSON.stringify({ ...summary(node), descendant_level: level, count: areas.length, areas });
+}
+
+/**
+ * Resources for the top of the hierarchy (large service areas and service
+ * areas); anything deeper is reached through the templates.
+ */
+export async function handleListResources(): Promise<Resource[]> {
+  const tree = await getAreaTree();
+  const resources: Resource[] = [];
+  for (const root of tree.roots()) {
+    for (const node of [root, ...tree.children(root.code)]) {
+      resources.push({
+        uri: `${SCHEME}${node.code}`,
+        name: node.name,
+        description: `${node.level} ${node.code}`,
+        mimeType: MIME_TYPE,
+      });
+    }
+  }
+  return resources;
+}
+
+export function handleListResourceTemplates(): ResourceTemplate[] {
+  return [
+    {
+      uriTemplate: `${SCHEME}{code}`,
+      name: 'Area',
+      description: 'A Hot Pepper area (e.g. SA41, Y500) with its parent chain and direct children',
+      mimeType: MIME_TYPE,
+    },
+    {
+      uriTemplate: `${SCHEME}{code}/{level}`,
+      name: 'Areas of a level below an area',
+      description:
+        `Every area of a level below an area (e.g. ${SCHEME}Y500/small). ` +
+        'Levels: large_service, service, large, middle, small',
+      mimeType: MIME_TYPE,
+    },
+  ];
+}
+
+/**
+ * Read one area resource.
+ */
+export async function handleReadResource(uri: string) {
+  if (!uri.startsWith(SCHEME)) {
+    throw new McpError(ErrorCode.InvalidParams, `Unknown resource: ${uri}`);
+  }
+  const [code, levelName, ...rest] = uri.slice(SCHEME.length).split('/');
+  // Own keys only, so names like "constructor" are not levels
+  const level =
+    levelName !== undefined && Object.hasOwn(LEVEL_ALIASES, levelName)
+      ? LEVEL_ALIASES[levelName]
+      : undefined;
+  if (!code || rest.length > 0 || (levelName !== undefined && !level)) {
+    throw new McpError(ErrorCode.InvalidParams, `Invalid area resource: ${uri}`);
+  }
+
+  const text = await bodyCache.getOrFetch(uri, Infinity, async () => {
+    const tree = await getAreaTree();
+    const node = tree.get(code);
+    if (!node) {
+      throw new McpError(ErrorCode.InvalidParams, `Unknown area code: ${code}`);
+    }
+    return level ? renderLevel(tree, node, level) : renderArea(tree, node);
+  });
+  return { contents: [{ uri, mimeType: MIME_TYPE, text }] };
+}
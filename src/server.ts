@@ -6,14 +6,20 @@ import {
   ErrorCode,
   CallToolRequestSchema,
   ListResourcesRequestSchema,
+  ListResourceTemplatesRequestSchema,
   ReadResourceRequestSchema,
   ListToolsRequestSchema
 } from "@modelcontextprotocol/sdk/types.js";
 import config from './config.js';
 import axios from 'axios';
-import { handleListResources, handleReadResource } from "./resources.js";
-import { handleToolCall } from './handlers.js';
-import { TOOLS } from './tools/index.js';
+import {
+  handleListResources,
+  handleListResourceTemplates,
+  handleReadResource,
+} from "./resources.js";
+import { handleToolCall } from './handler.js';
+import { type ToolContext, TOOLS } from './tools/index.js';
+import { logger } from './logger.js';
 // const server = new Server(
 //   {
 //     name: 'mcp-hotpepper',
@@ -58,17 +64,17 @@ export function createServer() {
       start: async () => {
         try {
           await server.connect(transport);
-          console.log('Hotpepper MCP server running on stdio');
+          logger.info('Hotpepper MCP server running on stdio');
         } catch (error) {
-          console.error('Server error:', error);
+          logger.error('Server error:', error);
           throw error;
         }
       },
       stop: async () => {
         try {        await server.close();
-        console.log('Server disconnected');}
+        logger.info('Server disconnected');}
         catch (error) {
-          console.error('Error during server shutdown:', error);
+          logger.error('Error during server shutdown:', error);
           throw error;
         }
       },
@@ -79,7 +85,7 @@ export function createServer() {
  * Handle error logging and rethrowing
  */
 function handleError(error: unknown, context: string): never {
-  console.error(`Error in ${context}:`, error);
+  logger.error(`Error in ${context}:`, error);
 
   if (error instanceof McpError) {
     throw error; // Rethrow MCP errors as is
@@ -93,17 +99,27 @@ function handleError(error: unknown, context: string): never {
  */
 function setupRequestHandlers(server: Server) {
   // Handle tool calls
-  server.setRequestHandler(CallToolRequestSchema, async (request) => {
+  server.setRequestHandler(CallToolRequestSchema, async (request, extra) => {
     try {
-      const { tool, input } = request.params;
+      const { name, arguments: input } = request.params;
+      // Long searches report partial results when the client sent a progress token
+      const progressToken = request.params._meta?.progressToken;
+      const context: ToolContext = {};
+      if (progressToken !== undefined) {
+        context.sendProgress = (progress, total, message) =>
+          extra.sendNotification({
+            method: 'notifications/progress',
+            params: { progressToken, progress, total, message },
+          });
+      }
 
-      return await handleToolCall(tool, input);
+      return await handleToolCall(name, input, context);
     } catch (error) {
       return handleError(error, 'CallToolRequest');
     }
   });
   // Handle listing resources
-  server.setRequestHandler(ListResourcesRequestSchema, async (request) => {
+  server.setRequestHandler(ListResourcesRequestSchema, async () => {
     try {
       return { resources: await handleListResources() };
     }
@@ -120,10 +136,24 @@ function setupRequestHandlers(server: Server) {
       return handleError(error, 'ListToolsRequest');
     }
   });
+  // Handle listing resource templates
+  server.setRequestHandler(ListResourceTemplatesRequestSchema, async () => {
+    try {
+      return { resourceTemplates: handleListResourceTemplates() };
+    }
+    catch (error) {
+      return handleError(error, 'ListResourceTemplatesRequest');
+    }
+  });
   // Handle reading a resource
-  // server.setRequestHandler(ReadResourceRequestSchema, async (request) => {
-    
-  // };
+  server.setRequestHandler(ReadResourceRequestSchema, async (request) => {
+    try {
+      return await handleReadResource(request.params.uri);
+    }
+    catch (error) {
+      return handleError(error, 'ReadResourceRequest');
+    }
+  });
 
 };
 
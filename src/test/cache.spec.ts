@@ -0,0 +1,104 @@
+import { cacheKey, ResponseCache } from '../cache.js';
+
+function clock(start = 1_000) {
+  let now = start;
+  return {
+    now: () => now,
+    advance: (ms: number) => {
+      now += ms;
+    },
+  };
+}
+
+describe('cacheKey', () => {
+  it('ignores parameter order, blank values and the API key', () => {
+    expect(cacheKey('/gourmet/v1/', { range: '3', key: 'secret', lat: ' 35.1 ', name: '' })).toBe(
+      cacheKey('/gourmet/v1/', { lat: '35.1', range: '3' }),
+    );
+  });
+});
+
+describe('ResponseCache', () => {
+  it('serves values until their TTL has passed', () => {
+    const time = clock();
+    const cache = new ResponseCache(10, time.now);
+    cache.set('a', 1, 100);
+
+    time.advance(99);
+    expect(cache.get('a')).toBe(1);
+    time.advance(1);
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.stats().size).toBe(0);
+  });
+
+  it('does not store values without a positive TTL', () => {
+    const cache = new ResponseCache(10);
+    cache.set('a', 1, 0);
+    expect(cache.get('a')).toBeUndefined();
+  });
+
+  it('evicts the least recently used entry', () => {
+    const cache = new ResponseCache(2);
+    cache.set('a', 1, 1_000);
+    cache.set('b', 2, 1_000);
+    // Reading a makes b the least recently used
+    expect(cache.get('a')).toBe(1);
+    cache.set('c', 3, 1_000);
+
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('a')).toBe(1);
+    expect(cache.get('c')).toBe(3);
+    expect(cache.stats().evictions).toBe(1);
+  });
+
+  it('shares one fetch between concurrent callers of a key', async () => {
+    const cache = new ResponseCache(10);
+    let resolve!: (value: string) => void;
+    const fetcher = vi.fn(
+      () =>
+        new Promise<string>((done) => {
+          resolve = done;
+        }),
+    );
+
+    const first = cache.getOrFetch('a', 1_000, fetcher);
+    const second = cache.getOrFetch('a', 1_000, fetcher);
+    resolve('value');
+
+    await expect(Promise.all([first, second])).resolves.toEqual(['value', 'value']);
+    await expect(cache.getOrFetch('a', 1_000, fetcher)).resolves.toBe('value');
+    expect(fetcher).toHaveBeenCalledTimes(1);
+    expect(cache.stats()).toMatchObject({ hits: 1, misses: 1, coalesced: 1, size: 1 });
+  });
+
+  it('fetches again after a rejected or uncacheable fetch', async () => {
+    const cache = new ResponseCache(10);
+    await expect(
+      cache.getOrFetch('a', 1_000, () => Promise.reject(new Error('down'))),
+    ).rejects.toThrow('down');
+
+    const fetcher = vi.fn(async () => ({ results: { error: [{ code: 3000 }] } }));
+    const isCacheable = (data: { results: { error?: unknown } }) => !data.results.error;
+    await cache.getOrFetch('a', 1_000, fetcher, isCacheable);
+    await cache.getOrFetch('a', 1_000, fetcher, isCacheable);
+    expect(fetcher).toHaveBeenCalledTimes(2);
+  });
+
+  it('takes the TTL of a fetched value from a function of it', async () => {
+    const time = clock();
+    const cache = new ResponseCache(10, time.now);
+    const ttlOf = (value: { freshForMs: number }) => value.freshForMs;
+
+    await cache.getOrFetch('a', ttlOf, async () => ({ freshForMs: 100 }));
+    time.advance(99);
+    expect(cache.get('a')).toEqual({ freshForMs: 100 });
+    time.advance(1);
+    expect(cache.get('a')).toBeUndefined();
+
+    // A value with no freshness left is returned but never stored
+    await expect(cache.getOrFetch('b', ttlOf, async () => ({ freshForMs: 0 }))).resolves.toEqual({
+      freshForMs: 0,
+    });
+    expect(cache.get('b')).toBeUndefined();
+  });
+});
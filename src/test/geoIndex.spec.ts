@@ -0,0 +1,133 @@
+import { GeoIndex } from '../geoIndex.js';
+
+const LAT = 43.0555;
+const LNG = 141.3529;
+
+/** A shop about `meters` north of the center */
+function shopAt(id: string, meters: number, extra: Record<string, unknown> = {}) {
+  return { id, lat: String(LAT + meters / 111_195), lng: String(LNG), ...extra };
+}
+
+function createIndex(options: { maxShops?: number; project?: (shop: any) => any } = {}) {
+  let now = 1_000_000;
+  const index = new GeoIndex(
+    {
+      cellDegrees: 0.01,
+      freshnessMs: 60_000,
+      maxShops: options.maxShops ?? 1000,
+      project: options.project,
+    },
+    () => now,
+  );
+  return {
+    index,
+    advance: (ms: number) => {
+      now += ms;
+    },
+  };
+}
+
+function locationResponse(shops: object[], returned = shops.length, available = shops.length) {
+  return {
+    results: { results_available: available, results_returned: String(returned), shop: shops },
+  };
+}
+
+describe('GeoIndex.nearest', () => {
+  it('answers when the circle out to the n-th shop is covered', () => {
+    const { index } = createIndex();
+    index.add([shopAt('A', 100), shopAt('B', 150), shopAt('C', 500)]);
+    index.markCovered(LAT, LNG, 200);
+
+    expect(index.nearest(LAT, LNG, 2, 1000)?.map(({ shop }) => shop.id)).toEqual(['A', 'B']);
+  });
+
+  it('falls back when the n-th shop is outside the covered region', () => {
+    const { index } = createIndex();
+    index.add([shopAt('A', 100), shopAt('B', 150), shopAt('C', 500)]);
+    index.markCovered(LAT, LNG, 200);
+
+    expect(index.nearest(LAT, LNG, 3, 1000)).toBeUndefined();
+  });
+
+  it('falls back when the covered region is older than maxAgeMs', () => {
+    const { index, advance } = createIndex();
+    index.add([shopAt('A', 100)]);
+    index.markCovered(LAT, LNG, 1000);
+    advance(10_000);
+
+    expect(index.nearest(LAT, LNG, 1, 1000, 20_000)).toHaveLength(1);
+    expect(index.nearest(LAT, LNG, 1, 1000, 5_000)).toBeUndefined();
+    expect(index.nearest(LAT, LNG, 1, 1000, 0)).toBeUndefined();
+  });
+});
+
+describe('GeoIndex.addResponse', () => {
+  const plain = { lat: String(LAT), lng: String(LNG), range: '3', format: 'json' };
+
+  it('marks a complete first page of a plain location search as covered', () => {
+    const { index } = createIndex();
+    index.addResponse(plain, locationResponse([shopAt('A', 100)]));
+
+    expect(index.stats()).toMatchObject({ shops: 1, regions: 1 });
+    expect(index.isCovered(LAT, LNG, 1000)).toBe(true);
+  });
+
+  it.each([
+    ['a keyword', { ...plain, keyword: 'ramen' }, locationResponse([shopAt('A', 100)])],
+    ['a later page', { ...plain, start: '101' }, locationResponse([shopAt('A', 100)])],
+    ['an incomplete page', plain, locationResponse([shopAt('A', 100)], 1, 250)],
+  ])('indexes the shops of %s without marking coverage', (_, params, data) => {
+    const { index } = createIndex();
+    index.addResponse(params, data);
+
+    expect(index.stats()).toMatchObject({ shops: 1, regions: 0 });
+  });
+
+  it('ages shops and coverage from the time the response was fetched', () => {
+    const { index } = createIndex();
+    // Read from a cache 50 s after it came from the API
+    index.addResponse(plain, locationResponse([shopAt('A', 100)]), 1_000_000 - 50_000);
+
+    expect(index.isCovered(LAT, LNG, 1000, 60_000)).toBe(true);
+    expect(index.isCovered(LAT, LNG, 1000, 30_000)).toBe(false);
+    expect(index.withinRadius(LAT, LNG, 1000, 30_000)).toEqual([]);
+  });
+
+  it('stores shops through the projection', () => {
+    const { index } = createIndex({ project: ({ id, lat, lng }) => ({ id, lat, lng }) });
+    const shop = shopAt('A', 100, { photo: { pc: { l: 'l.jpg' } } });
+    index.addResponse(plain, locationResponse([shop]));
+
+    expect(index.withinRadius(LAT, LNG, 1000)[0].shop).not.toHaveProperty('photo');
+  });
+});
+
+describe('GeoIndex regions', () => {
+  it('clears covered regions when shops are evicted', () => {
+    const { index } = createIndex({ maxShops: 2 });
+    index.add([shopAt('A', 100), shopAt('B', 150)]);
+    index.markCovered(LAT, LNG, 1000);
+    index.add([shopAt('C', 200)]);
+
+    expect(index.stats()).toMatchObject({ shops: 2, regions: 0 });
+    expect(index.isCovered(LAT, LNG, 1000)).toBe(false);
+  });
+
+  it('drops expired and contained regions when a region is added', () => {
+    const { index, advance } = createIndex();
+    index.markCovered(LAT + 0.05, LNG, 300);
+    advance(61_000);
+    index.markCovered(LAT, LNG, 300);
+    index.markCovered(LAT, LNG, 1000);
+
+    expect(index.stats().regions).toBe(1);
+  });
+
+  it('ignores regions fetched before the freshness window', () => {
+    const { index } = createIndex();
+    index.markCovered(LAT, LNG, 1000, 1_000_000 - 61_000);
+
+    expect(index.stats().regions).toBe(0);
+  });
+});
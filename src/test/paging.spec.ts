@@ -0,0 +1,149 @@
+import { fetchData, fetchDataWithTime } from '../api.js';
+import { mapWithConcurrency } from '../concurrency.js';
+import { fetchAllPages, type PageUpdate, remainingPages } from '../paging.js';
+import { handleSearchByArea } from '../tools/searchByArea.js';
+
+vi.mock('../api.js', () => ({
+  fetchData: vi.fn(),
+  fetchDataWithTime: vi.fn(),
+  apiErrorMessage: () => undefined,
+}));
+
+const fetchDataMock = vi.mocked(fetchData);
+const fetchDataWithTimeMock = vi.mocked(fetchDataWithTime);
+
+function shops(from: number, to: number) {
+  return Array.from({ length: to - from + 1 }, (_, i) => ({ id: `J${from + i}` }));
+}
+
+/**
+ * A search whose results shift by `shift` shops between the first and later
+ * pages. Page n (from 0) reports fetchedAt 1000 - n.
+ */
+function serveSearch(resultsAvailable: number, shift = 0) {
+  const page = (params: Record<string, string>) => {
+    const start = Number(params.start);
+    const offset = start === 1 ? 0 : shift;
+    const last = Math.min(start + Number(params.count) - 1, resultsAvailable);
+    return {
+      results: {
+        results_available: resultsAvailable,
+        shop: shops(start - offset, last - offset),
+      },
+    };
+  };
+  fetchDataMock.mockImplementation(async (_endpoint, params) => page(params));
+  fetchDataWithTimeMock.mockImplementation(async (_endpoint, params) => ({
+    data: page(params),
+    fetchedAt: 1000 - Math.floor(Number(params.start) / 100),
+  }));
+}
+
+function requestedPages() {
+  return [...fetchDataMock.mock.calls, ...fetchDataWithTimeMock.mock.calls].map(
+    ([, params]) => params,
+  );
+}
+
+beforeEach(() => {
+  fetchDataMock.mockReset();
+  fetchDataWithTimeMock.mockReset();
+});
+
+describe('remainingPages', () => {
+  it('lists the pages after the first one', () => {
+    expect(remainingPages(250, 100)).toEqual([
+      { start: 101, count: 100 },
+      { start: 201, count: 50 },
+    ]);
+  });
+
+  it('is empty when the first page holds everything', () => {
+    expect(remainingPages(100, 100)).toEqual([]);
+    expect(remainingPages(0, 100)).toEqual([]);
+  });
+});
+
+describe('fetchAllPages', () => {
+  it('merges the pages in order without duplicates', async () => {
+    // Later pages start 5 shops early, repeating the end of the previous page
+    serveSearch(250, 5);
+    const updates: PageUpdate[] = [];
+
+    const result = await fetchAllPages('/gourmet/v1/', { middle_area: 'Y500' }, {
+      concurrency: 1,
+      onPage: (update) => {
+        updates.push(update);
+      },
+    });
+
+    expect(result.resultsAvailable).toBe(250);
+    expect(result.truncated).toBe(false);
+    // The oldest page decides
+    expect(result.fetchedAt).toBe(998);
+    expect(result.shops.map((shop) => shop.id)).toEqual(shops(1, 245).map((shop) => shop.id));
+    expect(updates.map((update) => [update.shops.length, update.received, update.total])).toEqual([
+      [100, 100, 250],
+      [95, 195, 250],
+      [50, 245, 250],
+    ]);
+  });
+
+  it('does not report pages without new shops', async () => {
+    // Every later page repeats the first one
+    serveSearch(200, 100);
+    const onPage = vi.fn();
+
+    const result = await fetchAllPages('/gourmet/v1/', {}, { onPage });
+
+    expect(result.shops).toHaveLength(100);
+    expect(onPage).toHaveBeenCalledTimes(1);
+  });
+
+  it('stops at maxResults', async () => {
+    serveSearch(1000);
+    const result = await fetchAllPages('/gourmet/v1/', {}, { maxResults: 150 });
+
+    expect(result.shops).toHaveLength(150);
+    expect(result.truncated).toBe(true);
+    expect(requestedPages().map((params) => [params.start, params.count])).toEqual([
+      ['1', '100'],
+      ['101', '50'],
+    ]);
+  });
+});
+
+describe('mapWithConcurrency', () => {
+  it('starts no further items after a rejection', async () => {
+    const fn = vi.fn(async (item: number) => {
+      if (item === 1) {
+        throw new Error('failed');
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1));
+      return item;
+    });
+
+    await expect(mapWithConcurrency([0, 1, 2, 3, 4, 5], 2, fn)).rejects.toThrow('failed');
+    // Let the call that was in flight finish
+    await new Promise((resolve) => setTimeout(resolve, 5));
+    expect(fn).toHaveBeenCalledTimes(2);
+  });
+});
+
+describe('handleSearchByArea', () => {
+  it('collects every shop of an area without a keyword', async () => {
+    serveSearch(120);
+    await handleSearchByArea({ middle_area: 'Y500', all: true });
+
+    const pages = requestedPages();
+    expect(pages).toHaveLength(2);
+    for (const params of pages) {
+      expect(params).toMatchObject({ middle_area: 'Y500' });
+      expect(params).not.toHaveProperty('name');
+    }
+  });
+
+  it('requires an area', async () => {
+    await expect(handleSearchByArea({ all: true })).rejects.toThrow('At least one of');
+  });
+});
@@ -0,0 +1,52 @@
+import { promises as fs } from 'fs';
+import os from 'os';
+import path from 'path';
+import { PersistentCache } from '../persistentCache.js';
+
+describe('PersistentCache', () => {
+  let directory: string;
+  let now: number;
+  let cache: PersistentCache;
+
+  beforeEach(async () => {
+    directory = await fs.mkdtemp(path.join(os.tmpdir(), 'hotpepper-cache-'));
+    now = 1_000_000;
+    cache = new PersistentCache(
+      directory,
+      { maxBytes: 1 << 20, staleWhileRevalidateMs: 500 },
+      () => now,
+    );
+  });
+
+  afterEach(async () => {
+    await fs.rm(directory, { recursive: true, force: true });
+  });
+
+  it('reports the freshness left on an entry', async () => {
+    await cache.write('a', { shop: [] }, 1_000);
+    now += 400;
+    await expect(cache.read('a')).resolves.toEqual({
+      value: { shop: [] },
+      fresh: true,
+      freshForMs: 600,
+      storedAt: 1_000_000,
+    });
+  });
+
+  it('serves expired entries as stale until the revalidation window ends', async () => {
+    await cache.write('a', 1, 1_000);
+    now += 1_200;
+    await expect(cache.read('a')).resolves.toEqual({
+      value: 1,
+      fresh: false,
+      freshForMs: 0,
+      storedAt: 1_000_000,
+    });
+    now += 300;
+    await expect(cache.read('a')).resolves.toBeUndefined();
+  });
+
+  it('misses unknown keys', async () => {
+    await expect(cache.read('missing')).resolves.toBeUndefined();
+  });
+});
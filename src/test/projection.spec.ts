@@ -0,0 +1,98 @@
+import {
+  COMPACT_SHOP_FIELDS,
+  compileProjection,
+  fieldsCovered,
+  fieldsProjection,
+  projectResults,
+} from '../projection.js';
+
+const shop = {
+  id: 'J001',
+  name: 'すすきの食堂',
+  budget: { code: 'B003', name: '2001～3000円', average: '2500円' },
+  genre: { code: 'G001', name: '居酒屋', catch: '' },
+  urls: { pc: 'https://www.hotpepper.jp/strJ001/' },
+  photo: { pc: { l: 'l.jpg', m: 'm.jpg', s: 's.jpg' } },
+  coupons: [
+    { name: '10% off', url: 'a' },
+    { name: 'free drink', url: 'b' },
+  ],
+};
+
+describe('compileProjection', () => {
+  it('keeps nested paths only', () => {
+    const project = compileProjection(['id', 'budget.average', 'photo.pc.m']);
+    expect(project(shop)).toEqual({
+      id: 'J001',
+      budget: { average: '2500円' },
+      photo: { pc: { m: 'm.jpg' } },
+    });
+  });
+
+  it('projects every element of an array', () => {
+    expect(compileProjection(['coupons.name'])(shop)).toEqual({
+      coupons: [{ name: '10% off' }, { name: 'free drink' }],
+    });
+    expect(compileProjection(['id'])([shop, { id: 'J002', name: 'x' }])).toEqual([
+      { id: 'J001' },
+      { id: 'J002' },
+    ]);
+  });
+
+  it('keeps a whole object when it is listed with one of its paths', () => {
+    const expected = { budget: shop.budget };
+    expect(compileProjection(['budget', 'budget.name'])(shop)).toEqual(expected);
+    expect(compileProjection(['budget.name', 'budget'])(shop)).toEqual(expected);
+  });
+
+  it('skips paths that do not exist', () => {
+    expect(compileProjection(['id', 'missing', 'name.first', 'genre.missing'])(shop)).toEqual({
+      id: 'J001',
+      name: 'すすきの食堂',
+      genre: {},
+    });
+  });
+
+  it('keeps everything without fields', () => {
+    expect(compileProjection()(shop)).toBe(shop);
+    expect(compileProjection([])(shop)).toBe(shop);
+  });
+});
+
+describe('fieldsProjection', () => {
+  it('selects the compact shop fields', () => {
+    expect(fieldsProjection('compact')(shop)).toEqual({
+      id: 'J001',
+      name: 'すすきの食堂',
+      budget: { name: '2001～3000円', average: '2500円' },
+      genre: { name: '居酒屋' },
+      urls: { pc: 'https://www.hotpepper.jp/strJ001/' },
+    });
+  });
+});
+
+describe('projectResults', () => {
+  it('projects the shops and keeps the counters', () => {
+    const results = { results_available: 1, results_returned: '1', shop: [shop] };
+    expect(projectResults(results, compileProjection(['id']))).toEqual({
+      results_available: 1,
+      results_returned: '1',
+      shop: [{ id: 'J001' }],
+    });
+  });
+});
+
+describe('fieldsCovered', () => {
+  it('accepts fields at or below the available paths', () => {
+    expect(fieldsCovered('compact', COMPACT_SHOP_FIELDS)).toBe(true);
+    expect(fieldsCovered(['id', 'budget.average'], COMPACT_SHOP_FIELDS)).toBe(true);
+    expect(fieldsCovered(['budget.average.value'], ['budget'])).toBe(true);
+  });
+
+  it('rejects fields that were dropped', () => {
+    expect(fieldsCovered(['budget'], COMPACT_SHOP_FIELDS)).toBe(false);
+    expect(fieldsCovered(['photo.pc.l'], COMPACT_SHOP_FIELDS)).toBe(false);
+    expect(fieldsCovered(undefined, COMPACT_SHOP_FIELDS)).toBe(false);
+    expect(fieldsCovered(undefined, [])).toBe(true);
+  });
+});
@@ -0,0 +1,170 @@
+import { execFileSync } from 'child_process';
+import { mkdtempSync, readFileSync, rmSync, writeFileSync } from 'fs';
+import { tmpdir } from 'os';
+import path from 'path';
+import { areaFiles, loadAreaTree, SnapshotAreaTree } from '../areaTree.js';
+import type * as Resources from '../resources.js';
+
+// Snapshots come from the Python exporter so that both sides agree on the format
+const EXPORTER = path.resolve(__dirname, '../../areas/area_snapshot.py');
+
+const AREAS = {
+  large_service_area: [{ code: 'SS10', name: '北海道' }],
+  service_area: [
+    { code: 'SA41', name: '北海道', large_service_area: 'SS10' },
+    // SS20 is not in the data, so SA11 is a root
+    { code: 'SA11', name: '東京', large_service_area: 'SS20' },
+  ],
+  middle_area: [
+    { code: 'Y500', name: 'すすきの', service_area: 'SA41' },
+    { code: 'Y505', name: '札幌駅', service_area: 'SA41' },
+  ],
+  small_area: [
+    { code: 'X001', name: '南4条', middle_area: 'Y500' },
+    { code: 'X002', name: '南5条', middle_area: 'Y500' },
+    { code: 'X010', name: '北口', middle_area: 'Y505' },
+  ],
+};
+
+let workDir: string;
+let snapshotPath: string;
+
+beforeAll(() => {
+  workDir = mkdtempSync(path.join(tmpdir(), 'area-snapshot-'));
+  writeFileSync(path.join(workDir, 'hotpepper_areas.json'), JSON.stringify(AREAS));
+  snapshotPath = path.join(workDir, 'areas.snapshot');
+  execFileSync('python3', [EXPORTER, 'export', workDir, '-o', snapshotPath]);
+});
+
+afterAll(() => {
+  rmSync(workDir, { recursive: true, force: true });
+});
+
+function codes(nodes: { code: string }[]): string[] {
+  return nodes.map((node) => node.code);
+}
+
+describe('SnapshotAreaTree', () => {
+  let tree: SnapshotAreaTree;
+
+  beforeAll(() => {
+    tree = new SnapshotAreaTree(readFileSync(snapshotPath));
+  });
+
+  it('decodes nodes found by code', () => {
+    expect(tree.size).toBe(8);
+    expect(tree.get('Y500')).toEqual({
+      code: 'Y500',
+      name: 'すすきの',
+      level: 'middle_area',
+      parent: 'SA41',
+      childCount: 2,
+    });
+  });
+
+  it.each(['A', 'SA10', 'SA12', 'Y501', 'X000', 'X0010', 'ZZZ', ''])(
+    'misses %j without an exact match',
+    (code) => {
+      expect(tree.get(code)).toBeUndefined();
+      expect(tree.children(code)).toEqual([]);
+    },
+  );
+
+  it('lists direct children in order', () => {
+    expect(codes(tree.children('SA41'))).toEqual(['Y500', 'Y505']);
+    expect(codes(tree.children('Y500'))).toEqual(['X001', 'X002']);
+    expect(tree.children('X001')).toEqual([]);
+  });
+
+  it('lists areas without a loaded parent as roots', () => {
+    expect(codes(tree.roots()).sort()).toEqual(['SA11', 'SS10']);
+  });
+
+  it('rejects buffers that are not snapshots', () => {
+    expect(() => new SnapshotAreaTree(Buffer.alloc(64))).toThrow('Not an area snapshot');
+  });
+});
+
+describe('areaFiles', () => {
+  it('skips dotfiles like the Python loader', async () => {
+    const directory = mkdtempSync(path.join(tmpdir(), 'area-files-'));
+    try {
+      writeFileSync(path.join(directory, 'hotpepper_areas.json'), JSON.stringify(AREAS));
+      writeFileSync(path.join(directory, 'a.json'), JSON.stringify({ middle_area: [] }));
+      writeFileSync(path.join(directory, '.area_name_index.json'), '{"not": "areas"}');
+      writeFileSync(path.join(directory, 'notes.txt'), 'x');
+
+      expect((await areaFiles(directory)).map((file) => path.basename(file))).toEqual([
+        'hotpepper_areas.json',
+        'a.json',
+      ]);
+      const tree = await loadAreaTree(path.join(directory, 'missing.snapshot'), directory);
+      expect(tree.size).toBe(8);
+    } finally {
+      rmSync(directory, { recursive: true, force: true });
+    }
+  });
+});
+
+describe('area resources', () => {
+  let resources: typeof Resources;
+
+  beforeAll(async () => {
+    // config reads the snapshot path when it is first imported
+    process.env.HOTPEPPER_AREA_SNAPSHOT = snapshotPath;
+    resources = await import('../resources.js');
+  });
+
+  afterAll(() => {
+    delete process.env.HOTPEPPER_AREA_SNAPSHOT;
+  });
+
+  async function read(uri: string) {
+    const { contents } = await resources.handleReadResource(uri);
+    return JSON.parse(contents[0].text);
+  }
+
+  it('reads every small area below a middle area', async () => {
+    expect(await read('area://Y500/small')).toEqual({
+      code: 'Y500',
+      name: 'すすきの',
+      level: 'middle_area',
+      descendant_level: 'small_area',
+      count: 2,
+      areas: [
+        { code: 'X001', name: '南4条', level: 'small_area', parent: 'Y500' },
+        { code: 'X002', name: '南5条', level: 'small_area', parent: 'Y500' },
+      ],
+    });
+    expect(codes((await read('area://SA41/small_area')).areas)).toEqual(['X001', 'X002', 'X010']);
+  });
+
+  it('reads an area with its path and children', async () => {
+    const area = await read('area://Y500');
+    expect(codes(area.path)).toEqual(['SS10', 'SA41']);
+    expect(codes(area.children)).toEqual(['X001', 'X002']);
+  });
+
+  it('rejects unknown codes and levels', async () => {
+    await expect(resources.handleReadResource('area://Y999')).rejects.toThrow(
+      'Unknown area code: Y999',
+    );
+    await expect(resources.handleReadResource('area://Y500/tiny')).rejects.toThrow(
+      'Invalid area resource',
+    );
+  });
+
+  it.each(['constructor', 'toString', '__proto__', 'hasOwnProperty'])(
+    'rejects the object member %s as a level',
+    async (name) => {
+      await expect(resources.handleReadResource(`area://Y500/${name}`)).rejects.toThrow(
+        'Invalid area resource',
+      );
+    },
+  );
+
+  it('lists the roots and their children', async () => {
+    const listed = (await resources.handleListResources()).map((resource) => resource.uri);
+    expect(listed.sort()).toEqual(['area://SA11', 'area://SA41', 'area://SS10']);
+  });
+});
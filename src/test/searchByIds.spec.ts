@@ -0,0 +1,88 @@
+import { fetchData } from '../api.js';
+import { config } from '../config.js';
+import { lookupShopsByIds } from '../tools/searchByIds.js';
+
+vi.mock('../api.js', () => ({
+  fetchData: vi.fn(),
+  apiErrorMessage: (data: any) => data?.results?.error?.[0]?.message,
+}));
+
+const fetchDataMock = vi.mocked(fetchData);
+
+function ids(count: number) {
+  return Array.from({ length: count }, (_, i) => `J${String(i + 1).padStart(3, '0')}`);
+}
+
+/**
+ * Answer every chunk after a short delay with the shops it asked for, except
+ * the missing ones, and record how many chunks were in flight at once.
+ */
+function serveShops(missing: readonly string[] = []) {
+  const state = { inFlight: 0, maxInFlight: 0 };
+  fetchDataMock.mockImplementation(async (_endpoint, params) => {
+    state.inFlight++;
+    state.maxInFlight = Math.max(state.maxInFlight, state.inFlight);
+    await new Promise((resolve) => setTimeout(resolve, 5));
+    state.inFlight--;
+    const shop = params.id
+      .split(',')
+      .filter((id) => !missing.includes(id))
+      .map((id) => ({ id, name: `shop ${id}` }));
+    return { results: { shop } };
+  });
+  return state;
+}
+
+function requestedChunks() {
+  return fetchDataMock.mock.calls.map(([, params]) => params);
+}
+
+beforeEach(() => {
+  fetchDataMock.mockReset();
+});
+
+describe('lookupShopsByIds', () => {
+  it('packs 45 IDs into chunks of 20, 20 and 5', async () => {
+    serveShops();
+    await lookupShopsByIds(ids(45));
+
+    const chunks = requestedChunks();
+    expect(chunks.map((params) => params.id.split(',').length)).toEqual([20, 20, 5]);
+    expect(chunks.map((params) => params.count)).toEqual(['20', '20', '5']);
+    expect(chunks.flatMap((params) => params.id.split(','))).toEqual(ids(45));
+  });
+
+  it('keeps at most concurrency chunks in flight', async () => {
+    const state = serveShops();
+    await lookupShopsByIds(ids(200), undefined, 2);
+    expect(fetchDataMock).toHaveBeenCalledTimes(10);
+    expect(state.maxInFlight).toBe(2);
+  });
+
+  it('defaults to the paging concurrency', async () => {
+    const state = serveShops();
+    await lookupShopsByIds(ids(200));
+    expect(state.maxInFlight).toBe(Math.min(config.PAGING.CONCURRENCY, 10));
+  });
+
+  it('answers in input order, duplicates and missing IDs included', async () => {
+    serveShops(['J002']);
+    const results = await lookupShopsByIds(['J003', 'J001', 'J002', 'J003'], (shop: any) => ({
+      id: shop.id,
+    }));
+
+    expect(fetchDataMock).toHaveBeenCalledTimes(1);
+    expect(requestedChunks()[0].id).toBe('J001,J002,J003');
+    expect(results).toEqual([
+      { id: 'J003', found: true, shop: { id: 'J003' } },
+      { id: 'J001', found: true, shop: { id: 'J001' } },
+      { id: 'J002', found: false, shop: null },
+      { id: 'J003', found: true, shop: { id: 'J003' } },
+    ]);
+  });
+
+  it('rejects when the API reports an error', async () => {
+    fetchDataMock.mockResolvedValue({ results: { error: [{ code: 3000, message: 'bad id' }] } });
+    await expect(lookupShopsByIds(ids(3))).rejects.toThrow('Hot Pepper API error: bad id');
+  });
+});
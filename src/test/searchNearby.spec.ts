@@ -0,0 +1,119 @@
+import { config } from '../config.js';
+import { fetchAllPages } from '../paging.js';
+import { handleSearchNearby } from '../tools/searchNearby.js';
+
+vi.mock('../api.js', () => ({
+  addResponseListener: vi.fn(),
+}));
+
+vi.mock('../paging.js', () => ({
+  fetchAllPages: vi.fn(),
+}));
+
+const fetchAllPagesMock = vi.mocked(fetchAllPages);
+
+// The shop index is shared by every call, so each test searches its own point
+const POINTS = {
+  tokyo: { lat: 35.681, lng: 139.767 },
+  osaka: { lat: 34.702, lng: 135.496 },
+  sapporo: { lat: 43.068, lng: 141.351 },
+  fukuoka: { lat: 33.59, lng: 130.421 },
+  nagoya: { lat: 35.17, lng: 136.882 },
+};
+
+/** Shops north of a point, 100 m apart, the nearest last */
+function shopsNear(point: { lat: number; lng: number }, count: number, prefix: string) {
+  return Array.from({ length: count }, (_, i) => ({
+    id: `${prefix}${count - i}`,
+    name: `shop ${count - i}`,
+    lat: String(point.lat + ((count - i) * 100) / 111_320),
+    lng: String(point.lng),
+    photo: { pc: { l: 'photo.jpg' } },
+  }));
+}
+
+function serveShops(shops: any[], options: { truncated?: boolean; fetchedAt?: number } = {}) {
+  fetchAllPagesMock.mockResolvedValue({
+    resultsAvailable: options.truncated ? shops.length + 1 : shops.length,
+    shops,
+    truncated: options.truncated ?? false,
+    fetchedAt: options.fetchedAt ?? Date.now(),
+  });
+}
+
+async function search(params: Record<string, unknown>) {
+  const result = await handleSearchNearby(params);
+  return JSON.parse((result.content[0] as { text: string }).text);
+}
+
+beforeEach(() => {
+  fetchAllPagesMock.mockReset();
+});
+
+describe('handleSearchNearby', () => {
+  it('answers a covered circle locally after an untruncated fetch', async () => {
+    serveShops(shopsNear(POINTS.tokyo, 3, 'T'));
+
+    const fromApi = await search({ ...POINTS.tokyo, range: 3 });
+    expect(fromApi.source).toBe('api');
+    expect(fetchAllPagesMock).toHaveBeenCalledWith(
+      config.END_POINT.GOURMET,
+      { lat: String(POINTS.tokyo.lat), lng: String(POINTS.tokyo.lng), range: '3' },
+      { maxResults: undefined, maxAgeMs: config.GEO.FRESHNESS_MS },
+    );
+    expect(fromApi.shop.map((shop: any) => shop.id)).toEqual(['T1', 'T2', 'T3']);
+    expect(fromApi.shop.map((shop: any) => shop.distance_m)).toEqual([100, 200, 300]);
+
+    const local = await search({ ...POINTS.tokyo, range: 3 });
+    expect(local.source).toBe('local');
+    expect(local.shop).toEqual(fromApi.shop);
+    // A smaller circle inside the covered one is local too
+    expect((await search({ ...POINTS.tokyo, range: 1, limit: 2 })).source).toBe('local');
+    expect(fetchAllPagesMock).toHaveBeenCalledTimes(1);
+  });
+
+  it('does not mark a truncated result as covered', async () => {
+    serveShops(shopsNear(POINTS.osaka, 3, 'O'), { truncated: true });
+
+    expect((await search({ ...POINTS.osaka, limit: 3 })).source).toBe('api');
+    expect(fetchAllPagesMock.mock.calls[0][2]).toMatchObject({ maxResults: 3 });
+    expect((await search(POINTS.osaka)).source).toBe('api');
+    expect(fetchAllPagesMock).toHaveBeenCalledTimes(2);
+  });
+
+  it('uses local shops only within max_age_seconds', async () => {
+    serveShops(shopsNear(POINTS.sapporo, 2, 'S'), { fetchedAt: Date.now() - 60_000 });
+    expect((await search(POINTS.sapporo)).source).toBe('api');
+
+    expect((await search({ ...POINTS.sapporo, max_age_seconds: 120 })).source).toBe('local');
+
+    const refreshed = await search({ ...POINTS.sapporo, max_age_seconds: 30 });
+    expect(refreshed.source).toBe('api');
+    expect(fetchAllPagesMock).toHaveBeenLastCalledWith(
+      config.END_POINT.GOURMET,
+      expect.anything(),
+      { maxResults: undefined, maxAgeMs: 30_000 },
+    );
+  });
+
+  it('asks the API for fields the index does not keep', async () => {
+    serveShops(shopsNear(POINTS.fukuoka, 2, 'F'));
+    await search(POINTS.fukuoka);
+    expect((await search(POINTS.fukuoka)).source).toBe('local');
+
+    const detailed = await search({ ...POINTS.fukuoka, fields: ['id', 'photo.pc.l'] });
+    expect(detailed.source).toBe('api');
+    expect(detailed.shop[0]).toEqual({
+      id: 'F1',
+      photo: { pc: { l: 'photo.jpg' } },
+      distance_m: 100,
+    });
+  });
+
+  it('returns compact shops by default', async () => {
+    serveShops(shopsNear(POINTS.nagoya, 1, 'N'));
+    const { shop } = await search(POINTS.nagoya);
+    expect(shop[0]).not.toHaveProperty('photo');
+    expect(shop[0]).toMatchObject({ id: 'N1', name: 'shop 1', distance_m: 100 });
+  });
+});
@@ -0,0 +1,4 @@
+// config.ts refuses to load without an API key; tests never reach the real API
+process.env.HOTPEPPER_API_KEY ??= 'test-key';
+// Keep the on-disk cache out of tests unless a spec configures one
+delete process.env.HOTPEPPER_CACHE_DIR;
@@ -0,0 +1,110 @@
+import { type CallToolResult, ErrorCode, McpError } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import { apiErrorMessage, fetchData } from '../api.js';
+import { config } from '../config.js';
+import { fetchAllPages } from '../paging.js';
+import { fieldsProjection, projectResults } from '../projection.js';
+
+/**
+ * Per-call hooks the server passes to tool handlers.
+ */
+export interface ToolContext {
+  /** Send an MCP progress notification; unset when the client did not ask for progress */
+  sendProgress?: (progress: number, total: number | undefined, message: string) => Promise<void>;
+}
+
+// Shop fields to return: 'compact' or a list of dotted paths (e.g. 'budget.average')
+export const FieldsSchema = z
+  .union([z.literal('compact'), z.array(z.string().min(1, 'Field must not be empty'))])
+  .optional();
+
+// Options shared by every gourmet search tool
+export const GourmetSearchOptionsSchema = z.object({
+  fields: FieldsSchema,
+  large_area: z.string().optional(),
+  middle_area: z.string().optional(),
+  small_area: z.string().optional(),
+  start: z.number().int().min(1).optional(),
+  count: z.number().int().min(1).max(config.PAGING.PAGE_SIZE).optional(),
+  all: z.boolean().optional(),
+  max_results: z.number().int().min(1).max(config.PAGING.MAX_RESULTS).optional(),
+});
+
+export type GourmetSearchOptions = z.infer<typeof GourmetSearchOptionsSchema>;
+
+/**
+ * Validate tool input, turning schema errors into InvalidParams.
+ */
+export function parseParams<T extends z.ZodTypeAny>(schema: T, params: unknown): z.infer<T> {
+  const parsed = schema.safeParse(params ?? {});
+  if (!parsed.success) {
+    throw new McpError(
+      ErrorCode.InvalidParams,
+      parsed.error.errors.map((e) => e.message).join(', '),
+    );
+  }
+  return parsed.data;
+}
+
+/**
+ * Wrap a value as a tool result. JSON is written without indentation, which
+ * only costs bytes on the wire and tokens for the model reading it.
+ */
+export function textResult(value: unknown): CallToolResult {
+  return { content: [{ type: 'text', text: JSON.stringify(value) }] };
+}
+
+/**
+ * Run a gourmet search.
+ *
+ * By default one page is returned (start/count as given). With all=true every
+ * page is collected in parallel and, when the client supplied a progress token,
+ * each page's new shops are streamed as a progress notification before the
+ * merged result is returned. Shops are reduced to options.fields before they
+ * are serialized.
+ *
+ * @param query Search conditions (e.g., { name: '...' })
+ * @param options Area filters and paging options
+ */
+export async function searchGourmet(
+  query: Record<string, string>,
+  options: GourmetSearchOptions,
+  context: ToolContext = {},
+): Promise<CallToolResult> {
+  const project = fieldsProjection(options.fields);
+  const params: Record<string, string> = { ...query };
+  for (const name of ['large_area', 'middle_area', 'small_area'] as const) {
+    if (options[name]) {
+      params[name] = options[name];
+    }
+  }
+
+  if (!options.all) {
+    const data = await fetchData(config.END_POINT.GOURMET, {
+      ...params,
+      start: String(options.start ?? 1),
+      count: String(options.count ?? 10),
+      format: 'json',
+    });
+    const error = apiErrorMessage(data);
+    if (error) {
+      throw new McpError(ErrorCode.InternalError, `Hot Pepper API error: ${error}`);
+    }
+    return textResult(projectResults(data.results, project));
+  }
+
+  const result = await fetchAllPages(config.END_POINT.GOURMET, params, {
+    maxResults: options.max_results,
+    project,
+    onPage: context.sendProgress
+      ? ({ shops, received, total }) =>
+          context.sendProgress!(received, total, JSON.stringify({ shops }))
+      : undefined,
+  });
+  return textResult({
+    results_available: result.resultsAvailable,
+    results_returned: result.shops.length,
+    truncated: result.truncated,
+    shop: result.shops,
+  });
+}
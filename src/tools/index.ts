@@ -1,10 +1,62 @@
 import { Tool } from "@modelcontextprotocol/sdk/types.js";
 
 export * from './searchById.js';
+export * from './searchByIds.js';
+export * from './gourmetSearch.js';
 export * from './searchByName.js';
 export * from './searchByNameKana.js';
 export * from './searchByAny.js';
 export * from './searchByTel.js';
+export * from './searchByArea.js';
+export * from './searchNearby.js';
+
+// Shop fields to return, accepted by every gourmet tool
+const FIELDS_OPTION = {
+    fields: {
+        anyOf: [
+            { type: 'string', enum: ['compact'] },
+            { type: 'array', items: { type: 'string' } },
+        ],
+        description: "Shop fields to return, as dotted paths (e.g. ['id', 'name', 'address', 'lat', 'lng', 'budget.average']) or 'compact' for id, name, address, location, budget, genre and URL. All fields are returned when omitted",
+    },
+} as const;
+
+// Area filters and paging options accepted by every gourmet search tool
+const GOURMET_SEARCH_OPTIONS = {
+    ...FIELDS_OPTION,
+    large_area: {
+        type: 'string',
+        description: 'Large area code to search in (e.g. Z011)',
+    },
+    middle_area: {
+        type: 'string',
+        description: 'Middle area code to search in (e.g. Y500)',
+    },
+    small_area: {
+        type: 'string',
+        description: 'Small area code to search in (e.g. X010)',
+    },
+    start: {
+        type: 'integer',
+        minimum: 1,
+        description: 'Position of the first result to return (default 1)',
+    },
+    count: {
+        type: 'integer',
+        minimum: 1,
+        maximum: 100,
+        description: 'Number of results per page (default 10, max 100)',
+    },
+    all: {
+        type: 'boolean',
+        description: 'Return every result instead of one page. Pages are fetched in parallel and streamed as progress notifications',
+    },
+    max_results: {
+        type: 'integer',
+        minimum: 1,
+        description: 'Upper bound for the number of results when all is true (default 1000)',
+    },
+} as const;
 
 export const SEARCH_GOURMET_BY_ID: Tool = {
     name: 'search_gourmet_by_id',  
@@ -16,10 +68,27 @@ export const SEARCH_GOURMET_BY_ID: Tool = {
                 type: 'string',
                 description: 'The unique ID of the gourmet to search for',
             },
-
+            ...FIELDS_OPTION,
         },
     }
 }
+export const SEARCH_GOURMET_BY_IDS: Tool = {
+    name: 'search_gourmet_by_ids',
+    description: 'Search gourmet information for many IDs at once. Results follow the input order and IDs that do not exist are marked as not found',
+    inputSchema: {
+        type: 'object',
+        properties: {
+            ids: {
+                type: 'array',
+                items: { type: 'string' },
+                maxItems: 200,
+                description: 'The unique IDs of the gourmets to search for (e.g. J999999999)',
+            },
+            ...FIELDS_OPTION,
+        },
+        required: ['ids'],
+    }
+}
 export const SEARCH_GOURMET_BY_NAME: Tool = {
     name: 'search_gourmet_by_name',
     description: 'Search gourmet information by name',
@@ -30,7 +99,9 @@ export const SEARCH_GOURMET_BY_NAME: Tool = {
                 type: 'string',
                 description: 'The name of the gourmet to search for',
             },
+            ...GOURMET_SEARCH_OPTIONS,
         },
+        required: ['name'],
     }
 }
 
@@ -44,7 +115,9 @@ export const SEARCH_GOURMET_BY_NAME_KANA: Tool = {
                 type: 'string',
                 description: 'The name in Kana of the gourmet to search for',
             },
+            ...GOURMET_SEARCH_OPTIONS,
         },
+        required: ['name_kana'],
     }
 }
 
@@ -58,7 +131,9 @@ export const SEARCH_GOURMET_BY_ANY: Tool = {
                 type: 'string',
                 description: 'Any keyword to search for gourmet information',
             },
+            ...GOURMET_SEARCH_OPTIONS,
         },
+        required: ['name_any'],
     }
 }
 
@@ -72,14 +147,69 @@ export const SEARCH_GOURMET_BY_TEL: Tool = {
                 type: 'string',
                 description: 'The telephone number of the gourmet to search for',
             },
+            ...GOURMET_SEARCH_OPTIONS,
+        },
+        required: ['tel'],
+    }
+}
+
+export const SEARCH_GOURMET_BY_AREA: Tool = {
+    name: 'search_gourmet_by_area',
+    description: 'Search gourmet information in an area without a keyword. At least one of large_area, middle_area or small_area is required; with all=true every shop of the area is collected',
+    inputSchema: {
+        type: 'object',
+        properties: {
+            ...GOURMET_SEARCH_OPTIONS,
+        },
+    }
+}
+
+export const SEARCH_GOURMET_NEARBY: Tool = {
+    name: 'search_gourmet_nearby',
+    description: 'Search gourmet information near a location, nearest first. Recently fetched areas are answered locally without calling the API',
+    inputSchema: {
+        type: 'object',
+        properties: {
+            lat: {
+                type: 'number',
+                description: 'Latitude of the search center (world geodetic system, e.g. 43.0555)',
+            },
+            lng: {
+                type: 'number',
+                description: 'Longitude of the search center (world geodetic system, e.g. 141.3529)',
+            },
+            range: {
+                type: 'integer',
+                minimum: 1,
+                maximum: 5,
+                description: 'Search radius: 1: 300m, 2: 500m, 3: 1000m (default), 4: 2000m, 5: 3000m',
+            },
+            limit: {
+                type: 'integer',
+                minimum: 1,
+                description: 'Return only the nearest N shops',
+            },
+            max_age_seconds: {
+                type: 'integer',
+                minimum: 0,
+                description: 'Maximum age of locally indexed shops and cached responses to answer from (default 300). 0 always calls the API',
+            },
+            fields: {
+                ...FIELDS_OPTION.fields,
+                description: "Shop fields to return, as dotted paths (e.g. ['id', 'name', 'lat', 'lng', 'budget.average']) or 'compact' (default) for id, name, address, location, budget, genre and URL. Only compact fields are answered locally; other fields always call the API",
+            },
         },
+        required: ['lat', 'lng'],
     }
 }
 
 export const TOOLS = [
     SEARCH_GOURMET_BY_ID,
+    SEARCH_GOURMET_BY_IDS,
     SEARCH_GOURMET_BY_NAME,
     SEARCH_GOURMET_BY_NAME_KANA,
     SEARCH_GOURMET_BY_ANY,
     SEARCH_GOURMET_BY_TEL,
+    SEARCH_GOURMET_BY_AREA,
+    SEARCH_GOURMET_NEARBY,
 ];
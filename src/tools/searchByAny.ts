@@ -0,0 +1,21 @@
+import type { CallToolResult } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import {
+  GourmetSearchOptionsSchema,
+  parseParams,
+  searchGourmet,
+  type ToolContext,
+} from './gourmetSearch.js';
+
+// Schema for input validation
+export const SearchByAnyInputSchema = GourmetSearchOptionsSchema.extend({
+  name_any: z.string().min(1, 'Keyword is required'),
+});
+
+export const handleSearchByAny = async (
+  params: unknown,
+  context?: ToolContext,
+): Promise<CallToolResult> => {
+  const { name_any, ...options } = parseParams(SearchByAnyInputSchema, params);
+  return searchGourmet({ name_any }, options, context);
+};
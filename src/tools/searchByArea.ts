@@ -0,0 +1,25 @@
+import type { CallToolResult } from '@modelcontextprotocol/sdk/types.js';
+import {
+  GourmetSearchOptionsSchema,
+  parseParams,
+  searchGourmet,
+  type ToolContext,
+} from './gourmetSearch.js';
+
+// Schema for input validation
+export const SearchByAreaInputSchema = GourmetSearchOptionsSchema.refine(
+  (options) => Boolean(options.large_area || options.middle_area || options.small_area),
+  'At least one of large_area, middle_area or small_area is required',
+);
+
+/**
+ * Search an area without a keyword, so all=true can collect every shop of
+ * e.g. middle_area Y500.
+ */
+export const handleSearchByArea = async (
+  params: unknown,
+  context?: ToolContext,
+): Promise<CallToolResult> => {
+  const options = parseParams(SearchByAreaInputSchema, params);
+  return searchGourmet({}, options, context);
+};
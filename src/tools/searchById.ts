@@ -1,18 +1,22 @@
-import {
-  CallToolResult,
-  ErrorCode,
-  McpError,
-} from "@modelcontextprotocol/sdk/types.js";
-import axios from "axios";
-import { a } from "vitest/dist/chunks/suite.d.FvehnV49.js";
-import { z } from "zod";
+import { type CallToolResult, ErrorCode, McpError } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import { apiErrorMessage, fetchData } from '../api.js';
+import { config } from '../config.js';
+import { fieldsProjection, projectResults } from '../projection.js';
+import { FieldsSchema, parseParams, textResult } from './gourmetSearch.js';
 
-// SChema for input validation
+// Schema for input validation
 export const SearchByIdInputSchema = z.object({
-    id: z.string().min(1, "ID is required"),
+  id: z.string().min(1, 'ID is required'),
+  fields: FieldsSchema,
 });
 
-const handleSearchById = async (params: any): Promise<CallToolResult> => {
-
-    
-}
\ No newline at end of file
+export const handleSearchById = async (params: unknown): Promise<CallToolResult> => {
+  const { id, fields } = parseParams(SearchByIdInputSchema, params);
+  const data = await fetchData(config.END_POINT.GOURMET, { id, format: 'json' });
+  const error = apiErrorMessage(data);
+  if (error) {
+    throw new McpError(ErrorCode.InternalError, `Hot Pepper API error: ${error}`);
+  }
+  return textResult(projectResults(data.results, fieldsProjection(fields)));
+};
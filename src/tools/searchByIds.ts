@@ -0,0 +1,67 @@
+import { type CallToolResult, ErrorCode, McpError } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import { apiErrorMessage, fetchData } from '../api.js';
+import { chunk, mapWithConcurrency } from '../concurrency.js';
+import { config } from '../config.js';
+import { fieldsProjection, type Projection } from '../projection.js';
+import { FieldsSchema, parseParams, textResult } from './gourmetSearch.js';
+
+// The gourmet API accepts up to 20 comma-separated values for id
+export const MAX_IDS_PER_REQUEST = 20;
+export const MAX_IDS = 200;
+
+// Schema for input validation
+export const SearchByIdsInputSchema = z.object({
+  ids: z
+    .array(z.string().trim().min(1, 'ID must not be empty'))
+    .min(1, 'At least one ID is required')
+    .max(MAX_IDS, `At most ${MAX_IDS} IDs are allowed`),
+  fields: FieldsSchema,
+});
+
+export interface ShopLookup {
+  id: string;
+  found: boolean;
+  shop: unknown | null;
+}
+
+/**
+ * Look up shops by ID, packing up to MAX_IDS_PER_REQUEST IDs into each
+ * upstream call and sending the calls with bounded concurrency.
+ * Each found shop is passed through project once.
+ *
+ * @returns One entry per input ID, in input order (duplicates included)
+ */
+export async function lookupShopsByIds(
+  ids: readonly string[],
+  project: Projection = (shop) => shop,
+  concurrency: number = config.PAGING.CONCURRENCY,
+): Promise<ShopLookup[]> {
+  // Sorted unique IDs give stable chunks, so repeated lookups hit the response cache
+  const unique = [...new Set(ids)].sort();
+  const shops = new Map<string, unknown>();
+
+  await mapWithConcurrency(chunk(unique, MAX_IDS_PER_REQUEST), concurrency, async (group) => {
+    const data = await fetchData(config.END_POINT.GOURMET, {
+      id: group.join(','),
+      count: String(group.length),
+      format: 'json',
+    });
+    const error = apiErrorMessage(data);
+    if (error) {
+      throw new McpError(ErrorCode.InternalError, `Hot Pepper API error: ${error}`);
+    }
+    for (const shop of data?.results?.shop ?? []) {
+      shops.set(shop.id, project(shop));
+    }
+  });
+
+  return ids.map((id) => ({ id, found: shops.has(id), shop: shops.get(id) ?? null }));
+}
+
+export const handleSearchByIds = async (params: unknown): Promise<CallToolResult> => {
+  const { ids, fields } = parseParams(SearchByIdsInputSchema, params);
+  const results = await lookupShopsByIds(ids, fieldsProjection(fields));
+  const found = results.filter((result) => result.found).length;
+  return textResult({ requested: results.length, found, results });
+};
@@ -0,0 +1,21 @@
+import type { CallToolResult } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import {
+  GourmetSearchOptionsSchema,
+  parseParams,
+  searchGourmet,
+  type ToolContext,
+} from './gourmetSearch.js';
+
+// Schema for input validation
+export const SearchByNameInputSchema = GourmetSearchOptionsSchema.extend({
+  name: z.string().min(1, 'Name is required'),
+});
+
+export const handleSearchByName = async (
+  params: unknown,
+  context?: ToolContext,
+): Promise<CallToolResult> => {
+  const { name, ...options } = parseParams(SearchByNameInputSchema, params);
+  return searchGourmet({ name }, options, context);
+};
@@ -0,0 +1,21 @@
+import type { CallToolResult } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import {
+  GourmetSearchOptionsSchema,
+  parseParams,
+  searchGourmet,
+  type ToolContext,
+} from './gourmetSearch.js';
+
+// Schema for input validation
+export const SearchByNameKanaInputSchema = GourmetSearchOptionsSchema.extend({
+  name_kana: z.string().min(1, 'Name kana is required'),
+});
+
+export const handleSearchByNameKana = async (
+  params: unknown,
+  context?: ToolContext,
+): Promise<CallToolResult> => {
+  const { name_kana, ...options } = parseParams(SearchByNameKanaInputSchema, params);
+  return searchGourmet({ name_kana }, options, context);
+};
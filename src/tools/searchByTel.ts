@@ -0,0 +1,21 @@
+import type { CallToolResult } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import {
+  GourmetSearchOptionsSchema,
+  parseParams,
+  searchGourmet,
+  type ToolContext,
+} from './gourmetSearch.js';
+
+// Schema for input validation
+export const SearchByTelInputSchema = GourmetSearchOptionsSchema.extend({
+  tel: z.string().regex(/^[0-9]+$/, 'Telephone number must be digits without hyphens'),
+});
+
+export const handleSearchByTel = async (
+  params: unknown,
+  context?: ToolContext,
+): Promise<CallToolResult> => {
+  const { tel, ...options } = parseParams(SearchByTelInputSchema, params);
+  return searchGourmet({ tel }, options, context);
+};
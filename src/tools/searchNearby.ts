@@ -0,0 +1,100 @@
+import type { CallToolResult } from '@modelcontextprotocol/sdk/types.js';
+import { z } from 'zod';
+import { addResponseListener } from '../api.js';
+import { config } from '../config.js';
+import { distanceMeters, GeoIndex, type NearbyShop, RANGE_METERS } from '../geoIndex.js';
+import { fetchAllPages } from '../paging.js';
+import { COMPACT_SHOP_FIELDS, fieldsCovered, fieldsProjection } from '../projection.js';
+import { FieldsSchema, parseParams, textResult } from './gourmetSearch.js';
+
+// Shops from every gourmet response, so earlier searches can answer nearby
+// queries. Only the compact fields are kept to bound the memory per shop.
+export const shopGeoIndex = new GeoIndex({
+  cellDegrees: config.GEO.CELL_DEGREES,
+  freshnessMs: config.GEO.FRESHNESS_MS,
+  maxShops: config.GEO.MAX_SHOPS,
+  project: fieldsProjection('compact'),
+});
+
+addResponseListener((endpoint, params, data, fetchedAt) => {
+  if (endpoint === config.END_POINT.GOURMET) {
+    shopGeoIndex.addResponse(params, data, fetchedAt);
+  }
+});
+
+// Schema for input validation
+export const SearchNearbyInputSchema = z.object({
+  lat: z.number().min(-90).max(90),
+  lng: z.number().min(-180).max(180),
+  range: z.number().int().min(1).max(5).default(3),
+  limit: z.number().int().min(1).max(config.PAGING.MAX_RESULTS).optional(),
+  max_age_seconds: z.number().int().min(0).optional(),
+  fields: FieldsSchema,
+});
+
+/**
+ * Shops near a point, nearest first.
+ *
+ * Answered from shopGeoIndex when it holds a fresh, complete view of the
+ * circle and the requested fields are among the compact ones it stores
+ * (fields defaults to 'compact' here); otherwise the gourmet API is searched
+ * (pages in parallel, cached pages older than max_age_seconds refetched) and,
+ * if every result fit, the circle is recorded as covered as of the oldest page.
+ */
+export const handleSearchNearby = async (params: unknown): Promise<CallToolResult> => {
+  const {
+    lat,
+    lng,
+    range,
+    limit,
+    max_age_seconds,
+    fields = 'compact',
+  } = parseParams(SearchNearbyInputSchema, params);
+  const radiusM = RANGE_METERS[range];
+  const maxAgeMs =
+    max_age_seconds !== undefined ? max_age_seconds * 1000 : config.GEO.FRESHNESS_MS;
+
+  let source = 'local';
+  let nearby: NearbyShop[] | undefined;
+  if (fieldsCovered(fields, COMPACT_SHOP_FIELDS)) {
+    nearby =
+      limit !== undefined
+        ? shopGeoIndex.nearest(lat, lng, limit, radiusM, maxAgeMs)
+        : shopGeoIndex.isCovered(lat, lng, radiusM, maxAgeMs)
+          ? shopGeoIndex.withinRadius(lat, lng, radiusM, maxAgeMs)
+          : undefined;
+  }
+
+  if (!nearby) {
+    source = 'api';
+    // Location searches come back nearest first, so limit bounds the pages needed
+    const result = await fetchAllPages(
+      config.END_POINT.GOURMET,
+      { lat: String(lat), lng: String(lng), range: String(range) },
+      { maxResults: limit, maxAgeMs },
+    );
+    if (!result.truncated) {
+      // Pages served from the memory cache were not indexed; stamp every shop
+      // with the oldest page so none looks newer than the region it completes
+      shopGeoIndex.add(result.shops, result.fetchedAt);
+      shopGeoIndex.markCovered(lat, lng, radiusM, result.fetchedAt);
+    }
+    nearby = result.shops
+      .map((shop) => ({
+        shop,
+        distanceM: distanceMeters(lat, lng, Number(shop.lat), Number(shop.lng)),
+      }))
+      .sort((a, b) => a.distanceM - b.distanceM)
+      .slice(0, limit);
+  }
+
+  const project = fieldsProjection(fields);
+  return textResult({
+    source,
+    results_returned: nearby.length,
+    shop: nearby.map(({ shop, distanceM }) => ({
+      ...project(shop),
+      distance_m: Math.round(distanceM),
+    })),
+  });
+};
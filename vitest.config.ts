@@ -17,8 +17,8 @@ export default defineConfig({
     // (flip to false if it gets too chatty)
     reporters: 'default',
 
-    // If you need setup (e.g., env vars / mocks), add files here:
-    // setupFiles: ['tests/setup.ts'],
+    // Environment every module expects (e.g. config.ts requires an API key)
+    setupFiles: ['src/test/setup.ts'],
 
     // TS diagnostics during test runs can be noisy; keep default strict TS via tsc.
     // You can enable this if you want Vitest to type-check on the fly: